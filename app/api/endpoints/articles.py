@@ -0,0 +1,92 @@
+import base64
+import hashlib
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from app.core.config import ARTICLES_CACHE_MAX_AGE_SECONDS, ARTICLES_PAGE_SIZE
+from app.crud import article_crud
+from app.database import database, schemas
+from app.services import result_cache
+
+router = APIRouter()
+
+def encode_cursor(publish_date: datetime, article_id: int) -> str:
+    raw = f"{publish_date.isoformat()}|{article_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        publish_date, article_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(publish_date), int(article_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Yayın tarihleri UTC olarak ve saat dilimi olmadan saklanır (bkz. `app.core.clock`);
+    # saat dilimi verilmemiş değerler de UTC kabul edilir
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+def _card(article) -> schemas.ArticleCard:
+    return schemas.ArticleCard(**{column.key: getattr(article, column.key) for column in article_crud.CARD_COLUMNS})
+
+def _etag(version: str, request: Request) -> str:
+    params = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    return '"' + hashlib.sha256(f"{version}?{params}".encode()).hexdigest()[:32] + '"'
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+@router.get("/articles", response_model=schemas.ArticlePage)
+async def list_articles(
+    request: Request,
+    response: Response,
+    source: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    topic: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(ARTICLES_PAGE_SIZE, ge=1, le=100),
+):
+    """
+    Lists news cards newest first, optionally filtered by source, publish date range
+    (`since` inclusive, `until` exclusive; values without a timezone are taken as UTC)
+    and topic. Pages are keyset-paginated on `(publish_date, id)`: pass the returned
+    `next_cursor` to get the next page.
+
+    Responses carry an ETag that changes when a new ingestion stores articles, so a
+    repeated request with `If-None-Match` is answered with 304 without touching the database.
+    """
+    before = decode_cursor(cursor) if cursor else None
+    version = await result_cache.content_version()
+    headers = {}
+    if version is not None:
+        headers = {"ETag": _etag(version, request), "Cache-Control": f"public, max-age={ARTICLES_CACHE_MAX_AGE_SECONDS}"}
+        if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+    async with database.AsyncSessionLocal() as db:
+        articles = await article_crud.aget_articles_page(
+            db,
+            limit=limit + 1,
+            before=before,
+            source=source,
+            since=_naive_utc(since),
+            until=_naive_utc(until),
+            topic=topic,
+        )
+    next_cursor = None
+    if len(articles) > limit:
+        articles = articles[:limit]
+        next_cursor = encode_cursor(articles[-1].publish_date, articles[-1].id)
+
+    response.headers.update(headers)
+    return schemas.ArticlePage(
+        items=[_card(article) for article in articles],
+        next_cursor=next_cursor,
+    )
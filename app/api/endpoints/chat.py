@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.services import chat_service
-from app.database import database, schemas
+import json
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from app.database import schemas
 
 router = APIRouter()
 
+def _chat_service():
+    # Sohbet yığını (langchain, OpenAI istemcisi) uygulama içe aktarılırken değil,
+    # başlangıçtaki ısınmada veya ilk istekte yüklenir
+    from app.services import chat_service
+    return chat_service
+
 @router.post("/chat", response_model=schemas.ChatHistoryBase)
 async def chat_with_agent(query: schemas.ChatQuery):
     """
@@ -14,7 +20,7 @@ async def chat_with_agent(query: schemas.ChatQuery):
     if not query.query or not query.user_id:
         raise HTTPException(status_code=400, detail="Query and user_id cannot be empty.")
         
-    response_text = await chat_service.run_chat_logic(query=query.query, user_id=query.user_id)
+    response_text = await _chat_service().run_chat_logic(query=query.query, user_id=query.user_id)
     
     # Dönen yanıtı schema'ya uygun hale getir
     response_data = schemas.ChatHistoryBase(
@@ -25,3 +31,23 @@ async def chat_with_agent(query: schemas.ChatQuery):
     
     return response_data
 
+@router.post("/chat/stream")
+async def chat_with_agent_stream(query: schemas.ChatQuery):
+    """
+    Streams the agent's answer as server-sent events: an `intro` event as soon as
+    the plan is known, one `article` event per news card as it becomes ready and a
+    final `done` event with the full response.
+    """
+    if not query.query or not query.user_id:
+        raise HTTPException(status_code=400, detail="Query and user_id cannot be empty.")
+
+    async def event_stream():
+        async for event, data in _chat_service().stream_chat_logic(query=query.query, user_id=query.user_id):
+            yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # Proxy'lerin (ör. nginx) yanıtı tamponlamasını engelle
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
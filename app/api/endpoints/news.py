@@ -1,14 +1,51 @@
-from fastapi import APIRouter, BackgroundTasks
-from app.services import ingestion_service
+from fastapi import APIRouter, HTTPException
+from app.core.clock import utcnow
+from app.core.config import NEWS_SOURCES
+from app.crud import feed_state_crud
+from app.database import database
+from app.services import source_health
+from app.services.ingestion_jobs import job_manager
 
 router = APIRouter()
 
 @router.post("/ingest-news", status_code=202)
-async def ingest_news_endpoint(background_tasks: BackgroundTasks):
+async def ingest_news_endpoint():
     """
-    Starts a background task to ingest news from all RSS sources.
+    Starts a background job to ingest news from all RSS sources.
+    If an ingestion is already running, the trigger joins that job instead of starting a new one.
     """
-    background_tasks.add_task(ingestion_service.ingest_news)
-    return {"message": "News ingestion started in the background."}
+    job, started = job_manager.trigger("api")
+    return {
+        "message": "News ingestion started in the background." if started else "News ingestion is already running.",
+        "job_id": job.id,
+        "status": job.status,
+        "coalesced": not started,
+    }
 
+@router.get("/ingest-news/{job_id}")
+async def ingest_news_status(job_id: str):
+    """
+    Returns the status of an ingestion job with per-stage counters and timings.
+    """
+    job = job_manager.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Ingestion job not found.")
+    return job.to_dict()
 
+@router.get("/sources/health")
+async def sources_health():
+    """
+    Returns per-source polling state (observed publish rate, adaptive poll interval,
+    next poll time, consecutive failures and circuit status) and the article-fetch
+    circuit breakers of domains that are currently failing in this process.
+    """
+    async with database.AsyncSessionLocal() as db:
+        states = await feed_state_crud.aget_feed_states(db)
+    now = utcnow()
+    return {
+        "sources": {
+            source: source_health.feed_health(states.get(source), rss_url, now)
+            for source, rss_url in NEWS_SOURCES.items()
+        },
+        "domains": source_health.domain_breaker.snapshot(),
+    }
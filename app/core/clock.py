@@ -0,0 +1,12 @@
+from datetime import datetime, timezone
+
+def utcnow() -> datetime:
+    """
+    Uygulamanın tek saati: şu anki UTC zamanı, saat dilimi bilgisi olmadan.
+
+    Veritabanındaki `DateTime` sütunları saat dilimsizdir ve UTC saklanır (RSS zaman
+    damgaları da UTC'dir). Saat dilimli değerler bu sütunlardan okunanlarla
+    karşılaştırılamadığı için zaman dilimi UTC'ye çevrildikten sonra atılır;
+    böylece sunucunun yerel saat dilimi hiçbir hesaba karışmaz.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
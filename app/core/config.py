@@ -6,3 +6,129 @@ load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
+# Anlamsal arama için embedding arka ucu: "openai" veya "hashing" (çevrimdışı)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai" if OPENAI_API_KEY else "hashing")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+# Bu sayının üzerindeki vektörlerde (hnswlib kuruluysa) yaklaşık en yakın komşu indeksi kullanılır
+VECTOR_ANN_THRESHOLD = int(os.getenv("VECTOR_ANN_THRESHOLD", "50000"))
+# Embedding'i eksik makaleler için ingestion turu başına üretilecek en fazla vektör ve tek istekteki metin sayısı
+EMBEDDING_BACKFILL_LIMIT = int(os.getenv("EMBEDDING_BACKFILL_LIMIT", "500"))
+EMBEDDING_BACKFILL_BATCH_SIZE = int(os.getenv("EMBEDDING_BACKFILL_BATCH_SIZE", "64"))
+
+# Anlık üretilen özetler için süreç içi LRU önbelleğinin boyutu (makale sayısı)
+SUMMARY_CACHE_SIZE = int(os.getenv("SUMMARY_CACHE_SIZE", "1024"))
+
+# LLM istemcisi: sağlayıcı limitleri ve eş zamanlılık ayarları
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "500"))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "200000"))
+LLM_CHAT_CONCURRENCY = int(os.getenv("LLM_CHAT_CONCURRENCY", "16"))
+LLM_INGESTION_CONCURRENCY = int(os.getenv("LLM_INGESTION_CONCURRENCY", "4"))
+# Toplu ingestion'ın dokunamayacağı, sohbete ayrılan limit oranı
+LLM_CHAT_RESERVE_RATIO = float(os.getenv("LLM_CHAT_RESERVE_RATIO", "0.2"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+
+# Ingestion'da bilinen URL'ler için bellek içi Bloom filtresi
+URL_BLOOM_FILTER_ENABLED = os.getenv("URL_BLOOM_FILTER_ENABLED", "true").lower() == "true"
+URL_BLOOM_EXPECTED_ITEMS = int(os.getenv("URL_BLOOM_EXPECTED_ITEMS", "500000"))
+URL_BLOOM_FALSE_POSITIVE_RATE = float(os.getenv("URL_BLOOM_FALSE_POSITIVE_RATE", "0.01"))
+
+# Toplu makale yazıcısı: bu kadar makale birikince veya bu süre dolunca yaz
+ARTICLE_WRITER_BATCH_SIZE = int(os.getenv("ARTICLE_WRITER_BATCH_SIZE", "50"))
+ARTICLE_WRITER_FLUSH_SECONDS = float(os.getenv("ARTICLE_WRITER_FLUSH_SECONDS", "2.0"))
+
+# Ingestion HTTP istemcisi: eş zamanlılık ve boyut sınırları
+HTTP_MAX_IN_FLIGHT = int(os.getenv("HTTP_MAX_IN_FLIGHT", "32"))
+HTTP_PER_HOST_LIMIT = int(os.getenv("HTTP_PER_HOST_LIMIT", "4"))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "15"))
+HTTP_MAX_BODY_BYTES = int(os.getenv("HTTP_MAX_BODY_BYTES", str(5 * 1024 * 1024)))
+
+# Metin ayıklama (trafilatura) için süreç havuzu; 0 verilirse ayrı süreç yerine bir iş parçacığı kullanılır
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", str(os.cpu_count() or 1)))
+EXTRACTION_MAX_HTML_BYTES = int(os.getenv("EXTRACTION_MAX_HTML_BYTES", str(3 * 1024 * 1024)))
+
+# Ingestion LLM işleme: tek çağrıda gönderilecek token bütçesi ve map-reduce eşiği
+ARTICLE_TOKEN_BUDGET = int(os.getenv("ARTICLE_TOKEN_BUDGET", "3000"))
+ARTICLE_MAP_REDUCE_THRESHOLD = int(os.getenv("ARTICLE_MAP_REDUCE_THRESHOLD", "9000"))
+ARTICLE_MAX_CHUNKS = int(os.getenv("ARTICLE_MAX_CHUNKS", "6"))
+
+# Yakın kopya (near-duplicate) tespiti: SimHash Hamming mesafesi eşiği ve izlenecek geçmiş
+NEAR_DUPLICATE_MAX_DISTANCE = int(os.getenv("NEAR_DUPLICATE_MAX_DISTANCE", "3"))
+NEAR_DUPLICATE_WINDOW_DAYS = int(os.getenv("NEAR_DUPLICATE_WINDOW_DAYS", "7"))
+
+# Sohbet planlayıcısı: yerel yönlendirici ve LLM plan önbelleği
+INTENT_ROUTER_ENABLED = os.getenv("INTENT_ROUTER_ENABLED", "true").lower() == "true"
+PLAN_CACHE_SIZE = int(os.getenv("PLAN_CACHE_SIZE", "2048"))
+PLAN_CACHE_TTL_SECONDS = int(os.getenv("PLAN_CACHE_TTL_SECONDS", "3600"))
+
+# Sohbet araç sonuçları önbelleği; RESULT_CACHE_URL (ör. redis://...) verilirse süreçler arası paylaşılır
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "512"))
+RESULT_CACHE_TTL_SECONDS = int(os.getenv("RESULT_CACHE_TTL_SECONDS", "900"))
+RESULT_CACHE_URL = os.getenv("RESULT_CACHE_URL", "")
+
+# Planlayıcıya verilen sohbet geçmişi: en fazla bu kadar tur ve bu kadar token
+CHAT_HISTORY_MAX_TURNS = int(os.getenv("CHAT_HISTORY_MAX_TURNS", "10"))
+CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "800"))
+
+# Ingestion işleri: uygulama içi periyodik çalıştırma aralığı (dakika, 0 = kapalı) ve saklanan iş sayısı
+INGEST_SCHEDULE_MINUTES = float(os.getenv("INGEST_SCHEDULE_MINUTES", "0"))
+INGEST_JOB_HISTORY_SIZE = int(os.getenv("INGEST_JOB_HISTORY_SIZE", "20"))
+
+# Ayrı ingestion işçileri: açıksa ingest_news makaleleri işlemek yerine veritabanı kuyruğuna yazar
+INGESTION_USE_WORK_QUEUE = os.getenv("INGESTION_USE_WORK_QUEUE", "false").lower() == "true"
+WORK_QUEUE_BATCH_SIZE = int(os.getenv("WORK_QUEUE_BATCH_SIZE", "20"))
+WORK_QUEUE_LEASE_SECONDS = float(os.getenv("WORK_QUEUE_LEASE_SECONDS", "300"))
+WORK_QUEUE_MAX_ATTEMPTS = int(os.getenv("WORK_QUEUE_MAX_ATTEMPTS", "5"))
+WORK_QUEUE_RETRY_SECONDS = float(os.getenv("WORK_QUEUE_RETRY_SECONDS", "60"))
+WORK_QUEUE_POLL_SECONDS = float(os.getenv("WORK_QUEUE_POLL_SECONDS", "10"))
+# Tamamlanan işlerin kuyrukta tutulduğu süre (saat); daha eskileri işçiler saatte bir siler
+WORK_QUEUE_DONE_RETENTION_HOURS = float(os.getenv("WORK_QUEUE_DONE_RETENTION_HOURS", "168"))
+
+# Gözlemlenebilirlik: log düzeyi ve bu süreyi aşan isteklerin aşama dökümünün loglanması
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+TRACE_LOG_THRESHOLD_SECONDS = float(os.getenv("TRACE_LOG_THRESHOLD_SECONDS", "2.0"))
+
+# Başlangıç: şema adımları sunucu açılırken mi çalışsın (kapalıysa `python -m app.database.migrations`)
+# ve sohbet yığını (LLM istemcisi, tokenizer) ilk istekten önce arka planda yüklensin mi
+AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "true").lower() == "true"
+LLM_PREWARM = os.getenv("LLM_PREWARM", "true").lower() == "true"
+
+# `GET /api/v1/articles`: varsayılan sayfa boyutu ve istemci/CDN önbellek süresi (saniye)
+ARTICLES_PAGE_SIZE = int(os.getenv("ARTICLES_PAGE_SIZE", "20"))
+ARTICLES_CACHE_MAX_AGE_SECONDS = int(os.getenv("ARTICLES_CACHE_MAX_AGE_SECONDS", "60"))
+
+# Makale içeriği sıkıştırması: zstd (zstandard kuruluysa), zlib veya none; düzey her iki kodlamaya da uygulanır (zlib için en fazla 9)
+CONTENT_COMPRESSION = os.getenv("CONTENT_COMPRESSION", "zstd").lower()
+CONTENT_COMPRESSION_LEVEL = int(os.getenv("CONTENT_COMPRESSION_LEVEL", "6"))
+
+# Kaynak sağlığı: besleme başına uyarlanabilir yoklama aralığı (yayın hızına göre) ve hata sonrası bekletme
+FEED_ADAPTIVE_POLLING = os.getenv("FEED_ADAPTIVE_POLLING", "true").lower() == "true"
+FEED_POLL_MIN_MINUTES = float(os.getenv("FEED_POLL_MIN_MINUTES", "15"))
+FEED_POLL_MAX_MINUTES = float(os.getenv("FEED_POLL_MAX_MINUTES", "360"))
+FEED_POLL_TARGET_ITEMS = float(os.getenv("FEED_POLL_TARGET_ITEMS", "1.0"))
+FEED_RATE_WINDOW_HOURS = float(os.getenv("FEED_RATE_WINDOW_HOURS", "24"))
+FEED_FAILURE_THRESHOLD = int(os.getenv("FEED_FAILURE_THRESHOLD", "3"))
+FEED_BACKOFF_MAX_MINUTES = float(os.getenv("FEED_BACKOFF_MAX_MINUTES", str(24 * 60)))
+
+# Makale sayfaları için alan adı başına devre kesici: eşik, ilk bekleme ve en uzun bekleme (saniye)
+DOMAIN_FAILURE_THRESHOLD = int(os.getenv("DOMAIN_FAILURE_THRESHOLD", "5"))
+DOMAIN_BACKOFF_SECONDS = float(os.getenv("DOMAIN_BACKOFF_SECONDS", "60"))
+DOMAIN_BACKOFF_MAX_SECONDS = float(os.getenv("DOMAIN_BACKOFF_MAX_SECONDS", "3600"))
+
+# Ingestion'ın yokladığı RSS kaynakları (kaynak adı -> besleme URL'si)
+NEWS_SOURCES = {
+    # Core AI Labs
+    "OpenAI Blog": "https://openai.com/blog/rss.xml",
+    "Google AI Blog": "https://ai.googleblog.com/feeds/posts/default?alt=rss",
+    "Anthropic News": "https://www.anthropic.com/news/rss.xml",
+    "Hugging Face Blog": "https://huggingface.co/blog/feed.xml",
+    "Perplexity Blog": "https://blog.perplexity.ai/rss.xml",
+
+    # Major Tech & AI News Outlets
+    "TechCrunch AI": "https://techcrunch.com/category/artificial-intelligence/feed/",
+    "The Verge AI": "https://www.theverge.com/rss/ai-artificial-intelligence/index.xml",
+    "Wired AI": "https://www.wired.com/feed/tag/artificial-intelligence/latest/rss",
+    "VentureBeat AI": "https://venturebeat.com/category/ai/feed/",
+    "Ars Technica AI": "https://arstechnica.com/tag/ai/feed/",
+}
@@ -1,11 +1,51 @@
-from sqlalchemy.orm import Session
-from app.database import models
+from sqlalchemy import and_, insert, or_, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.orm.attributes import set_committed_value
+from app.core.clock import utcnow
+from app.database import models, search_index
 from app.database.schemas import ArticleCreate
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+# Liste sorgularında (haber kartları) yüklenen sütunlar; büyük `content` sütunu ertelenir
+# ve yalnızca özeti eksik makaleler için `aload_contents` ile ayrıca okunur.
+CARD_COLUMNS = (
+    models.Article.id,
+    models.Article.title,
+    models.Article.url,
+    models.Article.source,
+    models.Article.publish_date,
+    models.Article.summary,
+    models.Article.keywords,
+)
+
+def _card_options():
+    return load_only(*CARD_COLUMNS)
+
+def get_article(db: Session, article_id: int):
+    return db.get(models.Article, article_id)
 
 def get_article_by_url(db: Session, url: str):
     return db.query(models.Article).filter(models.Article.url == url).first()
 
+# SQLite'ın bağlama parametresi limitinin altında kalmak için IN listesi parça boyutu
+_IN_CHUNK_SIZE = 500
+
+def get_existing_urls(db: Session, urls) -> set:
+    """Verilen URL'lerden veritabanında zaten bulunanları tek seferde (parçalı IN ile) döndürür."""
+    urls = list(set(urls))
+    existing = set()
+    for i in range(0, len(urls), _IN_CHUNK_SIZE):
+        chunk = urls[i:i + _IN_CHUNK_SIZE]
+        existing.update(row[0] for row in db.query(models.Article.url).filter(models.Article.url.in_(chunk)))
+    return existing
+
+def get_urls_after(db: Session, after_article_id: int = 0):
+    """ID'si `after_article_id`'den büyük makalelerin (id, url) çiftlerini döndürür."""
+    return db.query(models.Article.id, models.Article.url).filter(models.Article.id > after_article_id).order_by(models.Article.id).all()
+
 def create_article(db: Session, article: ArticleCreate):
     db_article = models.Article(
         title=article.title,
@@ -13,12 +53,72 @@ def create_article(db: Session, article: ArticleCreate):
         source=article.source,
         publish_date=article.publish_date,
         content=article.content,
+        summary=article.summary,
+        keywords=article.keywords,
     )
     db.add(db_article)
     db.commit()
     db.refresh(db_article)
     return db_article
 
+# Çoklu VALUES eklemelerinde satır parça boyutu (SQLite parametre limiti için)
+_INSERT_CHUNK_SIZE = 100
+
+def _conflict_ignoring_insert(db: Session):
+    """`ON CONFLICT DO NOTHING` destekleyen lehçeler için INSERT ifadesi; diğerlerinde None."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert(models.Article)
+
+def _insert_each_ignoring_conflicts(db: Session, rows: List[dict]) -> Dict[str, int]:
+    """Taşınabilir yol: her satır kendi SAVEPOINT'inde eklenir, URL çakışması atlanır."""
+    inserted = {}
+    for row in rows:
+        try:
+            with db.begin_nested():
+                article_id = db.execute(insert(models.Article).values(row)).inserted_primary_key[0]
+        except IntegrityError:
+            continue
+        inserted[row["url"]] = article_id
+    return inserted
+
+def insert_articles_ignore_conflicts(db: Session, articles: List[ArticleCreate]) -> Dict[str, int]:
+    """
+    Makaleleri tek bir transaction içinde toplu ekler; URL'si zaten var olanları
+    sessizce atlar. Eklenen makaleler için `url -> id` sözlüğü döndürür.
+    Commit çağıranın sorumluluğundadır.
+    """
+    inserted = {}
+    rows = [
+        {
+            "title": article.title,
+            "url": article.url,
+            "source": article.source,
+            "publish_date": article.publish_date,
+            "content": article.content,
+            "summary": article.summary,
+            "keywords": article.keywords,
+        }
+        for article in articles
+    ]
+    if _conflict_ignoring_insert(db) is None:
+        return _insert_each_ignoring_conflicts(db, rows)
+    for i in range(0, len(rows), _INSERT_CHUNK_SIZE):
+        statement = (
+            _conflict_ignoring_insert(db)
+            .values(rows[i:i + _INSERT_CHUNK_SIZE])
+            .on_conflict_do_nothing(index_elements=["url"])
+            .returning(models.Article.id, models.Article.url)
+        )
+        for article_id, url in db.execute(statement):
+            inserted[url] = article_id
+    return inserted
+
 def update_article_summary_and_keywords(db: Session, article_id: int, summary: str, keywords: str):
     db_article = db.query(models.Article).filter(models.Article.id == article_id).first()
     if db_article:
@@ -29,15 +129,137 @@ def update_article_summary_and_keywords(db: Session, article_id: int, summary: s
     return db_article
 
 def get_recent_articles(db: Session, days_ago: int, limit: int = 8):
-    from datetime import datetime, timedelta
-    cutoff_date = datetime.now() - timedelta(days=days_ago)
-    return db.query(models.Article).filter(models.Article.publish_date >= cutoff_date).order_by(models.Article.publish_date.desc()).limit(limit).all()
+    cutoff_date = utcnow() - timedelta(days=days_ago)
+    return db.query(models.Article).options(_card_options()).filter(models.Article.publish_date >= cutoff_date).order_by(models.Article.publish_date.desc()).limit(limit).all()
 
-def search_articles_by_topic(db: Session, topic: str, limit: int = 8):
+def _like_search_statement(topic: str, limit: int):
     search = f"%{topic}%"
-    return db.query(models.Article).filter(
+    return select(models.Article).options(_card_options()).where(
         (models.Article.title.like(search)) |
         (models.Article.keywords.like(search)) |
         (models.Article.summary.like(search))
-    ).order_by(models.Article.publish_date.desc()).limit(limit).all()
+    ).order_by(models.Article.publish_date.desc()).limit(limit)
+
+def _topic_search_statement(dialect: str, topic: str, limit: int):
+    """Tam metin indeksi varsa alaka sıralı sorguyu, yoksa LIKE sorgusunu döndürür."""
+    if search_index.is_available(dialect):
+        query = search_index.search_query_param(dialect, topic)
+        if query:
+            column_names = [column.key for column in CARD_COLUMNS]
+            fts_sql = text(search_index.fts_search_sql(dialect, column_names)).bindparams(query=query, limit=limit)
+            return select(models.Article).from_statement(fts_sql)
+    return _like_search_statement(topic, limit)
+
+def search_articles_by_topic(db: Session, topic: str, limit: int = 8):
+    statement = _topic_search_statement(db.get_bind().dialect.name, topic, limit)
+    return db.execute(statement).scalars().all()
+
+# --- Asenkron (AsyncSession) sürümler ---
+# Sohbet ve araç yolları bu fonksiyonları kullanır; böylece sorgular event loop'u bloklamaz.
+
+async def aget_article_by_url(db: AsyncSession, url: str):
+    result = await db.execute(select(models.Article).where(models.Article.url == url).limit(1))
+    return result.scalars().first()
+
+async def acreate_article(db: AsyncSession, article: ArticleCreate):
+    db_article = models.Article(
+        title=article.title,
+        url=article.url,
+        source=article.source,
+        publish_date=article.publish_date,
+        content=article.content,
+        summary=article.summary,
+        keywords=article.keywords,
+    )
+    db.add(db_article)
+    await db.commit()
+    await db.refresh(db_article)
+    return db_article
+
+async def aupdate_article_summary_and_keywords(db: AsyncSession, article_id: int, summary: str, keywords: str):
+    db_article = await db.get(models.Article, article_id)
+    if db_article:
+        db_article.summary = summary
+        db_article.keywords = keywords
+        await db.commit()
+        await db.refresh(db_article)
+    return db_article
+
+async def aget_recent_articles(db: AsyncSession, days_ago: int, limit: int = 8):
+    cutoff_date = utcnow() - timedelta(days=days_ago)
+    result = await db.execute(
+        select(models.Article)
+        .options(_card_options())
+        .where(models.Article.publish_date >= cutoff_date)
+        .order_by(models.Article.publish_date.desc())
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+def _topic_filter(dialect: str, topic: str):
+    if search_index.is_available(dialect):
+        query = search_index.search_query_param(dialect, topic)
+        if query:
+            return text(search_index.fts_filter_sql(dialect)).bindparams(query=query)
+    search = f"%{topic}%"
+    return models.Article.title.like(search) | models.Article.keywords.like(search) | models.Article.summary.like(search)
 
+async def aget_articles_page(
+    db: AsyncSession,
+    limit: int,
+    before: Optional[Tuple[datetime, int]] = None,
+    source: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    topic: Optional[str] = None,
+):
+    """
+    Makale kartlarını `(publish_date, id)` azalan sırasıyla döndürür. `before` bir önceki
+    sayfanın son makalesinin `(publish_date, id)` çiftidir (keyset sayfalama): OFFSET
+    kullanılmadığı için derin sayfalar da indeks üzerinden aynı hızda okunur.
+    """
+    A = models.Article
+    statement = select(A).options(_card_options()).where(A.publish_date.isnot(None))
+    if source:
+        statement = statement.where(A.source == source)
+    if since is not None:
+        statement = statement.where(A.publish_date >= since)
+    if until is not None:
+        statement = statement.where(A.publish_date < until)
+    if topic:
+        statement = statement.where(_topic_filter(db.get_bind().dialect.name, topic))
+    if before is not None:
+        before_date, before_id = before
+        statement = statement.where(or_(A.publish_date < before_date, and_(A.publish_date == before_date, A.id < before_id)))
+    result = await db.execute(statement.order_by(A.publish_date.desc(), A.id.desc()).limit(limit))
+    return result.scalars().all()
+
+async def asearch_articles_by_topic(db: AsyncSession, topic: str, limit: int = 8):
+    statement = _topic_search_statement(db.get_bind().dialect.name, topic, limit)
+    result = await db.execute(statement)
+    return result.scalars().all()
+
+async def aget_articles_by_ids(db: AsyncSession, article_ids: list):
+    """Makaleleri verilen ID sırasını koruyarak döndürür."""
+    if not article_ids:
+        return []
+    result = await db.execute(
+        select(models.Article).options(_card_options()).where(models.Article.id.in_(article_ids))
+    )
+    by_id = {article.id: article for article in result.scalars().all()}
+    return [by_id[article_id] for article_id in article_ids if article_id in by_id]
+
+async def aload_contents(db: AsyncSession, articles: list):
+    """
+    Kart sütunlarıyla yüklenmiş makalelerin ertelenen `content` sütununu tek sorguda doldurur.
+    Oturum kapandıktan sonra tembel yükleme yapılamadığı için içerik gerekecekse bu çağrılmalıdır.
+    """
+    if not articles:
+        return
+    result = await db.execute(
+        select(models.Article.id, models.Article.content)
+        .where(models.Article.id.in_([article.id for article in articles]))
+    )
+    contents = dict(result.all())
+    for article in articles:
+        set_committed_value(article, "content", contents.get(article.id))
@@ -1,12 +1,21 @@
+import json
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.database import models, schemas
 
-def create_chat_history(db: Session, history: schemas.ChatHistoryCreate):
-    db_history = models.ChatHistory(
+def _to_model(history: schemas.ChatHistoryCreate) -> models.ChatHistory:
+    return models.ChatHistory(
         user_id=history.user_id,
         query=history.query,
-        response=history.response
+        response=history.response,
+        tool_name=history.tool_name,
+        tool_args=json.dumps(history.tool_args, ensure_ascii=False) if history.tool_args is not None else None,
+        article_ids=json.dumps(history.article_ids) if history.article_ids is not None else None,
     )
+
+def create_chat_history(db: Session, history: schemas.ChatHistoryCreate):
+    db_history = _to_model(history)
     db.add(db_history)
     db.commit()
     db.refresh(db_history)
@@ -15,3 +24,38 @@ def create_chat_history(db: Session, history: schemas.ChatHistoryCreate):
 def get_chat_history_by_user(db: Session, user_id: str, limit: int = 10):
     return db.query(models.ChatHistory).filter(models.ChatHistory.user_id == user_id).order_by(models.ChatHistory.timestamp.desc()).limit(limit).all()
 
+# --- Asenkron (AsyncSession) sürümler ---
+
+async def acreate_chat_history(db: AsyncSession, history: schemas.ChatHistoryCreate):
+    db_history = _to_model(history)
+    db.add(db_history)
+    await db.commit()
+    await db.refresh(db_history)
+    return db_history
+
+async def aget_chat_history_by_user(db: AsyncSession, user_id: str, limit: int = 10):
+    result = await db.execute(
+        select(models.ChatHistory)
+        .where(models.ChatHistory.user_id == user_id)
+        .order_by(models.ChatHistory.timestamp.desc())
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+async def aget_recent_turns(db: AsyncSession, user_id: str, limit: int = 10):
+    """
+    Planlayıcı bağlamı için son konuşma turlarını (en yeni önce) yalnızca gereken
+    sütunlarla döndürür; (user_id, timestamp) indeksi üzerinde tek bir aralık okumasıdır.
+    """
+    result = await db.execute(
+        select(
+            models.ChatHistory.query,
+            models.ChatHistory.response,
+            models.ChatHistory.tool_name,
+            models.ChatHistory.tool_args,
+        )
+        .where(models.ChatHistory.user_id == user_id)
+        .order_by(models.ChatHistory.timestamp.desc(), models.ChatHistory.id.desc())
+        .limit(limit)
+    )
+    return result.all()
@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.clock import utcnow
+from app.database import models
+
+def save_article_embedding(db: Session, article_id: int, model: str, dim: int, vector: bytes, commit: bool = True):
+    db_embedding = db.get(models.ArticleEmbedding, article_id)
+    if db_embedding is None:
+        db_embedding = models.ArticleEmbedding(article_id=article_id)
+        db.add(db_embedding)
+    db_embedding.model = model
+    db_embedding.dim = dim
+    db_embedding.vector = vector
+    db_embedding.updated_at = utcnow()
+    if commit:
+        db.commit()
+    return db_embedding
+
+def get_articles_without_embedding(db: Session, model: str, after_article_id: int = 0, limit: int = 100):
+    """
+    Verilen modelle embedding'i olmayan özgün (kopya olarak işaretlenmemiş) makalelerin
+    (id, başlık, özet, anahtar kelimeler) satırlarını ID sırasıyla döndürür.
+    """
+    return (
+        db.query(models.Article.id, models.Article.title, models.Article.summary, models.Article.keywords)
+        .outerjoin(
+            models.ArticleEmbedding,
+            and_(models.ArticleEmbedding.article_id == models.Article.id, models.ArticleEmbedding.model == model),
+        )
+        .outerjoin(models.ArticleFingerprint, models.ArticleFingerprint.article_id == models.Article.id)
+        .filter(models.ArticleEmbedding.article_id.is_(None))
+        .filter(models.ArticleFingerprint.duplicate_of_id.is_(None))
+        .filter(models.Article.id > after_article_id)
+        .order_by(models.Article.id)
+        .limit(limit)
+        .all()
+    )
+
+async def aget_embedding_stamps(db: AsyncSession, model: str, since: Optional[datetime] = None):
+    """
+    Verilen modelle `since` anından (dahil) sonra yazılmış vektörlerin (article_id, updated_at)
+    satırları; `since` verilmezse tümü. Vektörlerin kendisi okunmaz.
+    """
+    statement = select(models.ArticleEmbedding.article_id, models.ArticleEmbedding.updated_at).where(
+        models.ArticleEmbedding.model == model
+    )
+    if since is not None:
+        statement = statement.where(models.ArticleEmbedding.updated_at >= since)
+    result = await db.execute(statement)
+    return result.all()
+
+async def aget_embeddings(db: AsyncSession, model: str, article_ids: list):
+    """Verilen makalelerin bu modelle üretilmiş vektörlerini (article_id, vector) olarak döndürür."""
+    result = await db.execute(
+        select(models.ArticleEmbedding.article_id, models.ArticleEmbedding.vector)
+        .where(models.ArticleEmbedding.model == model)
+        .where(models.ArticleEmbedding.article_id.in_(article_ids))
+        .order_by(models.ArticleEmbedding.article_id)
+    )
+    return result.all()
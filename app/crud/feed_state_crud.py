@@ -0,0 +1,25 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.database import models
+
+def get_feed_states(db: Session):
+    """Tüm kaynakların durumlarını `source -> FeedState` sözlüğü olarak döndürür."""
+    return {state.source: state for state in db.query(models.FeedState).all()}
+
+def upsert_feed_state(db: Session, source: str, url: str, commit: bool = True, **fields):
+    """Kaynağın durum satırını oluşturur veya verilen alanlarla (etag, last_status, next_poll_at, ...) günceller."""
+    db_state = db.get(models.FeedState, source)
+    if db_state is None:
+        db_state = models.FeedState(source=source)
+        db.add(db_state)
+    db_state.url = url
+    for name, value in fields.items():
+        setattr(db_state, name, value)
+    if commit:
+        db.commit()
+    return db_state
+
+async def aget_feed_states(db: AsyncSession):
+    result = await db.execute(select(models.FeedState))
+    return {state.source: state for state in result.scalars().all()}
@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.database import models
+
+def save_article_fingerprint(db: Session, article_id: int, simhash: int, duplicate_of_id: Optional[int] = None, commit: bool = True):
+    db_fingerprint = models.ArticleFingerprint(
+        article_id=article_id,
+        simhash=simhash,
+        duplicate_of_id=duplicate_of_id,
+    )
+    db.merge(db_fingerprint)
+    if commit:
+        db.commit()
+    return db_fingerprint
+
+def get_fingerprints_after(db: Session, after_article_id: int, since: datetime):
+    """`since` tarihinden sonra kaydedilmiş ve ID'si `after_article_id`'den büyük parmak izlerini döndürür."""
+    return db.query(
+        models.ArticleFingerprint.article_id,
+        models.ArticleFingerprint.simhash,
+        models.ArticleFingerprint.duplicate_of_id,
+        models.ArticleFingerprint.created_at,
+    ).filter(
+        models.ArticleFingerprint.article_id > after_article_id,
+        models.ArticleFingerprint.created_at >= since,
+    ).order_by(models.ArticleFingerprint.article_id).all()
+
+async def aget_duplicate_map(db: AsyncSession, article_ids: List[int]) -> Dict[int, int]:
+    """Verilen makalelerden bir başka makalenin kopyası olanlar için `article_id -> duplicate_of_id` döndürür."""
+    if not article_ids:
+        return {}
+    result = await db.execute(
+        select(models.ArticleFingerprint.article_id, models.ArticleFingerprint.duplicate_of_id)
+        .where(models.ArticleFingerprint.article_id.in_(article_ids))
+        .where(models.ArticleFingerprint.duplicate_of_id.isnot(None))
+    )
+    return {article_id: duplicate_of_id for article_id, duplicate_of_id in result.all()}
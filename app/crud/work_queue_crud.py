@@ -0,0 +1,225 @@
+import json
+from datetime import datetime, timedelta
+from typing import Dict, List
+from sqlalchemy import and_, delete, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.clock import utcnow
+from app.database import models
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+DEAD = "dead"
+
+# Çoklu VALUES eklemelerinde satır parça boyutu (SQLite parametre limiti için)
+_INSERT_CHUNK_SIZE = 200
+
+def _conflict_ignoring_insert(db: Session):
+    """`ON CONFLICT DO NOTHING` destekleyen lehçeler için INSERT ifadesi; diğerlerinde None."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert(models.IngestionWorkItem)
+
+def _insert_each_ignoring_conflicts(db: Session, rows: List[dict]) -> int:
+    """Taşınabilir yol: her satır kendi SAVEPOINT'inde eklenir, URL'si kuyrukta olanlar atlanır."""
+    inserted = 0
+    for row in rows:
+        try:
+            with db.begin_nested():
+                db.execute(insert(models.IngestionWorkItem).values(row))
+        except IntegrityError:
+            continue
+        inserted += 1
+    return inserted
+
+def _payload(article_data: dict) -> str:
+    publish_date = article_data.get("publish_date")
+    return json.dumps({
+        "title": article_data["title"],
+        "source": article_data["source"],
+        "publish_date": publish_date.isoformat() if publish_date else None,
+    }, ensure_ascii=False)
+
+def work_item_article_data(url: str, payload: str) -> dict:
+    """Kuyruk satırını `process_and_save_article`'ın beklediği sözlüğe çevirir."""
+    data = json.loads(payload)
+    publish_date = data.get("publish_date")
+    return {
+        "url": url,
+        "title": data["title"],
+        "source": data["source"],
+        "publish_date": datetime.fromisoformat(publish_date) if publish_date else utcnow(),
+    }
+
+def enqueue_work_items(db: Session, articles: List[dict]) -> int:
+    """Makaleleri kuyruğa ekler; URL'si zaten kuyrukta olanları atlar. Eklenen satır sayısını döndürür."""
+    now = utcnow()
+    rows = [
+        {"url": article["url"], "payload": _payload(article), "status": PENDING, "attempts": 0, "available_at": now}
+        for article in articles
+    ]
+    if _conflict_ignoring_insert(db) is None:
+        inserted = _insert_each_ignoring_conflicts(db, rows)
+        db.commit()
+        return inserted
+    inserted = 0
+    for i in range(0, len(rows), _INSERT_CHUNK_SIZE):
+        statement = (
+            _conflict_ignoring_insert(db)
+            .values(rows[i:i + _INSERT_CHUNK_SIZE])
+            .on_conflict_do_nothing(index_elements=["url"])
+            .returning(models.IngestionWorkItem.id)
+        )
+        inserted += len(db.execute(statement).all())
+    db.commit()
+    return inserted
+
+def dead_letter_expired(db: Session, max_attempts: int) -> int:
+    """Kirası dolmuş ve deneme hakkı bitmiş işleri (ör. işleyen işçi her seferinde çöktüyse) ölü kuyruğa taşır."""
+    W = models.IngestionWorkItem
+    result = db.execute(
+        update(W)
+        .where(W.status == LEASED, W.lease_expires_at < utcnow(), W.attempts >= max_attempts)
+        .values(status=DEAD, lease_owner=None, last_error=func.coalesce(W.last_error, "lease expired"))
+    )
+    db.commit()
+    return result.rowcount
+
+def claim_work_items(db: Session, worker_id: str, limit: int, lease_seconds: float) -> List[models.IngestionWorkItem]:
+    """
+    Sırası gelmiş bekleyen işleri ve kirası dolmuş işleri `worker_id` adına kiralar.
+
+    Tek bir `UPDATE ... WHERE id IN (SELECT ... LIMIT n) RETURNING` ifadesidir.
+    PostgreSQL'de alt sorgu `FOR UPDATE SKIP LOCKED` kullanır, böylece eş zamanlı
+    işçiler birbirini beklemeden farklı satırlar alır. SQLite'ta satır kilidi yoktur
+    ama yazma işlemleri veritabanı düzeyinde sıralandığı için tek ifadelik bu
+    güncelleme atomiktir; iki işçi aynı satırı alamaz.
+    """
+    W = models.IngestionWorkItem
+    now = utcnow()
+    claimable = (
+        select(W.id)
+        .where(or_(
+            and_(W.status == PENDING, W.available_at <= now),
+            and_(W.status == LEASED, W.lease_expires_at < now),
+        ))
+        .order_by(W.id)
+        .limit(limit)
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        claimable = claimable.with_for_update(skip_locked=True)
+    result = db.execute(
+        update(W)
+        .where(W.id.in_(claimable.scalar_subquery()))
+        .values(
+            status=LEASED,
+            lease_owner=worker_id,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+            attempts=W.attempts + 1,
+        )
+        .returning(W.id, W.url, W.payload, W.attempts)
+        .execution_options(synchronize_session=False)
+    )
+    claimed = result.all()
+    db.commit()
+    return claimed
+
+def renew_leases(db: Session, worker_id: str, item_ids: List[int], lease_seconds: float) -> int:
+    """İşçinin hâlâ işlediği kalemlerin kirasını uzatır."""
+    if not item_ids:
+        return 0
+    W = models.IngestionWorkItem
+    result = db.execute(
+        update(W)
+        .where(W.id.in_(item_ids), W.status == LEASED, W.lease_owner == worker_id)
+        .values(lease_expires_at=utcnow() + timedelta(seconds=lease_seconds))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+def complete_work_item(db: Session, item_id: int, worker_id: str) -> bool:
+    """İşi tamamlandı olarak işaretler; kira başka bir işçiye geçtiyse False döner."""
+    W = models.IngestionWorkItem
+    result = db.execute(
+        update(W)
+        .where(W.id == item_id, W.status == LEASED, W.lease_owner == worker_id)
+        .values(status=DONE, lease_owner=None, lease_expires_at=None, last_error=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+def fail_work_item(db: Session, item_id: int, worker_id: str, attempts: int, error: str, max_attempts: int, retry_seconds: float) -> str:
+    """
+    Başarısız denemeyi kaydeder. Deneme hakkı kaldıysa iş üstel bekleme ile yeniden
+    kuyruğa girer, kalmadıysa ölü kuyruğa taşınır. Yeni durumu döndürür.
+    """
+    W = models.IngestionWorkItem
+    if attempts >= max_attempts:
+        values = {"status": DEAD}
+    else:
+        delay = retry_seconds * (2 ** (attempts - 1))
+        values = {"status": PENDING, "available_at": utcnow() + timedelta(seconds=delay)}
+    db.execute(
+        update(W)
+        .where(W.id == item_id, W.lease_owner == worker_id)
+        .values(lease_owner=None, lease_expires_at=None, last_error=error[:2000], **values)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return values["status"]
+
+def defer_work_item(db: Session, item_id: int, worker_id: str, delay_seconds: float) -> bool:
+    """
+    İşi denemesini harcamadan ertelenmiş olarak kuyruğa geri koyar (ör. yayıncının devre
+    kesicisi açıkken). Kira başka bir işçiye geçtiyse False döner.
+    """
+    W = models.IngestionWorkItem
+    result = db.execute(
+        update(W)
+        .where(W.id == item_id, W.status == LEASED, W.lease_owner == worker_id)
+        .values(
+            status=PENDING,
+            attempts=W.attempts - 1,
+            available_at=utcnow() + timedelta(seconds=delay_seconds),
+            lease_owner=None,
+            lease_expires_at=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+def requeue_dead_items(db: Session) -> int:
+    """Ölü kuyruktaki işleri deneme sayıları sıfırlanmış olarak yeniden bekleyen duruma alır."""
+    W = models.IngestionWorkItem
+    result = db.execute(
+        update(W)
+        .where(W.status == DEAD)
+        .values(status=PENDING, attempts=0, available_at=utcnow(), last_error=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+def purge_done_items(db: Session, older_than: timedelta) -> int:
+    """`older_than` süresinden önce tamamlanmış işleri siler; silinen satır sayısını döndürür."""
+    W = models.IngestionWorkItem
+    result = db.execute(
+        delete(W)
+        .where(W.status == DONE, W.updated_at < utcnow() - older_than)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+def count_by_status(db: Session) -> Dict[str, int]:
+    W = models.IngestionWorkItem
+    return dict(db.execute(select(W.status, func.count()).group_by(W.status)).all())
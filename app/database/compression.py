@@ -0,0 +1,99 @@
+"""
+Makale içeriği (`Article.content`) için sıkıştırılmış saklama.
+
+İçerik yalnızca anlık özet üretilirken okunur ama tablonun büyük kısmını oluşturur.
+`CompressedText` değeri yazarken sıkıştırıp `BLOB`/`BYTEA` olarak saklar, okurken
+açar; ORM ve Core kodu `str` ile çalışmaya devam eder. Her değerin ilk baytı
+kodlamayı belirtir, böylece farklı ayarlarla yazılmış satırlar birlikte okunabilir:
+
+- `0x00`: sıkıştırılmamış UTF-8 (kısa metinler veya sıkıştırmanın küçültmediği durumlar)
+- `0x01`: zlib
+- `0x02`: zstd (`zstandard` paketi gerekir)
+"""
+import logging
+import threading
+import zlib
+from sqlalchemy.types import LargeBinary, TypeDecorator
+from app.core.config import CONTENT_COMPRESSION, CONTENT_COMPRESSION_LEVEL
+
+try:
+    import zstandard
+except ImportError:  # opsiyonel bağımlılık; yoksa zlib kullanılır
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+RAW = 0x00
+ZLIB = 0x01
+ZSTD = 0x02
+
+CODEC_NAMES = {RAW: "raw", ZLIB: "zlib", ZSTD: "zstd"}
+
+# Bu boyutun altındaki metinlerde sıkıştırma başlığı kazançtan büyük olur
+_MIN_COMPRESS_BYTES = 128
+
+def _configured_codec() -> int:
+    if CONTENT_COMPRESSION == "none":
+        return RAW
+    if CONTENT_COMPRESSION == "zstd":
+        if zstandard is not None:
+            return ZSTD
+        logger.info("CONTENT_COMPRESSION=zstd fakat zstandard paketi kurulu değil; zlib kullanılacak.")
+    return ZLIB
+
+CODEC = _configured_codec()
+
+# zstd sıkıştırıcı/açıcı nesneleri iş parçacıkları arasında paylaşılamaz
+_zstd_local = threading.local()
+
+def _zstd_compressor():
+    if not hasattr(_zstd_local, "compressor"):
+        _zstd_local.compressor = zstandard.ZstdCompressor(level=CONTENT_COMPRESSION_LEVEL)
+    return _zstd_local.compressor
+
+def _zstd_decompressor():
+    if not hasattr(_zstd_local, "decompressor"):
+        _zstd_local.decompressor = zstandard.ZstdDecompressor()
+    return _zstd_local.decompressor
+
+def compress(text: str, codec: int = None) -> bytes:
+    """Metni başlık baytıyla birlikte sıkıştırılmış olarak döndürür."""
+    codec = CODEC if codec is None else codec
+    data = text.encode("utf-8")
+    if codec == RAW or len(data) < _MIN_COMPRESS_BYTES:
+        return bytes([RAW]) + data
+    if codec == ZSTD:
+        packed = _zstd_compressor().compress(data)
+    else:
+        packed = zlib.compress(data, min(CONTENT_COMPRESSION_LEVEL, 9))
+    if len(packed) >= len(data):
+        return bytes([RAW]) + data
+    return bytes([codec]) + packed
+
+def decompress(blob: bytes) -> str:
+    codec, payload = blob[0], memoryview(blob)[1:]
+    if codec == RAW:
+        return bytes(payload).decode("utf-8")
+    if codec == ZLIB:
+        return zlib.decompress(payload).decode("utf-8")
+    if codec == ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstd ile sıkıştırılmış içerik okunamıyor: zstandard paketi kurulu değil.")
+        return _zstd_decompressor().decompress(payload).decode("utf-8")
+    raise ValueError(f"Bilinmeyen içerik sıkıştırma kodu: {codec}")
+
+class CompressedText(TypeDecorator):
+    """Python tarafında `str`, veritabanında sıkıştırılmış `BLOB` olan sütun tipi."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return compress(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return decompress(bytes(value))
@@ -0,0 +1,217 @@
+"""
+Mevcut veritabanları için hafif şema yükseltmeleri.
+
+`Base.metadata.create_all` yeni tabloları ve indeksleri oluşturur ama var olan
+tablolara sütun eklemez. Buradaki adımlar idempotenttir: eksik sütunlar
+eklenir, indeksler `IF NOT EXISTS` ile oluşturulur. SQLite ve PostgreSQL
+ikisi de bu DDL'i destekler.
+
+`migrate` tüm adımları (tablolar, yükseltmeler, tam metin indeksi) sırayla çalıştırır.
+Uygulama bunu `AUTO_MIGRATE` açıksa başlangıçta yapar; kapalıysa dağıtım sırasında
+ayrı bir adım olarak çalıştırılmalıdır:
+
+    python -m app.database.migrations
+
+Düz metin `articles.content` sütunundaki eski içerik, `compress_legacy_content`
+ile `content_compressed` sütununa sıkıştırılarak taşınır (tek seferlik, parça
+parça ve idempotent). Kazanılan alanın raporu için:
+
+    python -m app.database.migrations --content-report [--vacuum]
+"""
+import argparse
+import json
+import logging
+from sqlalchemy import DateTime, Float, Integer, LargeBinary, String, bindparam, inspect, text
+from sqlalchemy.engine import Engine
+from app.database import compression, models  # noqa: F401  (tabloların Base.metadata'ya kaydı için)
+from app.database.database import Base
+from app.database.search_index import setup_search_index
+
+logger = logging.getLogger(__name__)
+
+# tablo -> [(sütun, SQL tipi)]; SQLAlchemy tipleri veritabanının kendi adına derlenir (BLOB/BYTEA)
+_ADDED_COLUMNS = {
+    "articles": [
+        ("content_compressed", LargeBinary()),
+    ],
+    "article_embeddings": [
+        ("updated_at", DateTime()),
+    ],
+    "chat_history": [
+        ("tool_name", "VARCHAR"),
+        ("tool_args", "TEXT"),
+        ("article_ids", "TEXT"),
+    ],
+    "feed_states": [
+        ("items_per_hour", Float()),
+        ("last_new_item_at", DateTime()),
+        ("last_success_at", DateTime()),
+        ("consecutive_failures", Integer()),
+        ("last_error", String()),
+        ("next_poll_at", DateTime()),
+    ],
+}
+
+_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_articles_publish_date ON articles (publish_date)",
+    "CREATE INDEX IF NOT EXISTS ix_articles_publish_date_id ON articles (publish_date, id)",
+    "CREATE INDEX IF NOT EXISTS ix_chat_history_user_id_timestamp ON chat_history (user_id, timestamp)",
+    "CREATE INDEX IF NOT EXISTS ix_article_embeddings_model_updated_at ON article_embeddings (model, updated_at)",
+]
+
+# PostgreSQL'e özgü adımlar: (zaten uygulanmışsa True dönen sorgu, DDL). ALTER TABLE tabloyu
+# ACCESS EXCLUSIVE kilidiyle kilitlediği için her başlangıçta değil, yalnızca gerekiyorsa çalıştırılır.
+_POSTGRES_DDL = [
+    # İçerik uygulamada sıkıştırıldığı için TOAST'un ikinci kez (pglz) sıkıştırmayı denemesi gereksiz
+    (
+        "SELECT attstorage = 'e' FROM pg_attribute "
+        "WHERE attrelid = 'articles'::regclass AND attname = 'content_compressed'",
+        "ALTER TABLE articles ALTER COLUMN content_compressed SET STORAGE EXTERNAL",
+    ),
+]
+
+def upgrade_schema(engine: Engine):
+    """Eksik sütunları ve indeksleri ekler; zaten güncel bir veritabanında hiçbir şey yapmaz."""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table, columns in _ADDED_COLUMNS.items():
+            if not inspector.has_table(table):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table)}
+            for column, sql_type in columns:
+                if column not in existing:
+                    if not isinstance(sql_type, str):
+                        sql_type = sql_type.compile(dialect=engine.dialect)
+                    logger.info(f"Şema yükseltmesi: {table}.{column} sütunu ekleniyor.")
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {sql_type}"))
+        for ddl in _INDEXES:
+            conn.execute(text(ddl))
+        if engine.dialect.name == "postgresql":
+            for applied, ddl in _POSTGRES_DDL:
+                if not conn.execute(text(applied)).scalar():
+                    logger.info(f"Şema yükseltmesi: {ddl}")
+                    conn.execute(text(ddl))
+
+def _savings(plain_bytes: int, stored_bytes: int) -> dict:
+    return {
+        "plain_bytes": plain_bytes,
+        "stored_bytes": stored_bytes,
+        "saved_bytes": plain_bytes - stored_bytes,
+        "ratio": round(stored_bytes / plain_bytes, 3) if plain_bytes else None,
+    }
+
+def compress_legacy_content(engine: Engine, batch_size: int = 500):
+    """
+    Eski düz metin `articles.content` değerlerini sıkıştırıp `content_compressed`
+    sütununa taşır ve eski değeri NULL yapar (`upgrade_schema` sonrasında çalışmalıdır). Her parça ayrı transaction'dır; yarıda
+    kalırsa bir sonraki çalıştırma kaldığı yerden devam eder. Taşınan satırlar için
+    (satır sayısı, düz/saklanan bayt) raporu döndürür; eski sütun yoksa None.
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table("articles"):
+        return None
+    columns = {column["name"] for column in inspector.get_columns("articles")}
+    if "content" not in columns or "content_compressed" not in columns:
+        return None
+
+    select_batch = text(
+        "SELECT id, content FROM articles WHERE content IS NOT NULL AND id > :after ORDER BY id LIMIT :limit"
+    )
+    update_row = text(
+        "UPDATE articles SET content_compressed = :blob, content = NULL WHERE id = :id"
+    ).bindparams(bindparam("blob", type_=LargeBinary))
+
+    rows_done, plain_bytes, stored_bytes, after = 0, 0, 0, 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(select_batch, {"after": after, "limit": batch_size}).all()
+            if not rows:
+                break
+            params = []
+            for article_id, content in rows:
+                blob = compression.compress(content)
+                plain_bytes += len(content.encode("utf-8"))
+                stored_bytes += len(blob)
+                params.append({"id": article_id, "blob": blob})
+            conn.execute(update_row, params)
+        rows_done += len(rows)
+        after = rows[-1][0]
+
+    report = {"rows": rows_done, **_savings(plain_bytes, stored_bytes)}
+    if rows_done:
+        logger.info(
+            f"Makale içeriği sıkıştırıldı: {rows_done} satır, {plain_bytes} -> {stored_bytes} bayt "
+            f"(oran {report['ratio']})."
+        )
+    return report
+
+def _database_bytes(conn):
+    dialect = conn.engine.dialect.name
+    if dialect == "sqlite":
+        page_count = conn.execute(text("PRAGMA page_count")).scalar()
+        page_size = conn.execute(text("PRAGMA page_size")).scalar()
+        return page_count * page_size
+    if dialect == "postgresql":
+        return conn.execute(text("SELECT pg_total_relation_size(to_regclass('articles'))")).scalar()
+    return None
+
+def content_storage_report(engine: Engine, batch_size: int = 1000) -> dict:
+    """
+    Saklanan içeriğin sıkıştırılmış ve açılmış boyutlarını, kodlama dağılımını ve
+    veritabanı (PostgreSQL'de `articles` tablosu) boyutunu raporlar. Tüm içerik
+    açıldığı için tek seferlik/yönetim amaçlıdır.
+    """
+    select_batch = text(
+        "SELECT id, content_compressed FROM articles "
+        "WHERE content_compressed IS NOT NULL AND id > :after ORDER BY id LIMIT :limit"
+    )
+    rows_done, plain_bytes, stored_bytes, after = 0, 0, 0, 0
+    codecs = {}
+    with engine.connect() as conn:
+        while True:
+            rows = conn.execute(select_batch, {"after": after, "limit": batch_size}).all()
+            if not rows:
+                break
+            for article_id, blob in rows:
+                blob = bytes(blob)
+                name = compression.CODEC_NAMES.get(blob[0], "unknown")
+                codecs[name] = codecs.get(name, 0) + 1
+                plain_bytes += len(compression.decompress(blob).encode("utf-8"))
+                stored_bytes += len(blob)
+            rows_done += len(rows)
+            after = rows[-1][0]
+        database_bytes = _database_bytes(conn)
+    return {"rows": rows_done, **_savings(plain_bytes, stored_bytes), "codecs": codecs, "database_bytes": database_bytes}
+
+def vacuum(engine: Engine):
+    """Boşalan sayfaları geri kazanır; SQLite'ta dosya ancak VACUUM ile küçülür."""
+    statement = "VACUUM" if engine.dialect.name == "sqlite" else "VACUUM articles"
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(statement))
+
+def migrate(engine: Engine):
+    """Eksik tabloları oluşturur, şemayı yükseltir, eski içeriği sıkıştırır ve tam metin indeksini kurar."""
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+    compress_legacy_content(engine)
+    setup_search_index(engine)
+
+if __name__ == "__main__":
+    from app.database.database import engine
+
+    parser = argparse.ArgumentParser(description="Veritabanı şemasını günceller.")
+    parser.add_argument("--content-report", action="store_true", help="Sıkıştırılmış içerik alan raporunu yazdır")
+    parser.add_argument("--vacuum", action="store_true", help="Taşımadan sonra boşalan alanı geri kazan (VACUUM)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with engine.connect() as conn:
+        database_bytes_before = _database_bytes(conn)
+    migrate(engine)
+    logger.info("Veritabanı şeması güncel.")
+    if args.vacuum:
+        vacuum(engine)
+    if args.content_report:
+        report = content_storage_report(engine)
+        report["database_bytes_before"] = database_bytes_before
+        print(json.dumps(report, indent=2))
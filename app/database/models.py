@@ -1,4 +1,7 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, func
+from sqlalchemy import Column, Integer, BigInteger, Float, String, Text, DateTime, LargeBinary, ForeignKey, Index, func
+from sqlalchemy.orm import deferred
+from app.core.clock import utcnow
+from app.database.compression import CompressedText
 from app.database.database import Base
 
 class Article(Base):
@@ -8,11 +11,15 @@ class Article(Base):
     title = Column(String, index=True)
     url = Column(String, unique=True, index=True)
     source = Column(String)
-    publish_date = Column(DateTime)
-    content = Column(Text)
+    publish_date = Column(DateTime, index=True)
+    # Sıkıştırılmış saklanır ve ertelenir: yalnızca erişildiğinde (veya `aload_contents` ile) okunup açılır
+    content = deferred(Column("content_compressed", CompressedText, key="content"))
     summary = Column(Text)
     keywords = Column(String)
 
+    # `/articles` listesinin (publish_date, id) keyset sayfalaması için
+    __table_args__ = (Index("ix_articles_publish_date_id", "publish_date", "id"),)
+
 
 class ChatHistory(Base):
     __tablename__ = "chat_history"
@@ -20,6 +27,73 @@ class ChatHistory(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(String, index=True)
     query = Column(Text)
+    # Araç kullanılan yanıtlarda yalnızca giriş cümlesi tutulur; kartlar plan ve ID'lerden yeniden üretilebilir
     response = Column(Text)
+    tool_name = Column(String, nullable=True)
+    tool_args = Column(Text, nullable=True)  # JSON
+    article_ids = Column(Text, nullable=True)  # JSON liste
     timestamp = Column(DateTime, default=func.now())
 
+    # Geçmiş yüklemesi tek bir indeks aralık okumasıdır: WHERE user_id = ? ORDER BY timestamp DESC
+    __table_args__ = (Index("ix_chat_history_user_id_timestamp", "user_id", "timestamp"),)
+
+
+
+class ArticleEmbedding(Base):
+    __tablename__ = "article_embeddings"
+
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    model = Column(String, index=True)
+    dim = Column(Integer)
+    vector = Column(LargeBinary)  # float32, little-endian
+    # Vektörün yazıldığı an (UTC); süreç içi vektör indeksi yalnızca bu damgadan yeni satırları okur
+    updated_at = Column(DateTime, default=utcnow, nullable=True)
+
+    __table_args__ = (Index("ix_article_embeddings_model_updated_at", "model", "updated_at"),)
+
+
+class FeedState(Base):
+    __tablename__ = "feed_states"
+
+    source = Column(String, primary_key=True)
+    url = Column(String)
+    etag = Column(String)
+    last_modified = Column(String)
+    last_status = Column(Integer)
+    last_fetched_at = Column(DateTime)
+    # Uyarlanabilir yoklama ve devre kesici durumu (bkz. services/source_health.py)
+    items_per_hour = Column(Float, nullable=True)
+    last_new_item_at = Column(DateTime, nullable=True)  # UTC, RSS zaman damgası
+    last_success_at = Column(DateTime, nullable=True)
+    consecutive_failures = Column(Integer, default=0)
+    last_error = Column(String, nullable=True)
+    next_poll_at = Column(DateTime, nullable=True)
+
+
+class ArticleFingerprint(Base):
+    __tablename__ = "article_fingerprints"
+
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    simhash = Column(BigInteger)  # 64 bit SimHash, işaretli tamsayı olarak saklanır
+    duplicate_of_id = Column(Integer, ForeignKey("articles.id", ondelete="SET NULL"), index=True, nullable=True)
+    created_at = Column(DateTime, default=utcnow, index=True)
+
+
+class IngestionWorkItem(Base):
+    """Ayrı ingestion işçilerinin paylaştığı makale başına iş kuyruğu."""
+    __tablename__ = "ingestion_work_items"
+
+    id = Column(Integer, primary_key=True)
+    url = Column(String, unique=True, nullable=False)
+    payload = Column(Text, nullable=False)  # JSON: title, source, publish_date
+    status = Column(String, nullable=False, default="pending")  # pending | leased | done | dead
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False)
+    lease_owner = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=utcnow)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
+
+    # İşçiler yalnızca alınabilir satırları tarar: WHERE status = ? AND available_at <= ?
+    __table_args__ = (Index("ix_ingestion_work_items_status_available_at", "status", "available_at"),)
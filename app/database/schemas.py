@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class ArticleBase(BaseModel):
     title: str
@@ -10,7 +10,8 @@ class ArticleBase(BaseModel):
     content: Optional[str] = None
 
 class ArticleCreate(ArticleBase):
-    pass
+    summary: Optional[str] = None
+    keywords: Optional[str] = None
 
 class Article(ArticleBase):
     id: int
@@ -20,13 +21,28 @@ class Article(ArticleBase):
     class Config:
         orm_mode = True
 
+class ArticleCard(BaseModel):
+    id: int
+    title: str
+    url: str
+    source: str
+    publish_date: Optional[datetime] = None
+    summary: Optional[str] = None
+    keywords: Optional[str] = None
+
+class ArticlePage(BaseModel):
+    items: List[ArticleCard]
+    next_cursor: Optional[str] = None
+
 class ChatHistoryBase(BaseModel):
     user_id: str
     query: str
     response: str
 
 class ChatHistoryCreate(ChatHistoryBase):
-    pass
+    tool_name: Optional[str] = None
+    tool_args: Optional[dict] = None
+    article_ids: Optional[List[int]] = None
 
 class ChatHistory(ChatHistoryBase):
     id: int
@@ -0,0 +1,222 @@
+"""
+Makale tablosu için tam metin arama (full-text search) indeksi.
+
+SQLite üzerinde harici içerikli (external content) bir FTS5 tablosu, PostgreSQL
+üzerinde ise GIN indeksli bir tsvector sütunu kullanılır. İndeks, veritabanı
+tarafında (SQLite'ta tetikleyiciler, PostgreSQL'de üretilmiş sütun) güncel
+tutulduğu için `article_crud` yazma fonksiyonlarının ekstra bir adım atmasına
+gerek kalmaz.
+
+İki arka uçta da konu araması aynı anlama gelir: durak kelimeler atıldıktan sonra
+kalan *tüm* terimler eşleşmelidir (AND); her terim Türkçe veya İngilizce kökünden
+yakalanabilir. Sonuçlar alaka düzeyine, eşitlikte yayın tarihine göre sıralanır.
+"""
+import logging
+import re
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from app.database import models
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "articles_fts"
+
+# Başlık, anahtar kelimeler ve özet için bm25 ağırlıkları (SQLite)
+BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+# İndeksin başarıyla kurulduğu veritabanı lehçeleri ("sqlite", "postgresql")
+_available_dialects = set()
+
+_SQLITE_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, keywords, summary,
+        content='articles', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, keywords, summary)
+        VALUES (new.id, new.title, new.keywords, new.summary);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, keywords, summary)
+        VALUES ('delete', old.id, old.title, old.keywords, old.summary);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF title, keywords, summary ON articles BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, keywords, summary)
+        VALUES ('delete', old.id, old.title, old.keywords, old.summary);
+        INSERT INTO {FTS_TABLE}(rowid, title, keywords, summary)
+        VALUES (new.id, new.title, new.keywords, new.summary);
+    END
+    """,
+]
+
+# Türkçe ve İngilizce kökleri aynı vektörde tutmak için iki yapılandırma birleştirilir.
+_PG_VECTOR_EXPR = " || ".join(
+    f"setweight(to_tsvector('{config}'::regconfig, coalesce({column}, '')), '{weight}')"
+    for config in ("turkish", "english")
+    for column, weight in (("title", "A"), ("keywords", "B"), ("summary", "C"))
+)
+
+_POSTGRES_DDL = [
+    f"ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ({_PG_VECTOR_EXPR}) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_articles_search_vector ON articles USING GIN (search_vector)",
+]
+
+def setup_search_index(engine: Engine) -> bool:
+    """Veritabanı lehçesine uygun tam metin indeksini (yoksa) oluşturur."""
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as conn:
+            if dialect == "sqlite":
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {"name": FTS_TABLE},
+                ).first()
+                for ddl in _SQLITE_DDL:
+                    conn.execute(text(ddl))
+                if not exists:
+                    # Mevcut satırları ilk kurulumda indeksle
+                    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+            elif dialect == "postgresql":
+                for ddl in _POSTGRES_DDL:
+                    conn.execute(text(ddl))
+            else:
+                logger.info(f"Tam metin indeksi bu veritabanı için desteklenmiyor: {dialect}")
+                return False
+    except Exception as e:
+        logger.warning(f"Tam metin indeksi kurulamadı, LIKE aramasına dönülecek ({dialect}): {e}")
+        return False
+
+    _available_dialects.add(dialect)
+    return True
+
+def detect_search_index(engine: Engine) -> bool:
+    """
+    İndeksi oluşturmadan, zaten kurulu olup olmadığını kontrol eder. Şema ayrı bir
+    adımda kurulduğunda (`AUTO_MIGRATE=false`) sunucu süreci bunu kullanır.
+    """
+    dialect = engine.dialect.name
+    if dialect == "sqlite":
+        sql = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+        params = {"name": FTS_TABLE}
+    elif dialect == "postgresql":
+        sql = "SELECT 1 FROM information_schema.columns WHERE table_name = 'articles' AND column_name = 'search_vector'"
+        params = {}
+    else:
+        return False
+    try:
+        with engine.connect() as conn:
+            exists = conn.execute(text(sql), params).first() is not None
+    except Exception as e:
+        logger.warning(f"Tam metin indeksi kontrol edilemedi, LIKE aramasına dönülecek ({dialect}): {e}")
+        return False
+    if exists:
+        _available_dialects.add(dialect)
+    else:
+        logger.warning("Tam metin indeksi bulunamadı, LIKE aramasına dönülecek: `python -m app.database.migrations` çalıştırın.")
+    return exists
+
+def is_available(dialect: str) -> bool:
+    return dialect in _available_dialects
+
+# Konu sorgularında anlam taşımayan kelimeler
+_STOPWORDS = {
+    "ve", "ile", "ilgili", "hakkında", "haber", "haberler", "haberleri", "son", "için", "bir",
+    "the", "and", "about", "news", "of", "for", "on", "in", "a", "an",
+}
+
+# En uzundan en kısaya; çekim ekleri kökten sırayla soyulur
+_TURKISH_SUFFIXES = sorted([
+    "lerinin", "larının", "lerini", "larını", "lerine", "larına", "lerinde", "larında",
+    "lerden", "lardan", "lerin", "ların", "leri", "ları", "ler", "lar",
+    "nin", "nın", "nun", "nün", "den", "dan", "ten", "tan", "de", "da",
+    "ini", "ını", "yle", "yla", "si", "sı", "su", "sü",
+    "in", "ın", "un", "ün", "i", "ı", "u", "ü", "e", "a",
+], key=len, reverse=True)
+
+_MIN_STEM_LENGTH = 3
+
+def _search_tokens(topic: str) -> list:
+    topic = topic.replace("İ", "i").lower()
+    return [t for t in re.findall(r"\w+", topic) if t not in _STOPWORDS]
+
+def turkish_stem(token: str) -> str:
+    """Basit Türkçe ek soyucu: çoğul, iyelik ve hal eklerini kökten ayırır."""
+    first_pass = True
+    changed = True
+    while changed:
+        changed = False
+        for suffix in _TURKISH_SUFFIXES:
+            # Tek harfli hal ekleri yalnızca kelimenin en sonunda olabilir
+            if len(suffix) == 1 and not first_pass:
+                continue
+            if token.endswith(suffix) and len(token) - len(suffix) >= _MIN_STEM_LENGTH:
+                token = token[: -len(suffix)]
+                changed = True
+                break
+        first_pass = False
+    return token
+
+def build_fts5_query(topic: str) -> str:
+    """
+    Kullanıcı konusunu FTS5 MATCH ifadesine çevirir; tüm terimler eşleşmelidir
+    (PostgreSQL'deki `websearch_to_tsquery` gibi). İngilizce kökler porter tokenizer ile,
+    Türkçe ekler ise kökün önek (prefix) sorgusu ile yakalanır.
+    """
+    groups = []
+    for token in _search_tokens(topic):
+        stem = turkish_stem(token)
+        if stem != token:
+            groups.append(f'("{token}" OR "{stem}"*)')
+        else:
+            groups.append(f'"{token}"')
+    return " AND ".join(groups)
+
+# Terimler her iki yapılandırmada AND ile bağlanır; iki sorgudan biri eşleşmesi yeterlidir
+_PG_TSQUERY_EXPR = "websearch_to_tsquery('turkish', :query) || websearch_to_tsquery('english', :query)"
+
+def fts_search_sql(dialect: str, column_names=None) -> str:
+    """
+    Makale satırlarını alaka düzeyine göre sıralı döndüren SQL metni.
+    `column_names` verilirse yalnızca bu sütunlar seçilir (ör. büyük `content` olmadan).
+    """
+    column_names = column_names or [c.name for c in models.Article.__table__.columns]
+    columns = ", ".join(f"articles.{name}" for name in column_names)
+    if dialect == "sqlite":
+        weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+        return (
+            f"SELECT {columns} FROM articles "
+            f"JOIN {FTS_TABLE} ON {FTS_TABLE}.rowid = articles.id "
+            f"WHERE {FTS_TABLE} MATCH :query "
+            f"ORDER BY bm25({FTS_TABLE}, {weights}), articles.publish_date DESC "
+            f"LIMIT :limit"
+        )
+    return (
+        f"SELECT {columns} FROM articles "
+        f"CROSS JOIN LATERAL (SELECT {_PG_TSQUERY_EXPR} AS q) AS tq "
+        "WHERE articles.search_vector @@ tq.q "
+        "ORDER BY ts_rank_cd(articles.search_vector, tq.q) DESC, articles.publish_date DESC "
+        "LIMIT :limit"
+    )
+
+def fts_filter_sql(dialect: str) -> str:
+    """
+    Makaleleri yalnızca tam metin eşleşmesine göre süzen WHERE koşulu (sıralama yapmaz);
+    sıralaması başka sütunlarla belirlenen sorgularda (ör. keyset sayfalama) kullanılır.
+    """
+    if dialect == "sqlite":
+        return f"articles.id IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :query)"
+    return f"articles.search_vector @@ ({_PG_TSQUERY_EXPR})"
+
+def search_query_param(dialect: str, topic: str) -> str:
+    """Lehçeye göre sorgu parametresini hazırlar; boş dönerse arama yapılmamalıdır."""
+    if dialect == "sqlite":
+        return build_fts5_query(topic)
+    return " ".join(_search_tokens(topic)) or topic.strip()
@@ -1,16 +1,67 @@
+import time
+
+# Uygulama modüllerinin içe aktarım süresi `/metrics`'te `novaai_startup_seconds_import` olarak raporlanır
+_import_started = time.perf_counter()
+
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from app.database.database import engine, Base
-from app.api.endpoints import news, chat
+from app.core.config import AUTO_MIGRATE, LLM_PREWARM, LOG_LEVEL
+from app.database.database import engine
+from app.database.migrations import migrate
+from app.database.search_index import detect_search_index
+from app.api.endpoints import articles, news, chat, metrics as metrics_endpoint
+from app.services import extraction, metrics
+from app.services.ingestion_jobs import job_manager
+import asyncio
 import os
 
-Base.metadata.create_all(bind=engine)
+logging.basicConfig(level=LOG_LEVEL)
+logger = logging.getLogger(__name__)
+
+# Başlangıç aşamalarının süreleri (saniye)
+startup_seconds = {}
+metrics.register_collector("novaai_startup_seconds", "Uygulama başlangıç aşamalarının süresi (saniye).", lambda: dict(startup_seconds))
+
+def _warm_chat_stack():
+    started = time.perf_counter()
+    try:
+        from app.services import chat_service
+
+        chat_service.warm_up()
+    except Exception as e:
+        logger.warning(f"Sohbet yığını önceden ısıtılamadı: {e}")
+        return
+    startup_seconds["chat_warmup"] = time.perf_counter() - started
+    logger.info(f"Sohbet yığını {startup_seconds['chat_warmup']:.2f} sn'de ısındı.")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Şema adımları içe aktarımda değil burada çalışır; AUTO_MIGRATE kapalıysa
+    # dağıtımda `python -m app.database.migrations` ile ayrıca çalıştırılmalıdır
+    started = time.perf_counter()
+    await asyncio.to_thread(migrate if AUTO_MIGRATE else detect_search_index, engine)
+    startup_seconds["schema"] = time.perf_counter() - started
+
+    # INGEST_SCHEDULE_MINUTES > 0 ise ingestion uygulama içinde periyodik tetiklenir
+    job_manager.start_schedule()
+
+    # Sohbet yığını istekleri bekletmeden arka planda yüklenir; ısınma bitmeden gelen
+    # ilk istek aynı modülleri içe aktarırken onu bekler
+    warmup = asyncio.create_task(asyncio.to_thread(_warm_chat_stack)) if LLM_PREWARM else None
+    yield
+    if warmup is not None:
+        await warmup
+    await job_manager.stop()
+    extraction.shutdown_extraction_pool()
 
 app = FastAPI(
     title="AI News Chatbot",
     description="A chatbot for querying AI and tech news.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS Ayarları
@@ -29,7 +80,9 @@ app.add_middleware(
 
 # API Router'ları
 app.include_router(news.router, prefix="/api/v1", tags=["news"])
+app.include_router(articles.router, prefix="/api/v1", tags=["articles"])
 app.include_router(chat.router, prefix="/api/v1", tags=["chat"])
+app.include_router(metrics_endpoint.router, tags=["metrics"])
 
 # React Frontend'ini Sunma
 # Bu bölüm, projenin build edilmiş halini sunmak içindir.
@@ -41,3 +94,4 @@ if os.path.exists("frontend/build"):
 def read_root():
     return {"message": "Welcome to the AI News Chatbot API"}
 
+startup_seconds["import"] = time.perf_counter() - _import_started
@@ -0,0 +1,139 @@
+"""
+Ingestion için tek yazıcılı (single-writer) toplu makale kaydedici.
+
+İşlenen makaleler bir asyncio kuyruğuna bırakılır; tek bir yazıcı görevi kuyruğu
+boşaltır ve makaleleri `ARTICLE_WRITER_BATCH_SIZE` adede ulaşıldığında ya da
+`ARTICLE_WRITER_FLUSH_SECONDS` dolduğunda tek bir transaction'da toplu olarak ekler.
+Böylece SQLite'ta eş zamanlı yazıcı ("database is locked") sorunu ve makale başına
+fsync ortadan kalkar. URL çakışmaları hata değil, "zaten mevcut" sonucu olarak döner.
+"""
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+from app.core.config import ARTICLE_WRITER_BATCH_SIZE, ARTICLE_WRITER_FLUSH_SECONDS
+from app.crud import article_crud, embedding_crud, fingerprint_crud
+from app.database import database, schemas
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+# (makale, (embedding modeli, boyut, vektör baytları) veya None, (simhash, kopyası olduğu makale) veya None, sonuç future'ı)
+_WriteItem = Tuple[
+    schemas.ArticleCreate,
+    Optional[Tuple[str, int, bytes]],
+    Optional[Tuple[int, Optional[int]]],
+    asyncio.Future,
+]
+
+def _write_batch(items: List[_WriteItem]) -> dict:
+    """Bir grup makaleyi tek transaction'da yazar; `url -> id` (çakışmalar hariç) döndürür."""
+    with next(database.get_db()) as db:
+        try:
+            inserted = article_crud.insert_articles_ignore_conflicts(db, [item[0] for item in items])
+            for article, embedding, fingerprint, _ in items:
+                article_id = inserted.get(article.url)
+                if article_id is None:
+                    continue
+                if embedding is not None:
+                    model, dim, vector = embedding
+                    embedding_crud.save_article_embedding(
+                        db, article_id=article_id, model=model, dim=dim, vector=vector, commit=False
+                    )
+                if fingerprint is not None:
+                    simhash, duplicate_of_id = fingerprint
+                    fingerprint_crud.save_article_fingerprint(
+                        db, article_id=article_id, simhash=simhash, duplicate_of_id=duplicate_of_id, commit=False
+                    )
+            db.commit()
+            return inserted
+        except Exception:
+            db.rollback()
+            raise
+
+class ArticleWriter:
+    def __init__(self, batch_size: int = ARTICLE_WRITER_BATCH_SIZE, flush_seconds: float = ARTICLE_WRITER_FLUSH_SECONDS):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    async def submit(
+        self,
+        article: schemas.ArticleCreate,
+        embedding: Optional[Tuple[str, int, bytes]] = None,
+        fingerprint: Optional[Tuple[int, Optional[int]]] = None,
+    ) -> Optional[int]:
+        """
+        Makaleyi yazma kuyruğuna ekler ve yazılmasını bekler.
+        Eklenen makalenin ID'sini, URL zaten varsa None döndürür; yazma hatasında exception fırlatır.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((article, embedding, fingerprint, future))
+        return await future
+
+    async def close(self):
+        """Kuyruktaki tüm makaleleri yazar ve yazıcı görevini sonlandırır."""
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def __aenter__(self):
+        return self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = loop.time() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[_WriteItem]):
+        logger.debug("   Toplu yazma: %d makale", len(batch))
+        try:
+            with metrics.DB_WRITE_SECONDS.time(mode="batch"):
+                inserted = await asyncio.to_thread(_write_batch, batch)
+        except Exception as e:
+            logger.error(f"Toplu yazma başarısız, makaleler tek tek yazılacak: {e}")
+            for item in batch:
+                await self._flush_single(item)
+            return
+        for article, _, _, future in batch:
+            if not future.done():
+                future.set_result(inserted.get(article.url))
+
+    async def _flush_single(self, item: _WriteItem):
+        article, _, _, future = item
+        try:
+            with metrics.DB_WRITE_SECONDS.time(mode="single"):
+                inserted = await asyncio.to_thread(_write_batch, [item])
+            if not future.done():
+                future.set_result(inserted.get(article.url))
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
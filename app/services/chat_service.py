@@ -1,46 +1,111 @@
+import asyncio
+import hashlib
 import logging
-from typing import List
-from sqlalchemy.orm import Session
+import time
+from typing import AsyncIterator, List, Optional, Tuple
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import AIMessage, HumanMessage
-from langchain_openai import ChatOpenAI
-from app.core.config import OPENAI_API_KEY
+from app.core.config import CHAT_HISTORY_MAX_TURNS, CHAT_HISTORY_TOKEN_BUDGET
+from app.services import intent_router, llm_client, metrics, result_cache
 from app.tools import db_tools
 from app.crud import chat_history_crud
 from app.database import schemas, database
 from app.database.models import Article
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def get_llm():
-    if not OPENAI_API_KEY:
-        raise ValueError("OPENAI_API_KEY ortam değişkeni ayarlanmadı.")
-    return ChatOpenAI(api_key=OPENAI_API_KEY, model="gpt-4o-mini", temperature=0)
+NO_PLAN_RESPONSE = "Size nasıl yardımcı olabilirim? 'Son 3 gün' veya 'Yapay zeka' gibi konularla ilgili haberleri arayabilirim."
+UNKNOWN_TOOL_RESPONSE = "Üzgünüm, isteğinizi anlayamadım."
+NO_RESULTS_RESPONSE = "Bu konuda veritabanımda bir bilgi bulamadım."
+ERROR_RESPONSE = "Üzgünüm, isteğinizi işlerken bir hata oluştu. Lütfen daha sonra tekrar deneyin."
+
+# Sohbet yolunun kullandığı (model, sıcaklık) istemcileri: planlayıcı ve anlık özet
+CHAT_LLM_CLIENTS = [("gpt-4o-mini", 0), ("gpt-4o-mini", 0.3)]
+
+def warm_up():
+    """LLM istemcilerini ve tokenizer'ı ilk sohbet isteğinden önce hazırlar."""
+    llm_client.warm_up(CHAT_LLM_CLIENTS)
+
+def format_article_card(index: int, article: Article) -> str:
+    """Tek bir makaleyi ön yüzün haber kartı olarak ayrıştırdığı Markdown bloğuna dönüştürür."""
+    summary_text = article.summary.strip() if article.summary else "Bu haber için özet mevcut değil."
+    return (
+        f"{index}. **{article.title.strip()}**\n"
+        f"   - **Kaynak:** {article.source.strip()}\n"
+        f"   - **Yayın Tarihi:** {article.publish_date.strftime('%Y-%m-%d')}\n"
+        f"   - **Özet:** {summary_text}\n"
+        f"   - **Link:** [Haber Linki]({article.url.strip()})"
+    )
+
+def join_cards(intro_text: str, cards: List[str]) -> str:
+    """Giriş cümlesini ve hazır haber kartlarını tek bir Markdown yanıtında birleştirir."""
+    if not cards:
+        return NO_RESULTS_RESPONSE
+    return f"{intro_text}\n\n" + "\n\n".join(cards)
 
 def format_articles_to_markdown(articles: List[Article], intro_text: str) -> str:
     """Verilen makale listesini ön yüz için Markdown formatına dönüştürür."""
-    if not articles:
-        return "Bu konuda veritabanımda bir bilgi bulamadım."
-
-    formatted_parts = []
-    for i, article in enumerate(articles, 1):
-        summary_text = article.summary.strip() if article.summary else "Bu haber için özet mevcut değil."
-        formatted_parts.append(
-            f"{i}. **{article.title.strip()}**\n"
-            f"   - **Kaynak:** {article.source.strip()}\n"
-            f"   - **Yayın Tarihi:** {article.publish_date.strftime('%Y-%m-%d')}\n"
-            f"   - **Özet:** {summary_text}\n"
-            f"   - **Link:** [Haber Linki]({article.url.strip()})"
-        )
-    
-    return f"{intro_text}\n\n" + "\n\n".join(formatted_parts)
+    return join_cards(intro_text, [format_article_card(i, article) for i, article in enumerate(articles, 1)])
 
-async def run_chat_logic(query: str, user_id: str):
-    llm = get_llm()
-    tools = [db_tools.get_recent_news, db_tools.search_news_by_topic]
+def _turn_messages(turn) -> list:
+    """Bir sohbet turunu planlayıcı için kısa bir kullanıcı/asistan mesaj çiftine çevirir."""
+    if turn.tool_name:
+        answer = f"{turn.response} (araç: {turn.tool_name}, argümanlar: {turn.tool_args})"
+    else:
+        # Eski kayıtlarda tam Markdown yanıt tutuluyordu; giriş cümlesi bağlam için yeterli
+        answer = (turn.response or "").split("\n", 1)[0]
+    return [HumanMessage(content=turn.query), AIMessage(content=answer)]
+
+async def load_planner_history(user_id: str) -> list:
+    """Kullanıcının son turlarını, en yeniden geriye doğru token bütçesi dolana kadar kronolojik sırayla döndürür."""
+    async with database.AsyncSessionLocal() as db:
+        turns = await chat_history_crud.aget_recent_turns(db, user_id=user_id, limit=CHAT_HISTORY_MAX_TURNS)
+    messages = []
+    used_tokens = 0
+    for turn in turns:
+        turn_messages = _turn_messages(turn)
+        tokens = sum(llm_client.count_tokens(message.content) for message in turn_messages)
+        if used_tokens + tokens > CHAT_HISTORY_TOKEN_BUDGET:
+            break
+        used_tokens += tokens
+        messages[:0] = turn_messages
+    return messages
+
+async def plan_query(query: str, user_id: str) -> Optional[Tuple[str, dict]]:
+    """
+    (araç adı, argümanlar) planını döndürür; plan yoksa None döner.
+    Önce yerel yönlendirici ve plan önbelleği denenir, yalnızca ikisi de
+    sonuç vermezse planlayıcı LLM çağrılır.
+    """
+    started = time.perf_counter()
+    plan, source = intent_router.route(query), "router"
+    if plan is None:
+        # LLM planı geçmişe bağlı olabileceği için önbellek anahtarı geçmişin özetini de içerir
+        chat_history = await load_planner_history(user_id)
+        context = history_digest(chat_history)
+        plan, source = intent_router.get_cached_plan(query, context), "cache"
+    if plan is not None:
+        metrics.PLANNER_SECONDS.observe(time.perf_counter() - started, source=source)
+        logger.info(f"Plan LLM'siz belirlendi: {plan[0]} {plan[1]}")
+        return plan
+
+    with metrics.span("chat.planner", metrics.PLANNER_SECONDS, source="llm"):
+        return await _plan_with_llm(query, chat_history, context)
+
+def history_digest(messages: list) -> str:
+    """Planlayıcıya verilen geçmişin kısa özeti (plan önbelleği anahtarı için); geçmiş yoksa boş."""
+    if not messages:
+        return ""
+    digest = hashlib.blake2b(digest_size=16)
+    for message in messages:
+        digest.update(f"{message.type}\x00{message.content}\x00".encode("utf-8"))
+    return digest.hexdigest()
+
+async def _plan_with_llm(query: str, chat_history: list, context: str) -> Optional[Tuple[str, dict]]:
+    llm = llm_client.get_llm(model="gpt-4o-mini", temperature=0)
+    tools = [db_tools.get_recent_news, db_tools.search_news_by_topic, db_tools.search_news_semantic]
     
-    # Adım 1: Ajanın sadece "plan" yapmasını sağla
+    # Ajanın sadece "plan" yapmasını sağla
     llm_with_tools = llm.bind_tools(tools)
     prompt = ChatPromptTemplate.from_messages([
         ("system", "Sen, kullanıcının isteğine göre doğru aracı ve parametreleri seçen bir yönlendiricisin."),
@@ -49,52 +114,170 @@ async def run_chat_logic(query: str, user_id: str):
     ])
     chain = prompt | llm_with_tools
 
-    db: Session = next(database.get_db())
-    try:
-        history = chat_history_crud.get_chat_history_by_user(db, user_id=user_id)
-        chat_history = [
-            AIMessage(content=rec.response) if i % 2 else HumanMessage(content=rec.query)
-            for i, rec in enumerate(reversed(history))
-        ]
-        
-        # Planı al
-        ai_msg_with_plan = await chain.ainvoke({"input": query, "chat_history": chat_history})
-        
-        tool_calls = ai_msg_with_plan.tool_calls
-        if not tool_calls:
-            # Eğer bir plan yoksa, genel bir cevap ver
-            return "Size nasıl yardımcı olabilirim? 'Son 3 gün' veya 'Yapay zeka' gibi konularla ilgili haberleri arayabilirim."
+    ai_msg_with_plan = await llm_client.ainvoke(
+        chain, {"input": query, "chat_history": chat_history}, lane=llm_client.CHAT_LANE
+    )
+    
+    tool_calls = ai_msg_with_plan.tool_calls
+    if not tool_calls:
+        return None
+    plan = (tool_calls[0]['name'], tool_calls[0]['args'])
+    intent_router.cache_plan(query, plan, context)
+    return plan
 
-        # Adım 2: Planı manuel olarak uygula
-        tool_name = tool_calls[0]['name']
-        tool_args = tool_calls[0]['args']
-        
-        response_text = ""
-        if tool_name == "get_recent_news":
-            days_ago = tool_args.get('days_ago', 7)
-            articles = await db_tools.get_recent_news.ainvoke(tool_args)
-            intro = f"Son {days_ago} gün içinde öne çıkan haberler şunlardır:"
-            response_text = format_articles_to_markdown(articles, intro)
-        
-        elif tool_name == "search_news_by_topic":
-            topic = tool_args.get('topic', '')
-            articles = await db_tools.search_news_by_topic.ainvoke(tool_args)
-            intro = f"'{topic.capitalize()}' konusu ile ilgili bulunan haberler şunlardır:"
-            response_text = format_articles_to_markdown(articles, intro)
-        else:
-            response_text = "Üzgünüm, isteğinizi anlayamadım."
+async def fetch_plan_articles(tool_name: str, tool_args: dict) -> Optional[Tuple[str, List[Article]]]:
+    """
+    Planı uygular: giriş cümlesini ve (özetleri henüz zenginleştirilmemiş) makaleleri döndürür.
+    Bilinmeyen bir araç için None döner.
+    """
+    if tool_name == "get_recent_news":
+        days_ago = tool_args.get('days_ago', 7)
+        articles = await db_tools.fetch_recent_news(days_ago)
+        intro = f"Son {days_ago} gün içinde öne çıkan haberler şunlardır:"
+    
+    elif tool_name == "search_news_by_topic":
+        topic = tool_args.get('topic', '')
+        articles = await db_tools.fetch_news_by_topic(topic)
+        intro = f"'{topic.capitalize()}' konusu ile ilgili bulunan haberler şunlardır:"
 
-        chat_history_crud.create_chat_history(db, history=schemas.ChatHistoryCreate(
+    elif tool_name == "search_news_semantic":
+        semantic_query = tool_args.get('query', '')
+        articles = await db_tools.fetch_news_semantic(semantic_query)
+        intro = f"'{semantic_query}' ile anlamca ilişkili bulunan haberler şunlardır:"
+    else:
+        return None
+    return intro, articles
+
+async def cache_plan_result(generation: Optional[int], plan: Tuple[str, dict], intro: str, articles: List[Article], cards: List[str]):
+    """Özetleri başarıyla üretilmiş sonuçları araç sonuç önbelleğine yazar."""
+    if any(article.summary == db_tools.SUMMARY_ERROR for article in articles):
+        # Geçici bir LLM hatası önbellekte kalıcı hale gelmesin
+        return
+    tool_name, tool_args = plan
+    await result_cache.store_result(generation, tool_name, tool_args, intro, [article.id for article in articles], cards)
+
+async def save_chat_history(user_id: str, query: str, response_text: str, plan: Optional[Tuple[str, dict]] = None, article_ids: Optional[List[int]] = None):
+    """
+    Sohbet turunu kaydeder. Araç kullanılan yanıtlarda Markdown kartlar yerine
+    giriş cümlesi, plan ve makale ID'leri saklanır.
+    """
+    tool_name, tool_args = plan if plan is not None else (None, None)
+    async with database.AsyncSessionLocal() as db:
+        await chat_history_crud.acreate_chat_history(db, history=schemas.ChatHistoryCreate(
             user_id=user_id,
             query=query,
-            response=response_text
+            response=response_text,
+            tool_name=tool_name,
+            tool_args=tool_args,
+            article_ids=article_ids,
         ))
+
+async def run_chat_logic(query: str, user_id: str):
+    with metrics.CHAT_IN_FLIGHT.track_inflight(mode="run"), metrics.span("chat.run_chat_logic"):
+        return await _run_chat_logic(query, user_id)
+
+async def _run_chat_logic(query: str, user_id: str):
+    try:
+        # Adım 1: Planı al
+        plan = await plan_query(query, user_id)
+        if plan is None:
+            # Eğer bir plan yoksa, genel bir cevap ver
+            return NO_PLAN_RESPONSE
+
+        # Adım 2: Planı uygula (aynı plan yakın zamanda çalıştıysa hazır kartları kullan)
+        generation, cached = await result_cache.get_result(*plan)
+        if cached is not None:
+            intro, article_ids, cards = cached["intro"], cached["article_ids"], cached["cards"]
+        else:
+            result = await fetch_plan_articles(*plan)
+            if result is None:
+                await save_chat_history(user_id, query, UNKNOWN_TOOL_RESPONSE)
+                return UNKNOWN_TOOL_RESPONSE
+            intro, articles = result
+            articles = await db_tools.enrich_articles_with_summaries(articles)
+            cards = [format_article_card(i, article) for i, article in enumerate(articles, 1)]
+            article_ids = [article.id for article in articles]
+            await cache_plan_result(generation, plan, intro, articles, cards)
+
+        response_text = join_cards(intro, cards)
+        await save_chat_history(user_id, query, intro if cards else NO_RESULTS_RESPONSE, plan, article_ids)
         
         return response_text
 
     except Exception as e:
         logger.error(f"Chat logic hatası (kullanıcı: {user_id}): {e}", exc_info=True)
-        return "Üzgünüm, isteğinizi işlerken bir hata oluştu. Lütfen daha sonra tekrar deneyin."
-    finally:
-        db.close()
+        return ERROR_RESPONSE
 
+async def _summarized_article(index: int, article: Article) -> Tuple[int, Article]:
+    article.summary = await db_tools.get_or_create_summary(article)
+    return index, article
+
+async def stream_chat_logic(query: str, user_id: str) -> AsyncIterator[Tuple[str, dict]]:
+    """
+    `run_chat_logic`'in akış (streaming) sürümü. (olay, veri) çiftleri üretir:
+
+    - `intro`: plan belli olur olmaz giriş cümlesi,
+    - `article`: her haber kartı, özeti hazır olduğu anda (sıra numarası `index` ile),
+    - `done`: tam Markdown yanıt.
+    """
+    # Üreteç farklı bir bağlamda kapatılabileceği için bağlam değişkenli `span` yerine doğrudan histogram
+    with metrics.CHAT_IN_FLIGHT.track_inflight(mode="stream"), metrics.SPAN_SECONDS.time(span="chat.stream_chat_logic"):
+        async for event in _stream_chat_logic(query, user_id):
+            yield event
+
+async def _stream_chat_logic(query: str, user_id: str) -> AsyncIterator[Tuple[str, dict]]:
+    try:
+        plan = await plan_query(query, user_id)
+        if plan is None:
+            yield "done", {"response": NO_PLAN_RESPONSE}
+            return
+
+        generation, cached = await result_cache.get_result(*plan)
+        if cached is not None:
+            intro, article_ids, cards = cached["intro"], cached["article_ids"], cached["cards"]
+            if cards:
+                yield "intro", {"text": intro, "total": len(cards)}
+                for index, card in enumerate(cards, 1):
+                    yield "article", {"index": index, "markdown": card}
+        else:
+            result = await fetch_plan_articles(*plan)
+            if result is None:
+                await save_chat_history(user_id, query, UNKNOWN_TOOL_RESPONSE)
+                yield "done", {"response": UNKNOWN_TOOL_RESPONSE}
+                return
+            intro, articles = result
+            cards = [None] * len(articles)
+            if articles:
+                yield "intro", {"text": intro, "total": len(articles)}
+                # Özeti hazır olan kartlar sırayla hemen, eksik olanlar üretildikçe gönderilir.
+                # İstemci bağlantıyı kapatırsa (generator kapanır) bitmemiş özet görevleri iptal edilir.
+                missing = {index for index, article in enumerate(articles, 1) if db_tools.needs_summary(article)}
+                pending = [
+                    asyncio.create_task(_summarized_article(index, article))
+                    for index, article in enumerate(articles, 1)
+                    if index in missing
+                ]
+                try:
+                    for index, article in enumerate(articles, 1):
+                        if index not in missing:
+                            cards[index - 1] = format_article_card(index, article)
+                            yield "article", {"index": index, "markdown": cards[index - 1]}
+                    for next_ready in asyncio.as_completed(pending):
+                        index, article = await next_ready
+                        cards[index - 1] = format_article_card(index, article)
+                        yield "article", {"index": index, "markdown": cards[index - 1]}
+                finally:
+                    unfinished = [task for task in pending if not task.done()]
+                    for task in unfinished:
+                        task.cancel()
+                    await asyncio.gather(*unfinished, return_exceptions=True)
+            article_ids = [article.id for article in articles]
+            await cache_plan_result(generation, plan, intro, articles, cards)
+
+        response_text = join_cards(intro, cards)
+        await save_chat_history(user_id, query, intro if cards else NO_RESULTS_RESPONSE, plan, article_ids)
+        yield "done", {"response": response_text}
+
+    except Exception as e:
+        logger.error(f"Chat stream hatası (kullanıcı: {user_id}): {e}", exc_info=True)
+        yield "error", {"response": ERROR_RESPONSE}
@@ -0,0 +1,256 @@
+"""
+Ingestion sırasında yinelenen makaleleri ayıklamak için yardımcılar.
+
+- `normalize_url`: izleme parametrelerini, parçaları ve sondaki eğik çizgiyi atarak
+  aynı makalenin farklı bağlantılarını tek bir biçime indirger.
+- `UrlBloomFilter`: bilinen URL'lerin bellek içi Bloom filtresi. Filtrede olmayan bir
+  URL kesinlikle yenidir ve veritabanına sorulmadan işlenebilir; filtrede olanlar
+  tek bir toplu sorguyla doğrulanır.
+- `simhash` / `FingerprintIndex`: ayıklanan metnin parmak izi ile farklı kaynaklardan
+  gelen aynı haberin kopyalarını LLM çağrısından önce yakalar.
+"""
+import asyncio
+import hashlib
+import logging
+import math
+import re
+import threading
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+import numpy as np
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from sqlalchemy.orm import Session
+from app.core.clock import utcnow
+from app.core.config import (
+    URL_BLOOM_FILTER_ENABLED,
+    URL_BLOOM_EXPECTED_ITEMS,
+    URL_BLOOM_FALSE_POSITIVE_RATE,
+    NEAR_DUPLICATE_MAX_DISTANCE,
+    NEAR_DUPLICATE_WINDOW_DAYS,
+)
+from app.crud import article_crud, fingerprint_crud
+
+logger = logging.getLogger(__name__)
+
+# Makale kimliğini etkilemeyen izleme/kampanya parametreleri
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "_ga", "_gl",
+    "ref", "ref_src", "referrer", "source", "cmpid", "ocid", "guccounter", "ito",
+    "taid", "soc_src", "soc_trk", "smid", "sr_share", "utm",
+}
+TRACKING_PREFIXES = ("utm_", "mkt_", "pk_", "hsa_")
+
+def normalize_url(url: str) -> str:
+    """URL'yi karşılaştırma ve saklama için kanonik biçime getirir."""
+    if not url:
+        return url
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme == "http" and netloc.endswith(":80")) or (scheme == "https" and netloc.endswith(":443")):
+        netloc = netloc.rsplit(":", 1)[0]
+
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query.sort()
+    return urlunsplit((scheme, netloc, path, urlencode(query, doseq=True), ""))
+
+class UrlBloomFilter:
+    """Çift hash'leme (Kirsch-Mitzenmacher) ile sabit boyutlu bir Bloom filtresi."""
+
+    def __init__(self, expected_items: int, false_positive_rate: float):
+        expected_items = max(1, expected_items)
+        self.size = max(8, int(-expected_items * math.log(false_positive_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / expected_items * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.last_article_id = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str):
+        with self._lock:
+            for position in self._positions(item):
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+_url_filter = UrlBloomFilter(URL_BLOOM_EXPECTED_ITEMS, URL_BLOOM_FALSE_POSITIVE_RATE) if URL_BLOOM_FILTER_ENABLED else None
+
+def refresh_url_filter(db: Session):
+    """Filtreye, son yüklemeden bu yana veritabanına eklenmiş URL'leri ekler."""
+    if _url_filter is None:
+        return
+    rows = article_crud.get_urls_after(db, after_article_id=_url_filter.last_article_id)
+    for article_id, url in rows:
+        _url_filter.add(normalize_url(url))
+        _url_filter.last_article_id = max(_url_filter.last_article_id, article_id)
+    if rows:
+        logger.info(f"URL Bloom filtresi güncellendi: {len(rows)} yeni URL (toplam {_url_filter.count}).")
+
+def remember_url(url: str):
+    """Yeni kaydedilen bir makalenin URL'sini filtreye ekler."""
+    if _url_filter is not None:
+        _url_filter.add(normalize_url(url))
+
+def filter_new_urls(db: Session, urls: Dict[str, str]) -> Set[str]:
+    """
+    `normalize edilmiş URL -> ham URL` sözlüğünden veritabanında henüz olmayan
+    normalize URL'leri döndürür. Bloom filtresinin kesin "yok" dediği URL'ler
+    sorgulanmaz; kalanlar tek bir toplu IN sorgusu ile doğrulanır. Normalizasyondan
+    önce kaydedilmiş satırlar için ham URL de kontrol edilir.
+    """
+    if _url_filter is None:
+        candidates = dict(urls)
+    else:
+        candidates = {normalized: raw for normalized, raw in urls.items() if normalized in _url_filter}
+    if not candidates:
+        return set(urls)
+
+    existing = article_crud.get_existing_urls(db, set(candidates) | set(candidates.values()))
+    return {
+        normalized for normalized, raw in urls.items()
+        if normalized not in existing and raw not in existing
+    }
+
+# --- İçerik parmak izi (SimHash) ile yakın kopya tespiti ---
+
+_SIMHASH_BITS = 64
+_SHINGLE_SIZE = 3
+
+def simhash(text: str) -> int:
+    """Metnin kelime 3'lülerinden (shingle) 64 bitlik SimHash parmak izi üretir."""
+    tokens = re.findall(r"\w+", text.replace("İ", "i").lower())
+    if len(tokens) >= _SHINGLE_SIZE:
+        shingles = (" ".join(tokens[i:i + _SHINGLE_SIZE]) for i in range(len(tokens) - _SHINGLE_SIZE + 1))
+    else:
+        shingles = tokens
+    values = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little") for s in shingles),
+        dtype=np.uint64,
+    )
+    if not len(values):
+        return 0
+    # Her bit için (+1 / -1) oy toplamı, shingle x bit matrisi üzerinden vektörel olarak
+    bits = (values[:, None] >> np.arange(_SIMHASH_BITS, dtype=np.uint64)) & np.uint64(1)
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(values)
+    return sum(1 << bit for bit in np.flatnonzero(votes > 0).tolist())
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+def to_signed64(value: int) -> int:
+    """64 bitlik işaretsiz değeri veritabanındaki BIGINT sütununa sığacak şekilde çevirir."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+def from_signed64(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+class FingerprintEntry:
+    """
+    İndeksteki bir makale. Aynı turda hâlâ işlenen makaleler için `analysis` özetin,
+    `saved` ise kaydedilen satır ID'sinin (kaydedilemezse None) future'ıdır.
+    """
+
+    def __init__(self, fingerprint: int, article_id: Optional[int] = None, created_at: Optional[datetime] = None):
+        self.fingerprint = fingerprint
+        self.article_id = article_id
+        self.created_at = created_at or utcnow()
+        self.analysis: Optional[asyncio.Future] = None
+        self.saved: Optional[asyncio.Future] = None
+
+class FingerprintIndex:
+    """
+    Son `NEAR_DUPLICATE_WINDOW_DAYS` günün parmak izleri için bant (band) indeksi.
+    64 bit, `max_distance + 1` banda bölünür; güvercin yuvası ilkesine göre en fazla
+    `max_distance` bit farklı iki parmak izi en az bir bantta birebir eşleşir, bu yüzden
+    yalnızca aynı bant değerini paylaşan adaylar karşılaştırılır.
+    """
+
+    def __init__(self, max_distance: int = NEAR_DUPLICATE_MAX_DISTANCE, window_days: int = NEAR_DUPLICATE_WINDOW_DAYS):
+        self.max_distance = max_distance
+        self.window = timedelta(days=window_days)
+        self.band_count = max_distance + 1
+        self.band_bits = _SIMHASH_BITS // self.band_count
+        self._bands: List[Dict[int, List[FingerprintEntry]]] = [defaultdict(list) for _ in range(self.band_count)]
+        self._entries: "deque[FingerprintEntry]" = deque()
+        self._article_ids: Set[int] = set()
+        self.last_article_id = 0
+
+    def _band_keys(self, fingerprint: int):
+        mask = (1 << self.band_bits) - 1
+        return [(fingerprint >> (i * self.band_bits)) & mask for i in range(self.band_count)]
+
+    def add(self, entry: FingerprintEntry):
+        if entry.article_id is not None:
+            self.last_article_id = max(self.last_article_id, entry.article_id)
+            # Bu süreçte kaydedilip indekse zaten eklenmiş makaleler veritabanından yeniden eklenmez
+            if entry.article_id in self._article_ids:
+                return
+            self._article_ids.add(entry.article_id)
+        for band, key in zip(self._bands, self._band_keys(entry.fingerprint)):
+            band[key].append(entry)
+        self._entries.append(entry)
+
+    def assign(self, entry: FingerprintEntry, article_id: int):
+        """Süreç içinde eklenen makalenin kaydedilen satır ID'sini işler."""
+        entry.article_id = article_id
+        self._article_ids.add(article_id)
+
+    def remove(self, entry: FingerprintEntry):
+        self._article_ids.discard(entry.article_id)
+        for band, key in zip(self._bands, self._band_keys(entry.fingerprint)):
+            bucket = band.get(key)
+            if bucket and entry in bucket:
+                bucket.remove(entry)
+                if not bucket:
+                    del band[key]
+
+    def prune(self):
+        """Pencere dışına düşen eski parmak izlerini atar."""
+        cutoff = utcnow() - self.window
+        while self._entries and self._entries[0].created_at < cutoff:
+            self.remove(self._entries.popleft())
+
+    def find(self, fingerprint: int) -> Optional[FingerprintEntry]:
+        """En yakın (mesafesi eşik içindeki) kayıtlı makaleyi döndürür."""
+        best, best_distance = None, self.max_distance + 1
+        for band, key in zip(self._bands, self._band_keys(fingerprint)):
+            for entry in band.get(key, ()):
+                distance = hamming_distance(fingerprint, entry.fingerprint)
+                if distance < best_distance:
+                    best, best_distance = entry, distance
+        return best
+
+    def __len__(self):
+        return len(self._entries)
+
+fingerprint_index = FingerprintIndex()
+
+def refresh_fingerprint_index(db: Session):
+    """İndekse, son yüklemeden bu yana kaydedilmiş ve pencere içindeki parmak izlerini ekler."""
+    fingerprint_index.prune()
+    rows = fingerprint_crud.get_fingerprints_after(
+        db, after_article_id=fingerprint_index.last_article_id, since=utcnow() - fingerprint_index.window
+    )
+    for article_id, value, duplicate_of_id, created_at in rows:
+        # Kopyalar yerine yalnızca özgün makaleleri eşleşme adayı olarak tut
+        if duplicate_of_id is None:
+            fingerprint_index.add(FingerprintEntry(from_signed64(value), article_id=article_id, created_at=created_at))
+        else:
+            fingerprint_index.last_article_id = max(fingerprint_index.last_article_id, article_id)
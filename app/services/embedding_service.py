@@ -0,0 +1,104 @@
+"""
+Anlamsal arama için metin gömme (embedding) arka uçları.
+
+Arka uç `EMBEDDING_BACKEND` ile seçilir; testlerde veya çevrimdışı ortamlarda
+`set_embedder` ile başka bir uygulama takılabilir. Tüm arka uçlar L2-normalize
+edilmiş float32 vektörler döndürür, böylece kosinüs benzerliği bir iç çarpıma
+indirgenir.
+"""
+import hashlib
+import logging
+import re
+from typing import List, Optional
+import numpy as np
+from app.core.config import OPENAI_API_KEY, EMBEDDING_BACKEND, EMBEDDING_MODEL
+from app.services import llm_client
+
+logger = logging.getLogger(__name__)
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+class HashingEmbedder:
+    """
+    Ağ erişimi gerektirmeyen, kelime ve karakter n-gram'larını sabit boyutlu
+    bir vektöre hash'leyen yerel embedder. Testler ve çevrimdışı kullanım içindir.
+    """
+
+    def __init__(self, dim: int = 384, char_ngram: int = 4):
+        self.dim = dim
+        self.char_ngram = char_ngram
+        self.name = f"hashing-{dim}-{char_ngram}"
+
+    def _features(self, text: str) -> List[str]:
+        tokens = re.findall(r"\w+", text.replace("İ", "i").lower())
+        features = list(tokens)
+        for token in tokens:
+            padded = f"#{token}#"
+            features.extend(padded[i:i + self.char_ngram] for i in range(max(1, len(padded) - self.char_ngram + 1)))
+        return features
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self._features(text):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            sign = 1.0 if value & 1 else -1.0
+            vector[(value >> 1) % self.dim] += sign
+        return vector
+
+    async def aembed(self, texts: List[str], lane: Optional[str] = None) -> np.ndarray:
+        return _normalize_rows(np.stack([self._embed_one(t) for t in texts]))
+
+class OpenAIEmbedder:
+    """
+    OpenAI embedding modeli ile vektör üretir. İstekler sohbet ve özet çağrılarıyla
+    aynı hız limitlerini paylaşır (`llm_client.acall`); `lane` verilmezse sohbet şeridi kullanılır.
+    """
+
+    def __init__(self, model: str = EMBEDDING_MODEL):
+        from langchain_openai import OpenAIEmbeddings
+
+        if not OPENAI_API_KEY:
+            raise ValueError("OPENAI_API_KEY ortam değişkeni ayarlanmadı.")
+        self._client = OpenAIEmbeddings(api_key=OPENAI_API_KEY, model=model)
+        self.name = f"openai-{model}"
+
+    async def aembed(self, texts: List[str], lane: Optional[str] = None) -> np.ndarray:
+        tokens = sum(llm_client.count_tokens(text) for text in texts)
+        vectors = await llm_client.acall(
+            lambda: self._client.aembed_documents(texts),
+            lane=lane or llm_client.CHAT_LANE,
+            estimated_tokens=tokens,
+        )
+        return _normalize_rows(np.asarray(vectors, dtype=np.float32))
+
+_embedder = None
+
+def get_embedder():
+    """Süreç genelinde paylaşılan embedder'ı döndürür."""
+    global _embedder
+    if _embedder is None:
+        if EMBEDDING_BACKEND == "openai":
+            _embedder = OpenAIEmbedder()
+        else:
+            _embedder = HashingEmbedder()
+        logger.info(f"Embedding arka ucu: {_embedder.name}")
+    return _embedder
+
+def set_embedder(embedder: Optional[object]):
+    """Embedder'ı değiştirir (ör. testlerde yerel bir embedder takmak için)."""
+    global _embedder
+    _embedder = embedder
+
+def article_embedding_text(title: str, summary: Optional[str], keywords: Optional[str]) -> str:
+    """Bir makalenin gömülecek kompakt metnini oluşturur (başlık, anahtar kelimeler, özet)."""
+    return "\n".join(part.strip() for part in (title, keywords, summary) if part)
+
+def to_blob(vector: np.ndarray) -> bytes:
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+def from_blob(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype="<f4")
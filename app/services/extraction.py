@@ -0,0 +1,56 @@
+"""
+HTML'den makale metni ayıklama (trafilatura) için süreç havuzu.
+
+trafilatura CPU-yoğun bir ayrıştırıcıdır; event loop üzerinde çalıştığında sohbet
+dahil tüm FastAPI işçisini durdurur. Ayıklama bu yüzden `EXTRACTION_WORKERS`
+süreçli bir `ProcessPoolExecutor`'da yapılır. HTML, çözülmemiş ham bayt olarak
+aktarılır (pickle maliyeti en düşük biçim) ve `EXTRACTION_MAX_HTML_BYTES`'ı aşan
+belgeler havuza gönderilmeden reddedilir.
+"""
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from app.core.config import EXTRACTION_WORKERS, EXTRACTION_MAX_HTML_BYTES
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+class DocumentTooLargeError(Exception):
+    pass
+
+def _extract_in_worker(html: bytes) -> Optional[str]:
+    # trafilatura yalnızca işçi süreçte yüklenir
+    from trafilatura import extract
+
+    return extract(html, include_comments=False, include_tables=False)
+
+def get_extraction_executor() -> Optional[ProcessPoolExecutor]:
+    global _executor
+    if _executor is None and EXTRACTION_WORKERS > 0:
+        # "spawn": event loop ve iş parçacıkları olan bir süreci fork'lamaktan kaçın
+        _executor = ProcessPoolExecutor(
+            max_workers=EXTRACTION_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info(f"Metin ayıklama süreç havuzu başlatıldı ({EXTRACTION_WORKERS} işçi).")
+    return _executor
+
+async def extract_text(html: bytes) -> Optional[str]:
+    """Ham HTML'den makale metnini event loop'u bloklamadan ayıklar."""
+    if len(html) > EXTRACTION_MAX_HTML_BYTES:
+        raise DocumentTooLargeError(f"HTML çok büyük ({len(html)} bayt > {EXTRACTION_MAX_HTML_BYTES})")
+    executor = get_extraction_executor()
+    with metrics.EXTRACTION_SECONDS.time():
+        if executor is None:
+            return await asyncio.to_thread(_extract_in_worker, html)
+        return await asyncio.get_running_loop().run_in_executor(executor, _extract_in_worker, html)
+
+def shutdown_extraction_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,155 @@
+"""
+Ingestion için asenkron HTTP istemcisi.
+
+Tek bir `aiohttp` oturumu, host başına keep-alive bağlantı havuzları tutar.
+`HTTP_MAX_IN_FLIGHT` toplam eş zamanlı isteği, `HTTP_PER_HOST_LIMIT` ise tek bir
+yayıncıya aynı anda açılan bağlantı sayısını sınırlar. Yanıt gövdesi parça parça
+okunur ve `HTTP_MAX_BODY_BYTES` aşıldığında indirme kesilir. Sıkıştırılmış aktarım
+(gzip/deflate, kuruluysa brotli) otomatik olarak açılır.
+
+Her istek alan adı devre kesicisinden (`source_health.domain_breaker`) geçer: art arda
+engelleyen veya yanıt vermeyen bir yayıncıya devre açıkken istek gönderilmez ve
+`CircuitOpenError` fırlatılır.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Tuple
+import aiohttp
+from app.core.config import HTTP_MAX_IN_FLIGHT, HTTP_PER_HOST_LIMIT, HTTP_TIMEOUT_SECONDS, HTTP_MAX_BODY_BYTES
+from app.services import metrics, source_health
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli  # noqa: F401  (aiohttp, kuruluysa "br" kodlamasını açar)
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip, deflate"
+
+# Makale indirmelerinde gönderilen varsayılan başlıklar; `HttpFetcher(headers=...)` ile değiştirilebilir
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': _ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+    'Referer': 'https://www.google.com/'
+}
+
+class FetchError(Exception):
+    """HTTP indirme hatası (4xx/5xx yanıtı veya boyut sınırı)."""
+
+    def __init__(self, url: str, message: str, status: Optional[int] = None):
+        super().__init__(f"{message} ({url})")
+        self.url = url
+        self.status = status
+
+class BodyTooLargeError(FetchError):
+    pass
+
+class CircuitOpenError(FetchError):
+    """Alan adının devre kesicisi açık; istek gönderilmedi."""
+
+    def __init__(self, url: str, domain: str, retry_in_seconds: float):
+        super().__init__(url, f"{domain} için devre açık, {retry_in_seconds:.0f} sn sonra yeniden denenecek")
+        self.domain = domain
+        self.retry_in_seconds = retry_in_seconds
+
+class HttpFetcher:
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        max_in_flight: int = HTTP_MAX_IN_FLIGHT,
+        per_host_limit: int = HTTP_PER_HOST_LIMIT,
+        timeout_seconds: float = HTTP_TIMEOUT_SECONDS,
+        max_body_bytes: int = HTTP_MAX_BODY_BYTES,
+        circuit_breaker: Optional[source_health.CircuitBreaker] = source_health.domain_breaker,
+    ):
+        self.headers = dict(DEFAULT_HEADERS if headers is None else headers)
+        self.circuit_breaker = circuit_breaker
+        self.max_in_flight = max_in_flight
+        self.per_host_limit = per_host_limit
+        self.timeout_seconds = timeout_seconds
+        self.max_body_bytes = max_body_bytes
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_in_flight,
+                limit_per_host=self.per_host_limit,
+                ttl_dns_cache=300,
+                keepalive_timeout=30,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout_seconds),
+                auto_decompress=True,
+            )
+        return self._session
+
+    async def fetch(self, url: str) -> Tuple[bytes, Optional[str]]:
+        """URL'nin gövdesini boyut sınırını aşmadan indirir; (gövde, karakter kodlaması) döndürür."""
+        breaker = self.circuit_breaker
+        domain = source_health.domain_of(url)
+        if breaker is not None and not breaker.allow(domain):
+            metrics.HTTP_FETCH_SECONDS.observe(0.0, outcome="circuit_open")
+            raise CircuitOpenError(url, domain, breaker.retry_in(domain))
+
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            with metrics.HTTP_IN_FLIGHT.track_inflight():
+                result = await self._fetch(url)
+            outcome = "ok"
+            if breaker is not None:
+                breaker.record_success(domain)
+            return result
+        except FetchError as e:
+            if breaker is not None:
+                if source_health.is_failure_status(e.status):
+                    breaker.record_failure(domain, str(e))
+                else:
+                    # 404 veya boyut sınırı gibi URL'ye özgü hatalarda sunucu yanıt veriyor demektir
+                    breaker.record_success(domain)
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if breaker is not None:
+                breaker.record_failure(domain, f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            metrics.HTTP_FETCH_SECONDS.observe(time.perf_counter() - started, outcome=outcome)
+
+    async def _fetch(self, url: str) -> Tuple[bytes, Optional[str]]:
+        async with self._get_session().get(url) as response:
+            if response.status >= 400:
+                raise FetchError(url, f"HTTP {response.status}", status=response.status)
+            if response.content_length is not None and response.content_length > self.max_body_bytes:
+                raise BodyTooLargeError(url, f"Yanıt çok büyük: {response.content_length} bayt", status=response.status)
+
+            chunks = []
+            received = 0
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                received += len(chunk)
+                if received > self.max_body_bytes:
+                    raise BodyTooLargeError(url, f"Yanıt {self.max_body_bytes} bayt sınırını aştı", status=response.status)
+                chunks.append(chunk)
+            return b"".join(chunks), response.charset
+
+    async def fetch_text(self, url: str) -> str:
+        """URL'yi indirir ve yanıtın karakter kodlamasıyla metne çevirir."""
+        body, charset = await self.fetch(url)
+        return body.decode(charset or "utf-8", errors="replace")
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
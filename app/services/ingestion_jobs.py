@@ -0,0 +1,144 @@
+"""
+Ingestion iş yöneticisi.
+
+Aynı anda gelen tetiklemeler (ör. zamanlayıcı ve elle yapılan bir istek) tek bir
+çalıştırmada birleştirilir: bir iş sürerken gelen tetikleme yeni bir iş başlatmaz,
+süren işin ID'sini döner. Son işlerin durumu ve ilerlemesi `get_job` ile okunur.
+İsteğe bağlı olarak `INGEST_SCHEDULE_MINUTES` aralığıyla uygulama içinde periyodik
+çalıştırma yapılır.
+
+Birleştirme süreç içidir; birden fazla uvicorn işçisi kullanılıyorsa zamanlayıcı
+yalnızca tek bir süreçte etkinleştirilmelidir.
+"""
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Tuple
+from app.core.clock import utcnow
+from app.core.config import INGEST_JOB_HISTORY_SIZE, INGEST_SCHEDULE_MINUTES
+from app.services.ingestion_progress import IngestionProgress
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+class IngestionJob:
+    def __init__(self, trigger: str):
+        self.id = uuid.uuid4().hex
+        self.trigger = trigger
+        self.status = QUEUED
+        self.progress = IngestionProgress()
+        self.created_at = utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.error: Optional[str] = None
+        # Bu işe birleştirilen (yeni iş başlatmayan) tetikleme sayısı
+        self.coalesced_triggers = 0
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def to_dict(self) -> dict:
+        duration = None
+        if self.started_at is not None:
+            duration = ((self.finished_at or utcnow()) - self.started_at).total_seconds()
+        return {
+            "job_id": self.id,
+            "trigger": self.trigger,
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration_seconds": round(duration, 3) if duration is not None else None,
+            "coalesced_triggers": self.coalesced_triggers,
+            "error": self.error,
+            **self.progress.to_dict(),
+        }
+
+class IngestionJobManager:
+    def __init__(self, history_size: int = INGEST_JOB_HISTORY_SIZE):
+        self.history_size = history_size
+        self._jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._current: Optional[IngestionJob] = None
+        self._schedule_task: Optional[asyncio.Task] = None
+
+    def trigger(self, trigger: str = "api") -> Tuple[IngestionJob, bool]:
+        """
+        Bir ingestion çalıştırması ister. Süren bir iş varsa onu ve False, yoksa
+        yeni başlatılan işi ve True döndürür.
+        """
+        if self._current is not None and not self._current.done:
+            self._current.coalesced_triggers += 1
+            logger.info(f"Ingestion zaten sürüyor, tetikleme birleştirildi ({trigger}): {self._current.id}")
+            return self._current, False
+
+        job = IngestionJob(trigger)
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.history_size:
+            self._jobs.popitem(last=False)
+        self._current = job
+        job.task = asyncio.create_task(self._run(job))
+        return job, True
+
+    async def _run(self, job: IngestionJob):
+        # Ağır modüller yalnızca ilk çalıştırmada yüklenir
+        from app.services import ingestion_service
+
+        job.status = RUNNING
+        job.started_at = utcnow()
+        logger.info(f"Ingestion işi başladı: {job.id} ({job.trigger})")
+        try:
+            await ingestion_service.ingest_news(progress=job.progress)
+            job.status = SUCCEEDED
+        except asyncio.CancelledError:
+            job.status = FAILED
+            job.error = "cancelled"
+            raise
+        except Exception as e:
+            job.status = FAILED
+            job.error = str(e)
+            logger.error(f"Ingestion işi başarısız oldu ({job.id}): {e}", exc_info=True)
+        finally:
+            job.finished_at = utcnow()
+            job.progress.stage = None
+            logger.info(f"Ingestion işi bitti: {job.id} ({job.status})")
+
+    def get_job(self, job_id: str) -> Optional[IngestionJob]:
+        return self._jobs.get(job_id)
+
+    @property
+    def current_job(self) -> Optional[IngestionJob]:
+        return self._current
+
+    def start_schedule(self, interval_minutes: float = INGEST_SCHEDULE_MINUTES):
+        """Her `interval_minutes` dakikada bir ingestion tetikler; 0 veya negatifse bir şey yapmaz."""
+        if interval_minutes <= 0 or self._schedule_task is not None:
+            return
+        logger.info(f"Periyodik ingestion etkin: her {interval_minutes} dakikada bir.")
+        self._schedule_task = asyncio.create_task(self._schedule_loop(interval_minutes * 60))
+
+    async def _schedule_loop(self, interval_seconds: float):
+        while True:
+            self.trigger("schedule")
+            await asyncio.sleep(interval_seconds)
+
+    async def stop(self):
+        """Zamanlayıcıyı durdurur ve süren işi iptal eder (uygulama kapanışında)."""
+        if self._schedule_task is not None:
+            self._schedule_task.cancel()
+            self._schedule_task = None
+        if self._current is not None and self._current.task is not None and not self._current.done:
+            self._current.task.cancel()
+            try:
+                await self._current.task
+            except asyncio.CancelledError:
+                pass
+
+job_manager = IngestionJobManager()
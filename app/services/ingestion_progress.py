@@ -0,0 +1,64 @@
+"""
+Tek bir ingestion çalıştırmasının aşama bazlı ilerleme sayaçları ve süreleri.
+
+`ingest_news` ve `process_and_save_article` bir `IngestionProgress` nesnesini
+günceller; iş yöneticisi bu nesneyi durum uç noktasında olduğu gibi sunar.
+"""
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Optional
+from app.core.clock import utcnow
+
+class IngestionProgress:
+    """
+    `stage_seconds` aşamaların duvar saati süreleridir (beslemeler, ayıklama, işleme);
+    `work_seconds` makale başına adımların (indirme, metin ayıklama, özetleme, embedding,
+    kaydetme) eş zamanlı görevler üzerinden toplanmış süreleridir.
+    """
+
+    COUNTERS = (
+        "feeds_total", "feeds_polled", "feeds_not_modified", "feeds_failed", "feeds_skipped", "feeds_circuit_open",
+        "candidates", "new_articles", "queued",
+        "pages_fetched", "extracted", "summarized", "duplicates_reused", "saved",
+        "skipped", "failed", "circuit_open", "embeddings_backfilled",
+    )
+
+    def __init__(self):
+        self.counters = {name: 0 for name in self.COUNTERS}
+        self.stage_seconds = defaultdict(float)
+        self.work_seconds = defaultdict(float)
+        self.stage: Optional[str] = None
+        self.updated_at = utcnow()
+
+    def incr(self, counter: str, amount: int = 1):
+        self.counters[counter] += amount
+        self.updated_at = utcnow()
+
+    @contextmanager
+    def stage_timer(self, stage: str):
+        """Aşamayı etkin aşama olarak işaretler ve duvar saati süresini kaydeder."""
+        self.stage = stage
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_seconds[stage] += time.perf_counter() - started
+            self.updated_at = utcnow()
+
+    @contextmanager
+    def work_timer(self, step: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.work_seconds[step] += time.perf_counter() - started
+
+    def to_dict(self) -> dict:
+        return {
+            "stage": self.stage,
+            "counters": dict(self.counters),
+            "stage_seconds": {name: round(seconds, 3) for name, seconds in self.stage_seconds.items()},
+            "work_seconds": {name: round(seconds, 3) for name, seconds in self.work_seconds.items()},
+            "updated_at": self.updated_at.isoformat(),
+        }
@@ -1,73 +1,87 @@
 import asyncio
 import logging
+import time
 from datetime import datetime
+from typing import List
 from sqlalchemy.orm import Session
+import aiohttp
 import feedparser
-import requests
-from trafilatura import extract
 
 
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_openai import ChatOpenAI
-from app.core.config import OPENAI_API_KEY
-from app.crud import article_crud
+from langchain.pydantic_v1 import BaseModel, Field
+from app.core.clock import utcnow
+from app.core.config import (
+    ARTICLE_TOKEN_BUDGET,
+    ARTICLE_MAP_REDUCE_THRESHOLD,
+    ARTICLE_MAX_CHUNKS,
+    EMBEDDING_BACKFILL_LIMIT,
+    EMBEDDING_BACKFILL_BATCH_SIZE,
+    INGESTION_USE_WORK_QUEUE,
+    NEWS_SOURCES,
+)
+from app.crud import article_crud, embedding_crud, feed_state_crud, work_queue_crud
 from app.database import schemas, database
+from app.services import dedup_service, embedding_service, extraction, llm_client, metrics, result_cache, source_health
+from app.services.article_writer import ArticleWriter
+from app.services.http_fetcher import CircuitOpenError, FetchError, HttpFetcher
+from app.services.ingestion_progress import IngestionProgress
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-# Asenkron uyumluluk için
-import nest_asyncio
-nest_asyncio.apply()
-
-NEWS_SOURCES = {
-    # Core AI Labs
-    "OpenAI Blog": "https://openai.com/blog/rss.xml",
-    "Google AI Blog": "https://ai.googleblog.com/feeds/posts/default?alt=rss",
-    "Anthropic News": "https://www.anthropic.com/news/rss.xml",
-    "Hugging Face Blog": "https://huggingface.co/blog/feed.xml",
-    "Perplexity Blog": "https://blog.perplexity.ai/rss.xml",
-
-    # Major Tech & AI News Outlets
-    "TechCrunch AI": "https://techcrunch.com/category/artificial-intelligence/feed/",
-    "The Verge AI": "https://www.theverge.com/rss/ai-artificial-intelligence/index.xml",
-    "Wired AI": "https://www.wired.com/feed/tag/artificial-intelligence/latest/rss",
-    "VentureBeat AI": "https://venturebeat.com/category/ai/feed/",
-    "Ars Technica AI": "https://arstechnica.com/tag/ai/feed/",
-}
-
-def get_llm():
-    """LLM modelini başlatır."""
-    if not OPENAI_API_KEY:
-        raise ValueError("OPENAI_API_KEY ortam değişkeni ayarlanmadı.")
-    return ChatOpenAI(api_key=OPENAI_API_KEY, model="gpt-3.5-turbo", temperature=0.3)
+class EmptyAnalysisError(Exception):
+    """LLM geçerli bir özet üretmedi; `raise_errors` ile çağrıldığında iş yeniden denenebilsin diye fırlatılır."""
 
-async def process_content_with_llm(content: str):
-    """Verilen metni kullanarak özet ve anahtar kelimeler üretir."""
-    llm = get_llm()
+class ArticleAnalysis(BaseModel):
+    summary: str = Field(description="Makalenin yaklaşık 50-75 kelimelik, tamamen Türkçe özeti.")
+    keywords: List[str] = Field(description="Makaleyle en ilgili 5 Türkçe anahtar kelime (örneğin: yapay zeka, makine öğrenmesi, dil modelleri).")
 
-    # Özetleme prompt'u
-    summary_prompt = ChatPromptTemplate.from_template(
-        "Aşağıdaki makale metnini analiz et ve yaklaşık 50-75 kelimelik kısa ve öz bir özetini **tamamen Türkçe** olarak yaz. "
-        "Eğer metin çok kısaysa veya anlamsızsa, yine de elinden geldiğince bir cümlelik bir özet çıkarmaya çalış."
-        "\n\n--- MAKAELİ METNİ ---\n{text}"
-    )
-    summary_chain = summary_prompt | llm | StrOutputParser()
+ANALYSIS_MODEL = "gpt-3.5-turbo"
 
-    # Anahtar kelime prompt'u
-    keywords_prompt = ChatPromptTemplate.from_template(
-        "Aşağıdaki makale metnine dayanarak, en ilgili 5 anahtar kelimeyi virgülle "
-        "ayırarak Türkçe olarak listele (örneğin: yapay zeka, makine öğrenmesi, dil modelleri):\n\n{text}"
+async def _summarize_chunks(chunks: List[str]) -> str:
+    """Map adımı: uzun bir makalenin parçalarını ayrı ayrı kısa notlara indirger."""
+    llm = llm_client.get_llm(model=ANALYSIS_MODEL, temperature=0.3)
+    chunk_prompt = ChatPromptTemplate.from_template(
+        "Aşağıda uzun bir makalenin bir bölümü var. Bu bölümdeki önemli bilgileri 3-5 maddede, Türkçe ve kısaca yaz."
+        "\n\n--- BÖLÜM ---\n{text}"
     )
-    keywords_chain = keywords_prompt | llm | StrOutputParser()
+    chain = chunk_prompt | llm | StrOutputParser()
+    notes = await asyncio.gather(*(
+        llm_client.ainvoke(chain, {"text": chunk}, lane=llm_client.INGESTION_LANE)
+        for chunk in chunks
+    ))
+    return "\n\n".join(note.strip() for note in notes)
 
-    # Eş zamanlı çalıştırma
-    summary_task = summary_chain.ainvoke({"text": content})
-    keywords_task = keywords_chain.ainvoke({"text": content})
+async def process_content_with_llm(content: str):
+    """
+    Verilen metni kullanarak özet ve anahtar kelimeleri tek bir yapılandırılmış
+    LLM çağrısıyla üretir. Metin önce token bütçesine göre kısaltılır; eşiği aşan
+    uzun makaleler parçalara bölünüp map-reduce ile özetlenir.
+    """
+    llm = llm_client.get_llm(model=ANALYSIS_MODEL, temperature=0.3)
+
+    token_count = llm_client.count_tokens(content)
+    if token_count > ARTICLE_MAP_REDUCE_THRESHOLD:
+        chunks = llm_client.split_by_tokens(content, ARTICLE_TOKEN_BUDGET)[:ARTICLE_MAX_CHUNKS]
+        logger.debug("   Uzun makale (%d token), %d parça ile map-reduce uygulanıyor.", token_count, len(chunks))
+        text = await _summarize_chunks(chunks)
+    elif token_count > ARTICLE_TOKEN_BUDGET:
+        text = llm_client.truncate_to_tokens(content, ARTICLE_TOKEN_BUDGET)
+    else:
+        text = content
+
+    prompt = ChatPromptTemplate.from_template(
+        "Aşağıdaki makale metnini analiz et. Yaklaşık 50-75 kelimelik kısa ve öz bir özetini **tamamen Türkçe** olarak yaz "
+        "ve metne dayanarak en ilgili 5 anahtar kelimeyi Türkçe olarak listele. "
+        "Eğer metin çok kısaysa veya anlamsızsa, yine de elinden geldiğince bir cümlelik bir özet çıkarmaya çalış."
+        "\n\n--- MAKALE METNİ ---\n{text}"
+    )
+    chain = prompt | llm.with_structured_output(ArticleAnalysis)
+    analysis = await llm_client.ainvoke(chain, {"text": text}, lane=llm_client.INGESTION_LANE)
 
-    summary, keywords = await asyncio.gather(summary_task, keywords_task)
-    return summary.strip(), keywords.strip()
+    keywords = ", ".join(keyword.strip() for keyword in analysis.keywords if keyword.strip())
+    return analysis.summary.strip(), keywords
 
 async def scrape_and_process_article(url: str, source: str, db: Session):
     """Tek bir makaleyi indirir, işler ve veritabanına kaydeder."""
@@ -102,89 +116,347 @@ async def scrape_and_process_article(url: str, source: str, db: Session):
         return None
 
 
-async def ingest_news():
-    """Haber kaynaklarından makaleleri toplar ve işler."""
-    logger.info("Haber toplama işlemi başladı.")
-    
-    articles_to_process = []
-    # with context manager'ı kullanarak db oturumunu yönetelim.
+# RSS istekleri için kullanıcı ajanı (koşullu GET başlıklarıyla birlikte gönderilir)
+FEED_USER_AGENT = "NovaAI/1.0 (+https://novaai-vwml.onrender.com)"
+
+async def poll_feed(source: str, rss_url: str, etag: str = None, modified: str = None) -> dict:
+    """
+    Bir RSS beslemesini event loop dışında, ETag/Last-Modified ile koşullu olarak çeker.
+    Besleme değişmemişse (304) `entries` boş döner.
+    """
+    started = time.perf_counter()
+    result = {"source": source, "url": rss_url, "entries": [], "status": None, "etag": etag, "modified": modified, "error": None}
     try:
-        db = next(database.get_db())
-        for source, rss_url in NEWS_SOURCES.items():
-            logger.info(f"Kaynak işleniyor: {source} ({rss_url})")
-            try:
-                feed = feedparser.parse(rss_url)
-                # Sadece en son 30 makaleyi alarak süreci hızlandır.
-                for entry in feed.entries[:30]:
-                    if not article_crud.get_article_by_url(db, url=entry.link):
-                        articles_to_process.append({
-                            "url": entry.link,
-                            "title": entry.title,
-                            "source": source,
-                            "publish_date": datetime(*entry.published_parsed[:6]) if hasattr(entry, 'published_parsed') else datetime.now()
-                        })
-                logger.info(f"Kaynak tamamlandı: {source}. İşlenecek {len(articles_to_process)} yeni makale bulundu.")
-            except Exception as e:
-                logger.error(f"RSS beslemesi okunurken hata ({rss_url}): {e}")
+        feed = await asyncio.to_thread(
+            feedparser.parse, rss_url, etag=etag, modified=modified, agent=FEED_USER_AGENT
+        )
+        result["status"] = feed.get("status")
+        if result["status"] == 304:
+            logger.info(f"Kaynak değişmemiş (304), atlanıyor: {source}")
+        elif (result["status"] is None and not feed.entries) or (result["status"] or 0) >= 400:
+            # feedparser ağ hatalarını fırlatmaz; durum kodu olmadan `bozo_exception` ile döner
+            result["error"] = f"HTTP {result['status']}" if result["status"] else str(feed.get("bozo_exception"))
+            logger.error(f"RSS beslemesi okunamadı ({rss_url}): {result['error']}")
+        else:
+            result["entries"] = feed.entries
+            result["etag"] = feed.get("etag")
+            result["modified"] = feed.get("modified")
+    except Exception as e:
+        result["error"] = str(e)
+        logger.error(f"RSS beslemesi okunurken hata ({rss_url}): {e}")
+    result["elapsed"] = time.perf_counter() - started
+    return result
 
-    finally:
-        db.close()
+def _published_dates(entries) -> List[datetime]:
+    return [datetime(*entry.published_parsed[:6]) for entry in entries if entry.get("published_parsed")]
+
+def _load_feed_states():
+    with next(database.get_db()) as db:
+        return feed_state_crud.get_feed_states(db)
+
+def _record_polls_and_find_new(poll_results: List[dict], states: dict, now: datetime):
+    """Yoklama sonuçlarını kaynak durumlarına yazar; (aday makaleler, yeni URL'ler) döndürür."""
+    candidates = {}
+    with next(database.get_db()) as db:
+        for result in poll_results:
+            state = states.get(result["source"])
+            if state is not None and state.url != result["url"]:
+                state = None
+            fields = source_health.next_feed_state(
+                state, result["status"], result["error"], _published_dates(result["entries"]), now
+            )
+            if result["error"] is None:
+                fields.update(etag=result["etag"], last_modified=result["modified"])
+            feed_state_crud.upsert_feed_state(db, source=result["source"], url=result["url"], commit=False, **fields)
+            metrics.FEED_CONSECUTIVE_FAILURES.set(fields["consecutive_failures"], source=result["source"])
+            # Sadece en son 30 makaleyi alarak süreci hızlandır.
+            for entry in result["entries"][:30]:
+                url = dedup_service.normalize_url(entry.link)
+                # Aynı makale birden fazla beslemede varsa ilk görüleni al
+                if url not in candidates:
+                    candidates[url] = {
+                        "raw_url": entry.link,
+                        "url": url,
+                        "title": entry.title,
+                        "source": result["source"],
+                        "publish_date": datetime(*entry.published_parsed[:6]) if hasattr(entry, 'published_parsed') else utcnow()
+                    }
+        db.commit()
+
+        # Bilinen URL'leri tek seferde ayıkla (Bloom filtresi + toplu IN sorgusu)
+        dedup_service.refresh_url_filter(db)
+        dedup_service.refresh_fingerprint_index(db)
+        new_urls = dedup_service.filter_new_urls(db, {url: data["raw_url"] for url, data in candidates.items()})
+
+    return candidates, new_urls
+
+async def collect_new_articles(progress: IngestionProgress) -> List[dict]:
+    """Beslemeleri çeker ve veritabanında henüz bulunmayan makalelerin verilerini döndürür."""
+    now = utcnow()
+    states = await asyncio.to_thread(_load_feed_states)
+
+    # Zamanı gelen beslemeleri eş zamanlı çek; kaynak URL'si değiştiyse önbellek başlıklarını kullanma.
+    # Yoklama aralığı dolmamış, devresi açık veya alan adı devre kesicisi açık kaynaklar bu turda atlanır.
+    progress.incr("feeds_total", len(NEWS_SOURCES))
+    poll_tasks = []
+    for source, rss_url in NEWS_SOURCES.items():
+        state = states.get(source)
+        if not source_health.is_due(state, rss_url, now):
+            outcome = "circuit_open" if source_health.circuit_open(state) else "skipped"
+            progress.incr("feeds_circuit_open" if outcome == "circuit_open" else "feeds_skipped")
+            metrics.FEED_POLLS.inc(source=source, outcome=outcome)
+            continue
+        if source_health.domain_breaker.is_open(source_health.domain_of(rss_url)):
+            progress.incr("feeds_circuit_open")
+            metrics.FEED_POLLS.inc(source=source, outcome="circuit_open")
+            continue
+        if state is not None and state.url == rss_url:
+            poll_tasks.append(poll_feed(source, rss_url, etag=state.etag, modified=state.last_modified))
+        else:
+            poll_tasks.append(poll_feed(source, rss_url))
+    with progress.stage_timer("poll"):
+        poll_results = await asyncio.gather(*poll_tasks)
+    for result in poll_results:
+        if result["error"] is not None:
+            progress.incr("feeds_failed")
+            metrics.FEED_POLLS.inc(source=result["source"], outcome="error")
+        else:
+            progress.incr("feeds_polled")
+            if result["status"] == 304:
+                progress.incr("feeds_not_modified")
+            metrics.FEED_POLLS.inc(source=result["source"], outcome="not_modified" if result["status"] == 304 else "ok")
+
+    for result in sorted(poll_results, key=lambda r: r["elapsed"], reverse=True):
+        logger.info(
+            f"Besleme süresi: {result['source']} {result['elapsed'] * 1000:.0f} ms "
+            f"(durum: {result['status']}, {len(result['entries'])} girdi)"
+        )
+
+    # Senkron oturumla çalışan kayıt ve URL ayıklama (ilk turda Bloom filtresinin tüm tabloyu
+    # taraması dahil) event loop'u bloklamasın diye ayrı bir iş parçacığında yapılır
+    with progress.stage_timer("dedup"):
+        candidates, new_urls = await asyncio.to_thread(_record_polls_and_find_new, poll_results, states, now)
+
+    articles_to_process = []
+    for url, data in candidates.items():
+        if url in new_urls:
+            data.pop("raw_url")
+            articles_to_process.append(data)
+    progress.incr("candidates", len(candidates))
+    progress.incr("new_articles", len(articles_to_process))
+    logger.info(f"Beslemeler tamamlandı. İşlenecek {len(articles_to_process)} yeni makale bulundu.")
+    return articles_to_process
+
+async def ingest_news(progress: IngestionProgress = None):
+    """
+    Haber kaynaklarından makaleleri toplar ve işler.
+    `progress` verilirse aşama sayaçları ve süreleri bu nesneye yazılır.
+    `INGESTION_USE_WORK_QUEUE` açıksa makaleler burada işlenmez, ayrı işçiler
+    (`ingest_worker.py`) için veritabanı kuyruğuna yazılır.
+    """
+    progress = progress or IngestionProgress()
+    logger.info("Haber toplama işlemi başladı.")
+
+    articles_to_process = await collect_new_articles(progress)
+
+    if articles_to_process and INGESTION_USE_WORK_QUEUE:
+        with next(database.get_db()) as db:
+            queued = work_queue_crud.enqueue_work_items(db, articles_to_process)
+        progress.incr("queued", queued)
+        logger.info(f"{queued} makale işçiler için kuyruğa eklendi.")
 
     # Toplu olarak asenkron görevleri çalıştır
-    if articles_to_process:
+    elif articles_to_process:
         logger.info(f"Toplam {len(articles_to_process)} makale için içerik indirme ve işleme başlatılıyor...")
-        tasks = [process_and_save_article(article_data) for article_data in articles_to_process]
-        await asyncio.gather(*tasks)
+        with progress.stage_timer("process"):
+            async with ArticleWriter() as writer, HttpFetcher() as fetcher:
+                tasks = [
+                    process_and_save_article(article_data, writer=writer, fetcher=fetcher, progress=progress)
+                    for article_data in articles_to_process
+                ]
+                results = await asyncio.gather(*tasks)
+        saved = sum(1 for article_id in results if article_id is not None)
+        logger.info(f"{saved}/{len(articles_to_process)} makale kaydedildi.")
+        if saved:
+            # Önbellekteki sohbet sonuçları yeni makaleleri içermiyor; hepsini geçersiz kıl
+            await result_cache.bump_generation()
+
+    with progress.stage_timer("backfill"):
+        backfilled = await backfill_embeddings()
+    progress.incr("embeddings_backfilled", backfilled)
 
     logger.info("Haber toplama işlemi tamamlandı.")
 
-async def process_and_save_article(article_data: dict):
-    """Bir makaleyi indirir, işler ve veritabanına kaydeder."""
+def _load_unembedded(model: str, after_article_id: int, limit: int):
+    with next(database.get_db()) as db:
+        return embedding_crud.get_articles_without_embedding(db, model=model, after_article_id=after_article_id, limit=limit)
+
+def _save_embeddings(model: str, article_ids: List[int], vectors):
+    with next(database.get_db()) as db:
+        for article_id, vector in zip(article_ids, vectors):
+            embedding_crud.save_article_embedding(
+                db, article_id=article_id, model=model, dim=len(vector), vector=embedding_service.to_blob(vector), commit=False
+            )
+        db.commit()
+
+async def backfill_embeddings(limit: int = EMBEDDING_BACKFILL_LIMIT, batch_size: int = EMBEDDING_BACKFILL_BATCH_SIZE) -> int:
+    """
+    Embedding'i olmayan özgün makaleler (kayıt sırasında embedding üretilemeyenler, embedder
+    değiştiyse eski makaleler) için vektör üretir. Tur başına en fazla `limit` makale işlenir;
+    üretilen vektör sayısını döndürür.
+    """
+    embedder = embedding_service.get_embedder()
+    done, after = 0, 0
+    while done < limit:
+        rows = await asyncio.to_thread(_load_unembedded, embedder.name, after, min(batch_size, limit - done))
+        if not rows:
+            break
+        after = rows[-1].id
+        texts = [embedding_service.article_embedding_text(row.title, row.summary, row.keywords) for row in rows]
+        try:
+            vectors = await embedder.aembed(texts, lane=llm_client.INGESTION_LANE)
+        except Exception as e:
+            logger.warning(f"Eksik embedding'ler üretilemedi (makale {rows[0].id}-{after}): {e}")
+            break
+        await asyncio.to_thread(_save_embeddings, embedder.name, [row.id for row in rows], vectors)
+        done += len(rows)
+    if done:
+        logger.info(f"{done} makalenin eksik embedding'i üretildi.")
+    return done
+
+def _load_analysis(article_id: int):
+    with next(database.get_db()) as db:
+        article = article_crud.get_article(db, article_id)
+        if article is None or not article.summary:
+            return None
+        return article.summary, article.keywords
+
+async def _reuse_analysis(entry: dedup_service.FingerprintEntry):
+    """Yakın kopyası bulunan makalenin özet ve anahtar kelimelerini döndürür; alınamazsa None."""
+    if entry.analysis is not None:
+        # Özgün makale aynı turda hâlâ işleniyor olabilir; onun LLM sonucunu bekle
+        return await asyncio.shield(entry.analysis)
+    if entry.article_id is None:
+        return None
+    return await asyncio.to_thread(_load_analysis, entry.article_id)
+
+async def _original_article_id(entry: dedup_service.FingerprintEntry):
+    """Özgün makalenin satır ID'sini döndürür; aynı turda işleniyorsa kaydedilmesini bekler."""
+    if entry.article_id is None and entry.saved is not None:
+        return await asyncio.shield(entry.saved)
+    return entry.article_id
+
+def _track_original(fingerprint: int) -> dedup_service.FingerprintEntry:
+    """Makaleyi, aynı turdaki kopyaların özetini ve satır ID'sini bekleyebileceği özgün olarak indekse ekler."""
+    loop = asyncio.get_running_loop()
+    entry = dedup_service.FingerprintEntry(fingerprint)
+    entry.analysis = loop.create_future()
+    entry.saved = loop.create_future()
+    dedup_service.fingerprint_index.add(entry)
+    return entry
+
+async def process_and_save_article(
+    article_data: dict,
+    writer: ArticleWriter = None,
+    fetcher: HttpFetcher = None,
+    progress: IngestionProgress = None,
+    raise_errors: bool = False,
+):
+    """
+    Bir makaleyi indirir, işler ve veritabanına kaydeder.
+    Kaydedilen makalenin ID'sini döndürür; atlanan veya başarısız olan makaleler için None.
+    `raise_errors` verilirse indirme hataları, boş LLM analizi (`EmptyAnalysisError`) ve beklenmeyen
+    hatalar (yeniden denenebilmeleri için) yukarı fırlatılır.
+    """
+    with metrics.INGESTION_IN_FLIGHT.track_inflight(), metrics.span("ingestion.process_and_save_article", log_slow=False):
+        return await _process_and_save_article(article_data, writer, fetcher, progress or IngestionProgress(), raise_errors)
+
+async def _process_and_save_article(
+    article_data: dict,
+    writer: ArticleWriter,
+    fetcher: HttpFetcher,
+    progress: IngestionProgress,
+    raise_errors: bool,
+):
     url = article_data["url"]
     logger.info(f"-> Başlatıldı: {url}")
+    own_entry = None
 
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Connection': 'keep-alive',
-        'Referer': 'https://www.google.com/'
-    }
-
-    loop = asyncio.get_event_loop()
     try:
-        # Adım 1: İçerik indirme (requests senkron olduğu için asenkron loop'ta çalıştır)
-        logger.debug(f"   [1/4] İçerik indiriliyor: {url}")
-        response = await loop.run_in_executor(
-            None, 
-            lambda: requests.get(url, headers=headers, timeout=15)
-        )
-        response.raise_for_status()  # 4xx veya 5xx hatası varsa exception fırlat
-        html_content = response.text
+        # Adım 1: İçerik indirme (host başına havuzlanmış asenkron HTTP istemcisi)
+        logger.debug("   [1/4] İçerik indiriliyor: %s", url)
+        with progress.work_timer("fetch"):
+            if fetcher is None:
+                async with HttpFetcher() as single_fetcher:
+                    html_content, _ = await single_fetcher.fetch(url)
+            else:
+                html_content, _ = await fetcher.fetch(url)
+        progress.incr("pages_fetched")
 
-        # Adım 2: Metin ayıklama
-        logger.debug(f"   [2/4] Metin ayıklanıyor: {url}")
-        content = extract(html_content, include_comments=False, include_tables=False)
+        # Adım 2: Metin ayıklama (süreç havuzunda)
+        logger.debug("   [2/4] Metin ayıklanıyor: %s", url)
+        try:
+            with progress.work_timer("extract"):
+                content = await extraction.extract_text(html_content)
+        except extraction.DocumentTooLargeError as e:
+            logger.info(f"<- {e}, atlanıyor: {url}")
+            progress.incr("skipped")
+            return
         if not content:
             logger.info(f"<- İçerik bulunamadı, atlanıyor: {url}")
+            progress.incr("skipped")
             return
+        progress.incr("extracted")
         
-        # Adım 3: LLM ile işleme
-        logger.debug(f"   [3/4] LLM ile işleniyor: {url}")
-        summary, keywords = await process_content_with_llm(content)
+        # Yakın kopya kontrolü: aynı haber başka bir kaynaktan zaten özetlendiyse LLM'i atla
+        fingerprint = dedup_service.simhash(content)
+        match = dedup_service.fingerprint_index.find(fingerprint)
+        reused = await _reuse_analysis(match) if match is not None else None
+
+        duplicate_of_id = None
+        if reused is not None:
+            summary, keywords = reused
+            progress.incr("duplicates_reused")
+            logger.info(f"   Yakın kopya bulundu, özet yeniden kullanılıyor: {url}")
+            duplicate_of_id = await _original_article_id(match)
+            if duplicate_of_id is None:
+                # Özgün makale kaydedilemedi; bu makale özgün olarak kaydedilir (embedding'i üretilir, bağlanmaz)
+                match = None
+                own_entry = _track_original(fingerprint)
+                own_entry.analysis.set_result((summary, keywords))
+        else:
+            # Adım 3: LLM ile işleme
+            logger.debug("   [3/4] LLM ile işleniyor: %s", url)
+            match = None
+            own_entry = _track_original(fingerprint)
+            try:
+                with progress.work_timer("summarize"):
+                    summary, keywords = await process_content_with_llm(content)
+                own_entry.analysis.set_result((summary, keywords))
+            finally:
+                if not own_entry.analysis.done():
+                    # Bekleyen kopyalar kendi LLM çağrılarına dönsün
+                    own_entry.analysis.set_result(None)
         
-        logger.debug(f"LLM Sonucu -> Özet alındı mı?: {summary is not None and len(summary) > 10}, Anahtar Kelimeler alındı mı?: {keywords is not None and len(keywords) > 5}")
 
         # Eğer özet veya anahtar kelimeler boşsa veya anlamsızsa, kaydetme.
         if not summary or not keywords:
             logger.warning(f"<- LLM'den geçerli özet alınamadı, makale kaydedilmeyecek: {url}")
+            progress.incr("failed")
+            if raise_errors:
+                raise EmptyAnalysisError("LLM'den geçerli özet alınamadı")
             return
 
         # --- YENİ DOĞRULAMA ADIMI ---
         # 2. Özet Doğrulaması: Özet boş olamaz.
         if not summary or len(summary.strip()) < 20:
             logger.warning(f"<- Yetersiz özet, makale kaydedilmeyecek: {url}")
+            progress.incr("failed")
+            if raise_errors:
+                raise EmptyAnalysisError("Yetersiz özet")
             return
+        if reused is None:
+            progress.incr("summarized")
 
         article_to_create = schemas.ArticleCreate(
             **article_data,
@@ -193,14 +465,62 @@ async def process_and_save_article(article_data: dict):
             keywords=keywords
         )
 
-        # Adım 4: Veritabanına kaydetme
-        logger.debug(f"   [4/4] Veritabanına kaydediliyor: {url}")
-        with next(database.get_db()) as db:
-            article_crud.create_article(db, article=article_to_create)
+        # Anlamsal arama için embedding (başarısız olursa makale yine de kaydedilir).
+        # Kopyalar özgün makaleyle aynı içeriği taşıdığı için ayrıca gömülmez.
+        embedding = None
+        if match is None:
+            embedder = embedding_service.get_embedder()
+            try:
+                embedding_text = embedding_service.article_embedding_text(article_data["title"], summary, keywords)
+                with progress.work_timer("embed"):
+                    vector = (await embedder.aembed([embedding_text], lane=llm_client.INGESTION_LANE))[0]
+                embedding = (embedder.name, len(vector), embedding_service.to_blob(vector))
+            except Exception as e:
+                logger.warning(f"   Embedding üretilemedi ({url}): {e}")
+
+        # Adım 4: Veritabanına kaydetme (tek yazıcılı toplu kuyruk üzerinden)
+        logger.debug("   [4/4] Veritabanına kaydediliyor: %s", url)
+        fingerprint_row = (dedup_service.to_signed64(fingerprint), duplicate_of_id)
+        with progress.work_timer("save"):
+            if writer is None:
+                async with ArticleWriter() as single_writer:
+                    article_id = await single_writer.submit(article_to_create, embedding, fingerprint_row)
+            else:
+                article_id = await writer.submit(article_to_create, embedding, fingerprint_row)
+
+        dedup_service.remember_url(url)
+        if article_id is None:
+            logger.info(f"<- Makale zaten mevcut, atlandı: {url}")
+            progress.incr("skipped")
+            return None
+        progress.incr("saved")
+        if own_entry is not None:
+            dedup_service.fingerprint_index.assign(own_entry, article_id)
+            own_entry.saved.set_result(article_id)
         logger.info(f"<- Başarıyla tamamlandı: {url}")
+        return article_id
 
-    except requests.exceptions.RequestException as e:
+    except CircuitOpenError as e:
+        logger.info(f"<- {e}, atlanıyor")
+        progress.incr("circuit_open")
+        if raise_errors:
+            raise
+    except EmptyAnalysisError:
+        # Yukarıda loglandı ve sayıldı
+        raise
+    except (FetchError, aiohttp.ClientError, asyncio.TimeoutError) as e:
         logger.error(f"<- İndirme hatası ({url}): {e}")
+        progress.incr("failed")
+        if raise_errors:
+            raise
     except Exception as e:
         logger.error(f"<- Genel bir hata oluştu ({url}): {e}", exc_info=True)
+        progress.incr("failed")
+        if raise_errors:
+            raise
+    finally:
+        if own_entry is not None and not own_entry.saved.done():
+            # Kaydedilemedi: bekleyen kopyalar kendilerini özgün olarak kaydetsin
+            own_entry.saved.set_result(None)
+            dedup_service.fingerprint_index.remove(own_entry)
 
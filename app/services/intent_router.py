@@ -0,0 +1,184 @@
+"""
+Sık görülen sohbet sorguları için LLM'siz hızlı yönlendirici.
+
+"son 3 gün", "bugünkü haberler", "last week", "NVIDIA haberleri", "news about GPT-5"
+gibi kalıplar kurallarla tanınır ve doğrudan `get_recent_news` veya
+`search_news_by_topic` planına çevrilir. Yönlendirici emin olmadığında None döner ve
+planlama LLM'e bırakılır. LLM'in ürettiği planlar normalize edilmiş sorgu metni ve
+planlayıcıya verilen sohbet geçmişinin özeti (`context`) ile önbelleğe alınır.
+"""
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from app.core.config import INTENT_ROUTER_ENABLED, PLAN_CACHE_SIZE, PLAN_CACHE_TTL_SECONDS
+from app.services import metrics
+
+Plan = Tuple[str, dict]
+
+_NUMBER_WORDS = {
+    "bir": 1, "iki": 2, "üç": 3, "dört": 4, "beş": 5, "altı": 6, "yedi": 7, "sekiz": 8, "dokuz": 9, "on": 10,
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+    "a": 1, "an": 1,
+}
+_UNIT_DAYS = {
+    "gün": 1, "günün": 1, "gündeki": 1, "gündür": 1, "günlük": 1, "günde": 1, "günkü": 1,
+    "hafta": 7, "haftanın": 7, "haftadaki": 7, "haftalık": 7, "haftada": 7,
+    "ay": 30, "ayın": 30, "aydaki": 30, "aylık": 30, "ayda": 30,
+    "day": 1, "days": 1, "week": 7, "weeks": 7, "month": 30, "months": 30,
+}
+_NUMBER = r"(\d{1,3}|" + "|".join(sorted(_NUMBER_WORDS, key=len, reverse=True)) + r")"
+_UNIT = r"(" + "|".join(sorted(_UNIT_DAYS, key=len, reverse=True)) + r")"
+
+# (desen, gün sayısı veya None: sayı ve birim desenden okunur)
+_DATE_PATTERNS = [
+    (re.compile(rf"\b(?:son|geçen|geçtiğimiz|last|past|previous)\s+{_NUMBER}\s+{_UNIT}\b"), None),
+    (re.compile(rf"\b(?:son|geçen|geçtiğimiz|bu|last|past|this)\s+{_UNIT}\b"), None),
+    (re.compile(r"\b(?:bugünkü|bugünün|bugün|todays|today)\b"), 1),
+    (re.compile(r"\b(?:dünkü|dünün|dün|yesterday)\b"), 2),
+    (re.compile(r"\b(?:en son|son|güncel|latest|recent|newest)\b"), 7),
+]
+
+# Tarih ifadesi çıkarıldıktan sonra kalabilecek, anlam taşımayan kelimeler
+_FILLER_WORDS = {
+    "haber", "haberler", "haberleri", "haberlerini", "gelişmeler", "gelişmeleri", "neler", "ne", "var", "oldu",
+    "olan", "olanlar", "içinde", "içindeki", "göster", "getir", "listele", "ver", "bana", "lütfen", "nedir",
+    "öne", "çıkan", "önemli", "ve", "mi", "mı", "yapay", "zeka", "ai", "teknoloji",
+    "news", "show", "me", "give", "list", "what", "whats", "is", "are", "the", "happened",
+    "in", "from", "of", "for", "please", "top", "headlines", "tech", "any", "new",
+}
+
+# "breaking news", "fake news", "dünya haberleri" gibi haberin türünü niteleyen, tek başına
+# konu olmayan kelimeler; konu yalnızca bunlardan (ve dolgu kelimelerinden) oluşuyorsa karar LLM'e kalır
+_NEWS_QUALIFIERS = {
+    "breaking", "fake", "real", "world", "local", "national", "international", "global", "daily", "weekly",
+    "big", "good", "bad", "hot", "trending", "important", "major", "more", "other", "general", "top",
+    "son", "dakika", "sahte", "dünya", "yerel", "ulusal", "gündem", "gündemdeki", "manşet", "flaş", "sıcak",
+    "popüler", "diğer", "başka", "yeni", "güncel", "genel", "iyi", "kötü",
+}
+_TOPIC_STOPWORDS = _FILLER_WORDS | _NEWS_QUALIFIERS
+
+# Konu kalıpları: yakalanan grup konu metnidir (orijinal yazımıyla geri alınır)
+_TOPIC_PATTERNS = [
+    re.compile(r"^(?P<topic>.+?)\s+(?:ile ilgili|hakkında|hakkındaki|konusunda)(?:\s+(?:son\s+)?(?:haberler|haberleri|gelişmeler|gelişmeleri|bilgi))?(?:\s+(?:ver|göster|getir|nedir|neler))?$"),
+    re.compile(r"^(?P<topic>.+?)\s+(?:haberleri|haberi|gelişmeleri)(?:\s+(?:ver|göster|getir|neler))?$"),
+    re.compile(r"^(?:news|articles|updates)\s+(?:about|on)\s+(?P<topic>.+)$"),
+    re.compile(r"^(?:what new with|whats new with|what is new with)\s+(?P<topic>.+)$"),
+    re.compile(r"^(?P<topic>.+?)\s+(?:news|updates)$"),
+]
+_MAX_TOPIC_WORDS = 4
+
+_stats = {"queries": 0, "router_hits": 0, "plan_cache_hits": 0, "llm_plans": 0}
+
+def normalize_query(query: str) -> str:
+    """Sorguyu Türkçe'ye uygun küçük harfe çevirir, noktalama ve fazla boşlukları atar."""
+    query = query.replace("İ", "i").lower()
+    # Kesme işaretinden sonraki ekleri at: "openai'ın" -> "openai", "today's" -> "today"
+    query = re.sub(r"['’]\w*", "", query)
+    query = re.sub(r"[^\w\s\-\.]", " ", query)
+    query = re.sub(r"(?<!\w)[\.\-]|[\.\-](?!\w)", " ", query)
+    return re.sub(r"\s+", " ", query).strip()
+
+def _days_from_match(match: re.Match, fixed_days: Optional[int]) -> Optional[int]:
+    if fixed_days is not None:
+        return fixed_days
+    groups = [g for g in match.groups() if g]
+    if len(groups) == 2:
+        number, unit = groups
+        count = int(number) if number.isdigit() else _NUMBER_WORDS[number]
+    else:
+        count, unit = 1, groups[0]
+    days = count * _UNIT_DAYS[unit]
+    return days if 0 < days <= 365 else None
+
+def _route_recent(normalized: str) -> Optional[Plan]:
+    for pattern, fixed_days in _DATE_PATTERNS:
+        match = pattern.search(normalized)
+        if not match:
+            continue
+        days = _days_from_match(match, fixed_days)
+        if days is None:
+            return None
+        rest = (normalized[:match.start()] + " " + normalized[match.end():]).split()
+        # Tarihin yanında bir konu da varsa (ör. "son 3 gün nvidia") karar LLM'e kalsın
+        if all(word in _FILLER_WORDS for word in rest):
+            return "get_recent_news", {"days_ago": days}
+        return None
+    return None
+
+def _original_span(query: str, normalized_topic: str) -> str:
+    """Normalize edilmiş konu metnini kullanıcının orijinal yazımıyla geri döndürür."""
+    words = normalized_topic.split()
+    original_words = re.sub(r"['’]\w*", "", query)
+    original_words = re.sub(r"[^\w\s\-\.]", " ", original_words).split()
+    normalized_words = [normalize_query(word) for word in original_words]
+    for i in range(len(normalized_words) - len(words) + 1):
+        if normalized_words[i:i + len(words)] == words:
+            return " ".join(original_words[i:i + len(words)]).strip(" '.-")
+    return normalized_topic
+
+def _route_topic(query: str, normalized: str) -> Optional[Plan]:
+    for pattern in _TOPIC_PATTERNS:
+        match = pattern.match(normalized)
+        if not match:
+            continue
+        topic = match.group("topic").strip()
+        words = topic.split()
+        if not words or len(words) > _MAX_TOPIC_WORDS or all(word in _TOPIC_STOPWORDS for word in words):
+            return None
+        # Konunun içinde tarih ifadesi varsa ("son 3 gün haberleri") bu bir konu araması değildir
+        if any(p.search(topic) for p, _ in _DATE_PATTERNS):
+            return None
+        return "search_news_by_topic", {"topic": _original_span(query, topic)}
+    return None
+
+def route(query: str) -> Optional[Plan]:
+    """Sorgu kurallarla güvenle planlanabiliyorsa (araç adı, argümanlar) döndürür."""
+    _stats["queries"] += 1
+    if not INTENT_ROUTER_ENABLED or not query:
+        return None
+    normalized = normalize_query(query)
+    plan = _route_recent(normalized) or _route_topic(query, normalized)
+    if plan is not None:
+        _stats["router_hits"] += 1
+    return plan
+
+# --- LLM planları için önbellek ((bağlam, normalize sorgu) -> (plan, zaman)) ---
+
+_plan_cache: "OrderedDict[Tuple[str, str], Tuple[Plan, float]]" = OrderedDict()
+
+def get_cached_plan(query: str, context: str = "") -> Optional[Plan]:
+    """
+    Önbellekteki LLM planını döndürür. `context`, planın bağlı olduğu sohbet geçmişinin
+    özetidir; "bunun hakkında daha fazla" gibi sorgular farklı geçmişlerde farklı plan üretir.
+    """
+    key = (context, normalize_query(query))
+    cached = _plan_cache.get(key)
+    if cached is None:
+        return None
+    plan, stored_at = cached
+    if time.monotonic() - stored_at > PLAN_CACHE_TTL_SECONDS:
+        del _plan_cache[key]
+        return None
+    _plan_cache.move_to_end(key)
+    _stats["plan_cache_hits"] += 1
+    return plan
+
+def cache_plan(query: str, plan: Plan, context: str = ""):
+    _stats["llm_plans"] += 1
+    key = (context, normalize_query(query))
+    _plan_cache[key] = (plan, time.monotonic())
+    _plan_cache.move_to_end(key)
+    while len(_plan_cache) > PLAN_CACHE_SIZE:
+        _plan_cache.popitem(last=False)
+
+def router_stats() -> Dict[str, float]:
+    """Yönlendirici ve plan önbelleği sayaçlarını ve isabet oranlarını döndürür."""
+    queries = _stats["queries"] or 1
+    return {
+        **_stats,
+        "router_hit_rate": _stats["router_hits"] / queries,
+        "plan_cache_hit_rate": _stats["plan_cache_hits"] / queries,
+    }
+
+metrics.register_collector("novaai_intent_router", "Yönlendirici ve plan önbelleği sayaçları.", router_stats)
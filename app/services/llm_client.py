@@ -0,0 +1,221 @@
+"""
+Süreç genelinde paylaşılan LLM istemcisi.
+
+`ChatOpenAI` istemcileri (model, sıcaklık) başına bir kez oluşturulur ve tek bir
+HTTP bağlantı havuzunu paylaşır. Tüm çağrılar `ainvoke` üzerinden geçer:
+
+- dakika başına istek ve token için iki token-bucket sınırlayıcı,
+- her şerit (lane) için ayrı bir eş zamanlılık semaforu,
+- 429/5xx/zaman aşımı hatalarında jitter'lı üstel geri çekilme ile yeniden deneme.
+
+Sohbet (`CHAT_LANE`) ve ingestion (`INGESTION_LANE`) ayrı şeritlerdir; ingestion
+bucket'ları `LLM_CHAT_RESERVE_RATIO` oranındaki kapasitenin altına indiremez, böylece
+büyük bir toplama işi etkileşimli sohbeti aç bırakmaz.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+import httpx
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_openai import ChatOpenAI
+from app.core.config import (
+    OPENAI_API_KEY,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
+    LLM_CHAT_CONCURRENCY,
+    LLM_INGESTION_CONCURRENCY,
+    LLM_CHAT_RESERVE_RATIO,
+    LLM_MAX_RETRIES,
+    LLM_TIMEOUT_SECONDS,
+)
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+CHAT_LANE = "chat"
+INGESTION_LANE = "ingestion"
+
+# Yanıt için token tahminine eklenen pay
+DEFAULT_OUTPUT_TOKENS = 300
+
+class TokenBucket:
+    """Dakikalık bir limiti saniyelik dolum hızına çeviren asenkron token bucket."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, amount: float, reserve: float = 0.0):
+        """`amount` kadar token alır; bucket'ta `reserve` kadar pay bırakılana dek bekler."""
+        amount = min(amount, self.capacity - reserve)
+        while True:
+            # Kilit beklerken tutulmaz; böylece rezervi kullanabilen sohbet istekleri öne geçebilir
+            async with self._lock:
+                self._refill()
+                if self.tokens - amount >= reserve:
+                    self.tokens -= amount
+                    return
+                wait = (amount + reserve - self.tokens) / self.rate
+            await asyncio.sleep(wait)
+
+_request_bucket = None
+_token_bucket = None
+_lane_semaphores: Dict[str, asyncio.Semaphore] = {}
+_lane_limits = {CHAT_LANE: LLM_CHAT_CONCURRENCY, INGESTION_LANE: LLM_INGESTION_CONCURRENCY}
+_clients: Dict[Tuple[str, float], ChatOpenAI] = {}
+_http_client = None
+
+def _buckets():
+    global _request_bucket, _token_bucket
+    if _request_bucket is None:
+        _request_bucket = TokenBucket(LLM_REQUESTS_PER_MINUTE)
+        _token_bucket = TokenBucket(LLM_TOKENS_PER_MINUTE)
+    return _request_bucket, _token_bucket
+
+def _semaphore(lane: str) -> asyncio.Semaphore:
+    if lane not in _lane_semaphores:
+        _lane_semaphores[lane] = asyncio.Semaphore(_lane_limits.get(lane, LLM_CHAT_CONCURRENCY))
+    return _lane_semaphores[lane]
+
+class _UsageCallback(BaseCallbackHandler):
+    """Model başına istek ve token sayaçlarını günceller."""
+
+    def __init__(self, model: str):
+        self.model = model
+
+    def on_llm_end(self, response, **kwargs):
+        metrics.LLM_REQUESTS.inc(model=self.model, outcome="ok")
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        metrics.LLM_TOKENS.inc(usage.get("prompt_tokens", 0), model=self.model, kind="prompt")
+        metrics.LLM_TOKENS.inc(usage.get("completion_tokens", 0), model=self.model, kind="completion")
+
+    def on_llm_error(self, error, **kwargs):
+        metrics.LLM_REQUESTS.inc(model=self.model, outcome="error")
+
+def get_llm(model: str = "gpt-4o-mini", temperature: float = 0) -> ChatOpenAI:
+    """(model, sıcaklık) başına paylaşılan `ChatOpenAI` istemcisini döndürür."""
+    global _http_client
+    if not OPENAI_API_KEY:
+        raise ValueError("OPENAI_API_KEY ortam değişkeni ayarlanmadı.")
+    key = (model, temperature)
+    if key not in _clients:
+        if _http_client is None:
+            _http_client = httpx.AsyncClient(
+                timeout=LLM_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=LLM_CHAT_CONCURRENCY + LLM_INGESTION_CONCURRENCY,
+                    max_keepalive_connections=LLM_CHAT_CONCURRENCY + LLM_INGESTION_CONCURRENCY,
+                ),
+            )
+        # Yeniden denemeyi sınırlayıcıyla birlikte burada yönettiğimiz için SDK'nınkini kapat
+        _clients[key] = ChatOpenAI(
+            api_key=OPENAI_API_KEY,
+            model=model,
+            temperature=temperature,
+            max_retries=0,
+            http_async_client=_http_client,
+            callbacks=[_UsageCallback(model)],
+        )
+    return _clients[key]
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken yoksa veya kodlama indirilemiyorsa kaba tahmine dön
+    _encoding = None
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+def split_by_tokens(text: str, chunk_tokens: int) -> List[str]:
+    """Metni en fazla `chunk_tokens` token'lık ardışık parçalara böler."""
+    if not text:
+        return []
+    if _encoding is not None:
+        tokens = _encoding.encode(text, disallowed_special=())
+        return [_encoding.decode(tokens[i:i + chunk_tokens]) for i in range(0, len(tokens), chunk_tokens)]
+    chunk_chars = chunk_tokens * 4
+    return [text[i:i + chunk_chars] for i in range(0, len(text), chunk_chars)]
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Metnin ilk `max_tokens` token'ını döndürür."""
+    chunks = split_by_tokens(text, max_tokens)
+    return chunks[0] if chunks else text
+
+def warm_up(clients: List[Tuple[str, float]]):
+    """Verilen (model, sıcaklık) istemcilerini ve tokenizer'ı önceden oluşturur."""
+    count_tokens("ısınma")
+    for model, temperature in clients:
+        get_llm(model=model, temperature=temperature)
+
+def _estimate_tokens(inputs: Any) -> int:
+    if isinstance(inputs, dict):
+        text = " ".join(str(v) for v in inputs.values())
+    else:
+        text = str(inputs)
+    return count_tokens(text) + DEFAULT_OUTPUT_TOKENS
+
+def _is_retryable(error: Exception) -> bool:
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    if status is not None:
+        return status in (408, 409, 429) or status >= 500
+    return isinstance(error, (asyncio.TimeoutError, httpx.TimeoutException, httpx.TransportError)) or type(error).__name__ in (
+        "APITimeoutError",
+        "APIConnectionError",
+        "RateLimitError",
+        "InternalServerError",
+    )
+
+async def ainvoke(runnable, inputs: Any, lane: str = CHAT_LANE, estimated_tokens: int = None):
+    """
+    Bir LangChain runnable'ını (ör. `prompt | llm`) paylaşılan limitler altında çalıştırır.
+    """
+    tokens = estimated_tokens if estimated_tokens is not None else _estimate_tokens(inputs)
+    return await acall(lambda: runnable.ainvoke(inputs), lane=lane, estimated_tokens=tokens)
+
+async def acall(call: Callable[[], Awaitable], lane: str, estimated_tokens: int):
+    """
+    Sağlayıcıya giden herhangi bir isteği (ör. embedding) paylaşılan limitler ve yeniden
+    deneme altında çalıştırır. `call` her denemede yeni bir awaitable üretmelidir.
+    """
+    request_bucket, token_bucket = _buckets()
+    tokens = estimated_tokens
+    is_chat = lane == CHAT_LANE
+    request_reserve = 0.0 if is_chat else request_bucket.capacity * LLM_CHAT_RESERVE_RATIO
+    token_reserve = 0.0 if is_chat else token_bucket.capacity * LLM_CHAT_RESERVE_RATIO
+
+    attempt = 0
+    while True:
+        async with _semaphore(lane):
+            await request_bucket.acquire(1, reserve=request_reserve)
+            await token_bucket.acquire(tokens, reserve=token_reserve)
+            started = time.perf_counter()
+            try:
+                with metrics.LLM_IN_FLIGHT.track_inflight(lane=lane):
+                    result = await call()
+                metrics.LLM_SECONDS.observe(time.perf_counter() - started, lane=lane, outcome="ok")
+                return result
+            except Exception as e:
+                metrics.LLM_SECONDS.observe(time.perf_counter() - started, lane=lane, outcome="error")
+                if attempt >= LLM_MAX_RETRIES or not _is_retryable(e):
+                    raise
+                error = e
+        # Semafor bırakıldıktan sonra bekle ki diğer istekler ilerleyebilsin
+        attempt += 1
+        delay = random.uniform(0, min(30.0, 0.5 * 2 ** attempt))
+        logger.warning(f"LLM çağrısı yeniden denenecek ({lane}, deneme {attempt}, {delay:.1f}s): {error}")
+        await asyncio.sleep(delay)
@@ -0,0 +1,212 @@
+"""
+Süreç içi metrikler ve hafif zamanlama izleri (span).
+
+Sayaç (counter), gösterge (gauge) ve histogramlar Prometheus metin biçiminde
+`/metrics` uç noktasından sunulur; harici bir bağımlılık gerektirmez.
+Önbellek isabet oranı gibi başka modüllerde tutulan değerler `register_collector`
+ile kaydedilen fonksiyonlardan okunur.
+
+`span(ad)` bir kod bloğunu zamanlar: süre `novaai_span_seconds{span="ad"}`
+histogramına (ve verilirse ayrıca belirli bir histograma) yazılır. İç içe span'ler
+aynı iz (trace) altında toplanır; en dıştaki span `TRACE_LOG_THRESHOLD_SECONDS`
+süresini aşarsa aşamaların dökümü tek satırda loglanır.
+"""
+import contextvars
+import functools
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+from app.core.config import TRACE_LOG_THRESHOLD_SECONDS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_registry: List["_Metric"] = []
+_collectors: List[Tuple[str, str, Callable[[], Dict[str, float]]]] = []
+
+def _label_key(label_names: Tuple[str, ...], labels: dict) -> Tuple[str, ...]:
+    return tuple(str(labels.get(name, "")) for name in label_names)
+
+def _format_labels(label_names: Tuple[str, ...], key: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{value}"' for name, value in zip(label_names, key)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        _registry.append(self)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}", *self._samples()]
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(self.label_names, labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        self._values[_label_key(self.label_names, labels)] = value
+
+    @contextmanager
+    def track_inflight(self, **labels):
+        self.inc(1, **labels)
+        try:
+            yield
+        finally:
+            self.dec(1, **labels)
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(buckets) + (float("inf"),)
+        # etiket anahtarı -> [kova sayaçları, toplam, adet]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = _label_key(self.label_names, labels)
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[0][i] += 1
+                break
+        state[1] += value
+        state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, (bucket_counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+def register_collector(prefix: str, documentation: str, collect: Callable[[], Dict[str, float]]):
+    """`collect()` sözlüğündeki her değer `/metrics`'te `{prefix}_{anahtar}` göstergesi olarak sunulur."""
+    _collectors.append((prefix, documentation, collect))
+
+def render() -> str:
+    """Tüm metrikleri Prometheus metin biçiminde döndürür."""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    for prefix, documentation, collect in _collectors:
+        try:
+            values = collect()
+        except Exception as e:
+            logger.warning(f"Metrik toplayıcısı başarısız ({prefix}): {e}")
+            continue
+        for key, value in values.items():
+            name = f"{prefix}_{key}"
+            lines += [f"# HELP {name} {documentation}", f"# TYPE {name} gauge", f"{name} {_format_value(value)}"]
+    return "\n".join(lines) + "\n"
+
+# --- Metrik tanımları ---
+
+SPAN_SECONDS = Histogram("novaai_span_seconds", "Zamanlanan kod bloklarının süresi.", ("span",))
+CHAT_IN_FLIGHT = Gauge("novaai_chat_in_flight", "İşlenmekte olan sohbet istekleri.", ("mode",))
+PLANNER_SECONDS = Histogram("novaai_planner_seconds", "Sorgu planlama süresi.", ("source",))
+TOOL_QUERY_SECONDS = Histogram("novaai_tool_query_seconds", "Sohbet araçlarının veritabanı sorgu süresi.", ("tool",))
+SUMMARY_SECONDS = Histogram("novaai_summary_seconds", "Anlık özet üretim süresi.")
+HTTP_FETCH_SECONDS = Histogram("novaai_http_fetch_seconds", "Makale sayfası indirme süresi.", ("outcome",))
+HTTP_IN_FLIGHT = Gauge("novaai_http_fetch_in_flight", "Süren sayfa indirmeleri.")
+EXTRACTION_SECONDS = Histogram("novaai_extraction_seconds", "HTML'den metin ayıklama süresi.")
+LLM_SECONDS = Histogram("novaai_llm_seconds", "Tek bir LLM çağrısının süresi (deneme başına).", ("lane", "outcome"))
+LLM_IN_FLIGHT = Gauge("novaai_llm_in_flight", "Süren LLM çağrıları.", ("lane",))
+LLM_REQUESTS = Counter("novaai_llm_requests_total", "Model başına LLM istekleri.", ("model", "outcome"))
+LLM_TOKENS = Counter("novaai_llm_tokens_total", "Model başına kullanılan LLM token'ları.", ("model", "kind"))
+DB_WRITE_SECONDS = Histogram("novaai_db_write_seconds", "Toplu makale yazma süresi.", ("mode",))
+INGESTION_IN_FLIGHT = Gauge("novaai_ingestion_articles_in_flight", "İşlenmekte olan makaleler.")
+FEED_POLLS = Counter("novaai_feed_polls_total", "Besleme yoklamaları (sonuca göre).", ("source", "outcome"))
+FEED_CONSECUTIVE_FAILURES = Gauge("novaai_feed_consecutive_failures", "Beslemenin ardışık başarısız yoklama sayısı.", ("source",))
+DOMAIN_CIRCUIT_OPEN = Gauge("novaai_domain_circuit_open", "Alan adı devre kesicisi açık mı (1/0).", ("domain",))
+
+# --- İzler (span) ---
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("novaai_trace", default=None)
+
+@contextmanager
+def span(name: str, histogram: Optional[Histogram] = None, log_slow: bool = True, **labels):
+    """
+    Bloğu zamanlar; süreyi span histogramına ve varsa verilen histograma yazar.
+    `log_slow=False` ile en dıştaki span olsa bile yavaş iz logu yazılmaz.
+    """
+    trace = _current_trace.get()
+    token = None
+    if trace is None:
+        trace = []
+        token = _current_trace.set(trace)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        SPAN_SECONDS.observe(elapsed, span=name)
+        if histogram is not None:
+            histogram.observe(elapsed, **labels)
+        if token is not None:
+            _current_trace.reset(token)
+            if log_slow and elapsed >= TRACE_LOG_THRESHOLD_SECONDS:
+                steps = ", ".join(f"{step} {seconds:.3f}s" for step, seconds in trace)
+                logger.info(f"Yavaş iz: {name} {elapsed:.3f}s [{steps}]")
+        else:
+            trace.append((name, elapsed))
+
+def traced(name: str, histogram: Optional[Histogram] = None, **labels):
+    """Asenkron fonksiyonu `span` ile saran dekoratör."""
+    def decorator(function):
+        @functools.wraps(function)
+        async def wrapper(*args, **kwargs):
+            with span(name, histogram, **labels):
+                return await function(*args, **kwargs)
+        return wrapper
+    return decorator
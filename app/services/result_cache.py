@@ -0,0 +1,229 @@
+"""
+Sohbet araçlarının sonuçları için önbellek.
+
+Anahtar, araç adı ve normalize edilmiş argümanlardan oluşur; değer olarak makale
+ID'leri, giriş cümlesi ve hazır render edilmiş haber kartları tutulur. Böylece
+aynı soru tekrarlandığında ne sorgu çalışır ne ORM nesneleri oluşturulur ne de
+özetler yeniden zenginleştirilir.
+
+Geçersiz kılma bir nesil (generation) sayacıyla yapılır: `ingest_news` yeni makale
+yazdığında sayacı artırır ve sayaç anahtarın parçası olduğundan eski nesildeki tüm
+kayıtlar bir anda erişilemez hale gelir (TTL/LRU ile zamanla temizlenir).
+
+İki arka uç vardır:
+- `InProcessCacheBackend`: süreç içi TTL + LRU. Tek süreçli kurulum için yeterlidir;
+  ingestion başka bir süreçte çalışıyorsa nesil sayacı paylaşılmaz ve kayıtlar en
+  geç TTL sonunda tazelenir.
+- `RedisCacheBackend`: `RESULT_CACHE_URL` verilirse (ve `redis` paketi kuruluysa)
+  kullanılan paylaşımlı arka uç; nesil sayacı tüm süreçler arasında ortaktır.
+
+Testlerde veya yerel geliştirmede `set_cache_backend` ile herhangi bir arka uç
+(ör. süreç içi olan) paylaşımlı olanın yerine konabilir.
+
+Aynı nesil sayacı `content_version` ile HTTP önbelleklemesine de açılır: `/articles`
+yanıtlarının ETag'i bu sürümden türetilir ve yeni bir ingestion ile değişir. Sohbette
+anlık üretilip kaydedilen özetler yalnızca ayrı bir özet sayacını artırır: `/articles`
+kartlarındaki özet değişir ama önbellekteki sohbet kartları zaten üretilmiş özeti
+taşıdığı için geçersiz kılınmaz.
+"""
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from app.core.config import RESULT_CACHE_ENABLED, RESULT_CACHE_SIZE, RESULT_CACHE_TTL_SECONDS, RESULT_CACHE_URL
+from app.services import metrics
+from app.services.intent_router import normalize_query
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "novaai:tool:"
+_GENERATION_KEY = "novaai:tool-generation"
+_SUMMARY_VERSION_KEY = "novaai:summary-version"
+
+class InProcessCacheBackend:
+    """Süreç içi TTL + LRU arka ucu."""
+
+    def __init__(self, max_size: int = RESULT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[dict, float]]" = OrderedDict()
+        self._generation = 0
+        self._summary_version = 0
+
+    async def get(self, key: str) -> Optional[dict]:
+        cached = self._entries.get(key)
+        if cached is None:
+            return None
+        value, expires_at = cached
+        if time.monotonic() > expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: dict, ttl: int):
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get_generation(self) -> int:
+        return self._generation
+
+    async def bump_generation(self) -> int:
+        self._generation += 1
+        # Eski nesildeki kayıtlara artık erişilemez; belleği hemen geri ver
+        self._entries.clear()
+        return self._generation
+
+    async def get_summary_version(self) -> int:
+        return self._summary_version
+
+    async def bump_summary_version(self) -> int:
+        self._summary_version += 1
+        return self._summary_version
+
+class RedisCacheBackend:
+    """Redis üzerinde paylaşımlı arka uç; LRU tahliyesi Redis'in `maxmemory-policy` ayarına bırakılır."""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis  # isteğe bağlı bağımlılık
+
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[dict]:
+        raw = await self._client.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: dict, ttl: int):
+        await self._client.set(key, json.dumps(value, ensure_ascii=False), ex=ttl)
+
+    async def get_generation(self) -> int:
+        raw = await self._client.get(_GENERATION_KEY)
+        return int(raw) if raw is not None else 0
+
+    async def bump_generation(self) -> int:
+        return int(await self._client.incr(_GENERATION_KEY))
+
+    async def get_summary_version(self) -> int:
+        raw = await self._client.get(_SUMMARY_VERSION_KEY)
+        return int(raw) if raw is not None else 0
+
+    async def bump_summary_version(self) -> int:
+        return int(await self._client.incr(_SUMMARY_VERSION_KEY))
+
+_backend = None
+# Süreç içi nesil sayacı her açılışta sıfırdan başladığı için sürüm etiketine eklenir
+_instance_id = uuid.uuid4().hex[:8]
+_stats = {"hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+def _create_backend():
+    if RESULT_CACHE_URL:
+        try:
+            return RedisCacheBackend(RESULT_CACHE_URL)
+        except ImportError:
+            logger.warning("`redis` paketi kurulu değil; süreç içi sonuç önbelleği kullanılacak.")
+    return InProcessCacheBackend()
+
+def get_cache_backend():
+    global _backend
+    if _backend is None:
+        _backend = _create_backend()
+    return _backend
+
+def set_cache_backend(backend):
+    """Arka ucu değiştirir (ör. testlerde paylaşımlı arka uç yerine yerel bir eşdeğer)."""
+    global _backend
+    _backend = backend
+
+def normalize_args(tool_args: dict) -> dict:
+    """Aynı anlama gelen argümanların aynı anahtara düşmesi için metinleri ve sayıları normalize eder."""
+    normalized = {}
+    for name, value in tool_args.items():
+        if isinstance(value, str):
+            normalized[name] = normalize_query(value)
+        elif isinstance(value, float) and value.is_integer():
+            normalized[name] = int(value)
+        else:
+            normalized[name] = value
+    return normalized
+
+def _cache_key(generation: int, tool_name: str, tool_args: dict) -> str:
+    args = json.dumps(normalize_args(tool_args), sort_keys=True, ensure_ascii=False)
+    return f"{_KEY_PREFIX}{generation}:{tool_name}:{args}"
+
+async def get_result(tool_name: str, tool_args: dict) -> Tuple[Optional[int], Optional[dict]]:
+    """
+    `(nesil, sonuç)` döndürür; sonuç `{"intro", "article_ids", "cards"}` sözlüğüdür
+    ya da kayıt yoksa None. Sonuç yeniden hesaplanırsa nesil `store_result`'a
+    verilmelidir: hesaplama sürerken ingestion tamamlanırsa eski sonuç yeni nesle yazılmaz.
+    """
+    if not RESULT_CACHE_ENABLED:
+        return None, None
+    backend = get_cache_backend()
+    try:
+        generation = await backend.get_generation()
+        value = await backend.get(_cache_key(generation, tool_name, tool_args))
+    except Exception as e:
+        # Önbellek erişilemezse sorgu yolu normal şekilde çalışmaya devam eder
+        _stats["errors"] += 1
+        logger.warning(f"Sonuç önbelleği okunamadı: {e}")
+        return None, None
+    _stats["hits" if value is not None else "misses"] += 1
+    return generation, value
+
+async def store_result(generation: Optional[int], tool_name: str, tool_args: dict, intro: str, article_ids: List[int], cards: List[str]):
+    if not RESULT_CACHE_ENABLED or generation is None:
+        return
+    value = {"intro": intro, "article_ids": article_ids, "cards": cards}
+    try:
+        await get_cache_backend().set(_cache_key(generation, tool_name, tool_args), value, RESULT_CACHE_TTL_SECONDS)
+        _stats["stores"] += 1
+    except Exception as e:
+        _stats["errors"] += 1
+        logger.warning(f"Sonuç önbelleğine yazılamadı: {e}")
+
+async def bump_generation():
+    """Yeni makaleler yazıldıktan sonra çağrılır; önceki nesildeki tüm sonuçları geçersiz kılar."""
+    try:
+        generation = await get_cache_backend().bump_generation()
+        logger.info(f"Sonuç önbelleği geçersiz kılındı (nesil: {generation}).")
+    except Exception as e:
+        _stats["errors"] += 1
+        logger.warning(f"Sonuç önbelleği nesli artırılamadı: {e}")
+
+async def bump_summary_version():
+    """Makaleye anlık üretilen bir özet kaydedildikten sonra çağrılır; yalnızca `content_version`'ı değiştirir."""
+    try:
+        await get_cache_backend().bump_summary_version()
+    except Exception as e:
+        _stats["errors"] += 1
+        logger.warning(f"Özet sürümü artırılamadı: {e}")
+
+async def content_version() -> Optional[str]:
+    """
+    Makale kümesinin sürüm etiketi (HTTP ETag'leri için); okunamazsa None.
+    Paylaşımlı arka uçta nesil ve özet sayaçlarıdır. Süreç içi arka uçta sayaçlar başka
+    süreçlerdeki ingestion'ları görmediği için süreç kimliği ve TTL penceresi de eklenir;
+    böylece etiket, önbellekteki sonuçlar gibi en geç TTL sonunda tazelenir.
+    """
+    backend = get_cache_backend()
+    try:
+        generation = await backend.get_generation()
+        summary_version = await backend.get_summary_version()
+    except Exception as e:
+        _stats["errors"] += 1
+        logger.warning(f"Sonuç önbelleği nesli okunamadı: {e}")
+        return None
+    version = f"{generation}.{summary_version}"
+    if isinstance(backend, InProcessCacheBackend):
+        return f"{_instance_id}-{version}-{int(time.time() // RESULT_CACHE_TTL_SECONDS)}"
+    return version
+
+def cache_stats() -> Dict[str, float]:
+    """Önbellek sayaçlarını ve isabet oranını döndürür."""
+    lookups = (_stats["hits"] + _stats["misses"]) or 1
+    return {**_stats, "hit_rate": _stats["hits"] / lookups}
+
+metrics.register_collector("novaai_result_cache", "Araç sonuç önbelleği sayaçları.", cache_stats)
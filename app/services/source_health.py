@@ -0,0 +1,233 @@
+"""
+Haber kaynaklarının sağlığı: uyarlanabilir besleme yoklama aralığı ve devre kesiciler.
+
+Besleme başına durum `FeedState` satırında tutulur (gözlenen yayın hızı, son yeni
+girdi, ardışık hata sayısı, bir sonraki yoklama zamanı). Yayın hızı, yeni girdilerin
+zaman damgalarından üstel sönümlü bir sayaçla (`FEED_RATE_WINDOW_HOURS` zaman
+sabitiyle) tahmin edilir; yoklama aralığı bir sonraki yoklamada yaklaşık
+`FEED_POLL_TARGET_ITEMS` yeni girdi beklenecek şekilde seçilir ve
+`FEED_POLL_MIN_MINUTES`..`FEED_POLL_MAX_MINUTES` aralığına sıkıştırılır. Art arda
+`FEED_FAILURE_THRESHOLD` kez başarısız olan kaynak üstel artan sürelerle bekletilir.
+
+Makale sayfaları için alan adı (host) başına süreç içi bir devre kesici
+(`domain_breaker`) tutulur: 401/403/429/5xx yanıtları ve bağlantı/zaman aşımı
+hataları art arda `DOMAIN_FAILURE_THRESHOLD` kez görülünce alan adına istek
+gönderilmez; bekleme dolunca tek bir deneme isteği (half-open) devreyi kapatır
+ya da bekleme süresini ikiye katlar.
+"""
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+from app.core.config import (
+    FEED_ADAPTIVE_POLLING,
+    FEED_POLL_MIN_MINUTES,
+    FEED_POLL_MAX_MINUTES,
+    FEED_POLL_TARGET_ITEMS,
+    FEED_RATE_WINDOW_HOURS,
+    FEED_FAILURE_THRESHOLD,
+    FEED_BACKOFF_MAX_MINUTES,
+    DOMAIN_FAILURE_THRESHOLD,
+    DOMAIN_BACKOFF_SECONDS,
+    DOMAIN_BACKOFF_MAX_SECONDS,
+    HTTP_TIMEOUT_SECONDS,
+)
+from app.services import metrics
+
+# Zamanlayıcının birkaç saniye erken tetiklediği turda beslemenin atlanmaması için tolerans
+_DUE_GRACE = timedelta(seconds=60)
+
+# Alan adının erişilemez olduğuna işaret eden HTTP durumları (404 gibi URL'ye özgü hatalar sayılmaz)
+_FAILURE_STATUSES = (401, 403, 429)
+
+def domain_of(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+def is_failure_status(status: Optional[int]) -> bool:
+    return status is not None and (status in _FAILURE_STATUSES or status >= 500)
+
+# --- Alan adı devre kesicisi ---
+
+@dataclass
+class _Circuit:
+    failures: int = 0
+    trips: int = 0
+    open_until: float = 0.0
+    probe_started: Optional[float] = None
+    rejected: int = 0
+    last_error: Optional[str] = None
+
+class CircuitBreaker:
+    """Anahtar (alan adı) başına ardışık hatalarla açılan, süreç içi devre kesici."""
+
+    def __init__(
+        self,
+        failure_threshold: int = DOMAIN_FAILURE_THRESHOLD,
+        backoff_seconds: float = DOMAIN_BACKOFF_SECONDS,
+        max_backoff_seconds: float = DOMAIN_BACKOFF_MAX_SECONDS,
+        probe_timeout_seconds: float = 2 * HTTP_TIMEOUT_SECONDS,
+    ):
+        self.failure_threshold = failure_threshold
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+        self._circuits: Dict[str, _Circuit] = {}
+
+    def allow(self, key: str) -> bool:
+        """İstek gönderilebilirse True döner. Bekleme dolduysa yalnızca tek bir deneme isteğine izin verir."""
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.trips == 0:
+            return True
+        now = time.monotonic()
+        probing = circuit.probe_started is not None and now - circuit.probe_started < self.probe_timeout_seconds
+        if now < circuit.open_until or probing:
+            circuit.rejected += 1
+            return False
+        circuit.probe_started = now
+        return True
+
+    def is_open(self, key: str) -> bool:
+        circuit = self._circuits.get(key)
+        return circuit is not None and time.monotonic() < circuit.open_until
+
+    def retry_in(self, key: str) -> float:
+        """Devrenin yeniden deneme kabul etmesine kalan süre (saniye)."""
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            return 0.0
+        return max(circuit.open_until - time.monotonic(), 0.0)
+
+    def record_success(self, key: str):
+        if self._circuits.pop(key, None) is not None:
+            metrics.DOMAIN_CIRCUIT_OPEN.set(0, domain=key)
+
+    def record_failure(self, key: str, error: str = None):
+        circuit = self._circuits.setdefault(key, _Circuit())
+        circuit.failures += 1
+        circuit.last_error = error
+        now = time.monotonic()
+        if now < circuit.open_until:
+            # Devre açılmadan önce başlamış isteklerin hataları bekleme süresini uzatmaz
+            return
+        # Deneme isteği başarısızsa devre eşiği beklemeden, daha uzun süreyle yeniden açılır
+        if circuit.probe_started is not None or circuit.failures >= self.failure_threshold:
+            circuit.trips += 1
+            backoff = min(self.max_backoff_seconds, self.backoff_seconds * 2 ** (circuit.trips - 1))
+            circuit.open_until = now + backoff
+            circuit.probe_started = None
+            metrics.DOMAIN_CIRCUIT_OPEN.set(1, domain=key)
+
+    def snapshot(self) -> Dict[str, dict]:
+        now = time.monotonic()
+        states = {}
+        for key, circuit in sorted(self._circuits.items()):
+            if circuit.trips == 0:
+                state = "degraded"
+            elif now < circuit.open_until:
+                state = "open"
+            else:
+                state = "half_open"
+            states[key] = {
+                "state": state,
+                "consecutive_failures": circuit.failures,
+                "retry_in_seconds": round(max(circuit.open_until - now, 0.0), 1),
+                "rejected_requests": circuit.rejected,
+                "last_error": circuit.last_error,
+            }
+        return states
+
+domain_breaker = CircuitBreaker()
+
+# --- Besleme başına uyarlanabilir yoklama ---
+
+def poll_interval(items_per_hour: Optional[float]) -> timedelta:
+    """Gözlenen yayın hızına göre bir sonraki yoklamaya kadar beklenecek süre."""
+    if not items_per_hour:
+        minutes = FEED_POLL_MAX_MINUTES
+    else:
+        minutes = FEED_POLL_TARGET_ITEMS / items_per_hour * 60
+    return timedelta(minutes=min(max(minutes, FEED_POLL_MIN_MINUTES), FEED_POLL_MAX_MINUTES))
+
+def circuit_open(state) -> bool:
+    return (state.consecutive_failures or 0) >= FEED_FAILURE_THRESHOLD
+
+def is_due(state, rss_url: str, now: datetime) -> bool:
+    """Kaynağın bu turda yoklanıp yoklanmayacağı. Yeni veya URL'si değişen kaynaklar her zaman yoklanır."""
+    if state is None or state.url != rss_url or state.next_poll_at is None:
+        return True
+    if not FEED_ADAPTIVE_POLLING and not circuit_open(state):
+        return True
+    return state.next_poll_at <= now + _DUE_GRACE
+
+def next_feed_state(state, status: Optional[int], error: Optional[str], published: List[datetime], now: datetime) -> dict:
+    """
+    Bir yoklamanın sonucuna göre `FeedState` üzerinde güncellenecek alanları döndürür.
+    `now`, RSS zaman damgalarıyla karşılaştırıldığı için `clock.utcnow()` olmalıdır.
+    `error` verilmişse (ağ hatası veya 4xx/5xx yanıtı) yoklama başarısız sayılır.
+    """
+    fields = {"last_status": status, "last_fetched_at": now}
+    if error is not None:
+        failures = (state.consecutive_failures or 0) + 1 if state is not None else 1
+        fields.update(consecutive_failures=failures, last_error=error[:500])
+        if failures >= FEED_FAILURE_THRESHOLD:
+            backoff = min(FEED_BACKOFF_MAX_MINUTES, FEED_POLL_MIN_MINUTES * 2 ** (failures - FEED_FAILURE_THRESHOLD))
+            fields["next_poll_at"] = now + timedelta(minutes=backoff)
+        else:
+            fields["next_poll_at"] = None
+        return fields
+
+    # Üstel sönümlü sayaç: her yeni girdi exp(-yaş/τ)/τ katkı yapar, eski tahmin geçen süre kadar söner
+    tau = FEED_RATE_WINDOW_HOURS
+    last_new = state.last_new_item_at if state is not None else None
+    rate = 0.0
+    last_success = (state.last_success_at or state.last_fetched_at) if state is not None else None
+    if state is not None and state.items_per_hour is not None and last_success is not None:
+        elapsed = max((now - last_success).total_seconds() / 3600, 0.0)
+        rate = state.items_per_hour * math.exp(-elapsed / tau)
+    new_items = [published_at for published_at in published if last_new is None or published_at > last_new]
+    for published_at in new_items:
+        age = max((now - published_at).total_seconds() / 3600, 0.0)
+        rate += math.exp(-age / tau) / tau
+    if last_new is None and new_items:
+        # İlk gözlemde besleme yalnızca son girdileri içerir; sayaç görülen zaman aralığına göre ölçeklenir
+        span = max((now - min(new_items)).total_seconds() / 3600, 0.0)
+        rate /= max(1 - math.exp(-span / tau), 1 / tau)
+    if new_items:
+        fields["last_new_item_at"] = max(new_items)
+
+    fields.update(
+        consecutive_failures=0,
+        last_error=None,
+        last_success_at=now,
+        items_per_hour=rate,
+        next_poll_at=now + poll_interval(rate),
+    )
+    return fields
+
+def feed_health(state, rss_url: str, now: datetime) -> dict:
+    """Bir kaynağın ayar yapmak için sunulan durum özeti."""
+    if state is None:
+        return {"url": rss_url, "status": "unknown"}
+    failures = state.consecutive_failures or 0
+    if circuit_open(state):
+        status = "open" if state.next_poll_at and state.next_poll_at > now else "half_open"
+    elif failures:
+        status = "degraded"
+    else:
+        status = "ok"
+    return {
+        "url": rss_url,
+        "domain": domain_of(rss_url),
+        "status": status,
+        "items_per_hour": round(state.items_per_hour, 3) if state.items_per_hour is not None else None,
+        "poll_interval_minutes": round(poll_interval(state.items_per_hour).total_seconds() / 60, 1),
+        "next_poll_at": state.next_poll_at,
+        "last_fetched_at": state.last_fetched_at,
+        "last_success_at": state.last_success_at,
+        "last_new_item_at": state.last_new_item_at,
+        "last_status": state.last_status,
+        "consecutive_failures": failures,
+        "last_error": state.last_error,
+    }
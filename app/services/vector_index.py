@@ -0,0 +1,114 @@
+"""
+Makale embedding'leri üzerinde süreç içi vektör indeksi.
+
+Vektörler tek bir float32 matriste tutulur ve sorgular NumPy ile vektörleştirilmiş
+bir iç çarpım + argpartition ile yanıtlanır. Vektör sayısı `VECTOR_ANN_THRESHOLD`'u
+geçtiğinde ve `hnswlib` kuruluysa yaklaşık en yakın komşu (HNSW) indeksi devreye girer.
+İndeks her aramada yalnızca son yüklemeden bu yana yazılmış vektörleri okur. Yüksek su
+işareti makale ID'si değil vektörün yazılma zamanıdır (`updated_at`): sonradan doldurulan
+(backfill) eski makalelerin vektörleri de yeni damga alır. İşaretten `_REFRESH_OVERLAP`
+kadar geriye bakılır; böylece damgası alınıp daha geç commit edilen satırlar da atlanmaz.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+import numpy as np
+from app.core.clock import utcnow
+from app.core.config import VECTOR_ANN_THRESHOLD
+from app.crud import embedding_crud
+from app.services.embedding_service import from_blob
+
+logger = logging.getLogger(__name__)
+
+try:
+    import hnswlib
+except ImportError:  # opsiyonel bağımlılık
+    hnswlib = None
+
+# Yazılma damgası alınıp commit'i geciken satırlar için işaretten geriye bakılan pay
+_REFRESH_OVERLAP = timedelta(minutes=5)
+
+# Eksik vektörler bu boyutta IN listeleriyle okunur (SQLite'ın parametre limitinin altında)
+_LOAD_CHUNK_SIZE = 500
+
+class VectorIndex:
+    def __init__(self, model: str, ann_threshold: int = VECTOR_ANN_THRESHOLD):
+        self.model = model
+        self.ann_threshold = ann_threshold
+        self._ids = np.empty(0, dtype=np.int64)
+        self._matrix = None
+        self._known = set()
+        self._synced_until: Optional[datetime] = None
+        self._ann = None
+        self._lock = asyncio.Lock()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, article_ids: List[int], vectors: np.ndarray):
+        if not article_ids:
+            return
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(article_ids), -1)
+        ids = np.asarray(article_ids, dtype=np.int64)
+        if self._matrix is None:
+            self._matrix = vectors
+        else:
+            self._matrix = np.vstack([self._matrix, vectors])
+        self._ids = np.concatenate([self._ids, ids])
+        self._known.update(article_ids)
+
+        if self._ann is not None:
+            self._ann.resize_index(len(self._ids))
+            self._ann.add_items(vectors, ids)
+        elif hnswlib is not None and len(self._ids) >= self.ann_threshold:
+            self._build_ann()
+
+    def _build_ann(self):
+        logger.info(f"{len(self._ids)} vektör için HNSW indeksi kuruluyor...")
+        ann = hnswlib.Index(space="ip", dim=self._matrix.shape[1])
+        ann.init_index(max_elements=len(self._ids), ef_construction=200, M=16)
+        ann.add_items(self._matrix, self._ids)
+        ann.set_ef(64)
+        self._ann = ann
+
+    async def refresh(self, db):
+        """Veritabanından henüz indekste olmayan embedding'leri yükler."""
+        async with self._lock:
+            started = utcnow()
+            since = self._synced_until - _REFRESH_OVERLAP if self._synced_until is not None else None
+            stamps = await embedding_crud.aget_embedding_stamps(db, model=self.model, since=since)
+            missing = sorted({article_id for article_id, _ in stamps} - self._known)
+            for i in range(0, len(missing), _LOAD_CHUNK_SIZE):
+                rows = await embedding_crud.aget_embeddings(db, model=self.model, article_ids=missing[i:i + _LOAD_CHUNK_SIZE])
+                if rows:
+                    ids = [row.article_id for row in rows]
+                    vectors = np.stack([from_blob(row.vector) for row in rows])
+                    self.add(ids, vectors)
+            # Hiç satır görülmediyse (boş tablo, damgasız eski satırlar) işaret sorgu anıdır
+            latest = max((updated_at for _, updated_at in stamps if updated_at is not None), default=None)
+            self._synced_until = max(filter(None, (self._synced_until, latest)), default=started)
+
+    def search(self, query_vector: np.ndarray, k: int = 8) -> List[Tuple[int, float]]:
+        """En benzer `k` makalenin (id, skor) çiftlerini azalan skorla döndürür."""
+        if self._matrix is None or not len(self._ids):
+            return []
+        query_vector = np.asarray(query_vector, dtype=np.float32).ravel()
+        k = min(k, len(self._ids))
+
+        if self._ann is not None:
+            labels, distances = self._ann.knn_query(query_vector, k=k)
+            return [(int(i), float(1.0 - d)) for i, d in zip(labels[0], distances[0])]
+
+        scores = self._matrix @ query_vector
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self._ids[i]), float(scores[i])) for i in top]
+
+_indexes = {}
+
+def get_vector_index(model: str) -> VectorIndex:
+    """Embedder modeline ait süreç içi indeksi döndürür."""
+    if model not in _indexes:
+        _indexes[model] = VectorIndex(model)
+    return _indexes[model]
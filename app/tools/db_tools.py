@@ -1,81 +1,193 @@
 import asyncio
+from collections import OrderedDict
 from langchain.tools import tool
-from sqlalchemy.orm import Session
-from app.crud import article_crud
-from app.database.database import get_db
+from app.crud import article_crud, fingerprint_crud
+from app.database.database import AsyncSessionLocal
 from app.database.models import Article  # Article modelini import et
+from app.services import embedding_service, llm_client, metrics, result_cache
+from app.services.vector_index import get_vector_index
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_openai import ChatOpenAI
-from app.core.config import OPENAI_API_KEY
+from app.core.config import SUMMARY_CACHE_SIZE
 import logging
-from datetime import datetime, timedelta
-from typing import List
+from typing import Dict, List
 from langchain.pydantic_v1 import BaseModel, Field
 
 # Logger'ı ayarla
 logger = logging.getLogger(__name__)
 
-def get_llm():
-    """LLM modelini başlatır."""
-    if not OPENAI_API_KEY:
-        raise ValueError("OPENAI_API_KEY ortam değişkeni ayarlanmadı.")
-    return ChatOpenAI(api_key=OPENAI_API_KEY, model="gpt-4o-mini", temperature=0.3)
-
-async def generate_summary_on_the_fly(article_content: str) -> str:
-    """Verilen makale metni için anında bir özet oluşturur."""
-    if not article_content:
-        return "Özet üretmek için yeterli içerik bulunamadı."
-        
-    logger.info("Anlık özet üretiliyor...")
-    llm = get_llm()
+NO_CONTENT_SUMMARY = "Özet üretmek için yeterli içerik bulunamadı."
+SUMMARY_ERROR = "Özet üretilirken bir hata oluştu."
+
+# Sık dönen makalelerin özetleri süreçte kalsın diye küçük bir LRU (article_id -> özet)
+_summary_cache: "OrderedDict[int, str]" = OrderedDict()
+# Aynı makale için eş zamanlı istekler tek bir LLM çağrısını paylaşır (article_id -> görev)
+_inflight_summaries: Dict[int, asyncio.Task] = {}
+_summary_stats = {"hits": 0, "misses": 0, "shared": 0}
+
+def summary_cache_stats() -> Dict[str, float]:
+    """Özet LRU'sunun sayaçlarını ve isabet oranını döndürür (`shared`: süren bir çağrıya katılan istekler)."""
+    lookups = (_summary_stats["hits"] + _summary_stats["misses"]) or 1
+    return {**_summary_stats, "size": len(_summary_cache), "in_flight": len(_inflight_summaries), "hit_rate": _summary_stats["hits"] / lookups}
+
+metrics.register_collector("novaai_summary_cache", "Anlık özet LRU önbelleği.", summary_cache_stats)
+
+def _cache_get_summary(article_id: int):
+    summary = _summary_cache.get(article_id)
+    if summary is not None:
+        _summary_cache.move_to_end(article_id)
+        _summary_stats["hits"] += 1
+    else:
+        _summary_stats["misses"] += 1
+    return summary
+
+def _cache_put_summary(article_id: int, summary: str):
+    _summary_cache[article_id] = summary
+    _summary_cache.move_to_end(article_id)
+    while len(_summary_cache) > SUMMARY_CACHE_SIZE:
+        _summary_cache.popitem(last=False)
+
+@metrics.traced("db_tools.summarize", metrics.SUMMARY_SECONDS)
+async def _summarize(article_content: str) -> str:
+    """LLM ile özet üretir; hata durumunda exception fırlatır."""
+    llm = llm_client.get_llm(model="gpt-4o-mini", temperature=0.3)
     prompt = ChatPromptTemplate.from_template(
         "Aşağıdaki makale metnini analiz et ve yaklaşık 50-75 kelimelik kısa ve öz bir özetini **tamamen Türkçe** olarak yaz.\n\n"
         "--- MAKALe METNİ ---\n{text}"
     )
     chain = prompt | llm | StrOutputParser()
+    summary = await llm_client.ainvoke(chain, {"text": article_content}, lane=llm_client.CHAT_LANE)
+    return summary.strip()
+
+async def _summarize_and_persist(article_id: int, article_content: str, keywords: str) -> str:
+    """Özeti üretir, veritabanına yazar ve LRU'ya ekler."""
+    logger.info(f"Anlık özet üretiliyor (makale: {article_id})...")
+    summary = await _summarize(article_content)
+    _cache_put_summary(article_id, summary)
+    try:
+        async with AsyncSessionLocal() as db:
+            await article_crud.aupdate_article_summary_and_keywords(
+                db, article_id=article_id, summary=summary, keywords=keywords
+            )
+        # Makale listesinin ETag'i eski (boş) özeti taşıyor; sohbet sonuç önbelleği etkilenmez
+        await result_cache.bump_summary_version()
+    except Exception as e:
+        # Kaydetme başarısız olsa da özet kullanıcıya dönebilir
+        logger.error(f"Anlık özet kaydedilemedi (makale: {article_id}): {e}")
+    return summary
+
+async def get_or_create_summary(article: Article) -> str:
+    """
+    Makalenin özetini önce LRU'dan, yoksa tek uçuşlu (single-flight) bir
+    LLM çağrısıyla üretip döndürür.
+    """
+    if not article.content:
+        return NO_CONTENT_SUMMARY
+
+    cached = _cache_get_summary(article.id)
+    if cached is not None:
+        return cached
+
+    task = _inflight_summaries.get(article.id)
+    if task is not None:
+        _summary_stats["shared"] += 1
+    else:
+        task = asyncio.ensure_future(_summarize_and_persist(article.id, article.content, article.keywords))
+        _inflight_summaries[article.id] = task
+        task.add_done_callback(lambda _, article_id=article.id: _inflight_summaries.pop(article_id, None))
+
     try:
-        summary = await chain.ainvoke({"text": article_content})
-        logger.info("Anlık özet başarıyla üretildi.")
-        return summary
+        # shield: bir istek iptal edilirse paylaşılan görev iptal olmasın
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        raise
     except Exception as e:
-        logger.error(f"Anlık özet üretimi sırasında hata: {e}")
-        return "Özet üretilirken bir hata oluştu."
+        logger.error(f"Anlık özet üretimi sırasında hata (makale: {article.id}): {e}")
+        return SUMMARY_ERROR
+
+def needs_summary(article: Article) -> bool:
+    return not article.summary or len(article.summary.strip()) < 20
 
+@metrics.traced("db_tools.enrich_articles_with_summaries")
 async def enrich_articles_with_summaries(articles: List[Article]) -> List[Article]:
     """
     Makale listesini alır, eksik özetleri asenkron olarak üretir
     ve makale nesnelerini güncelleyerek geri döndürür.
+    Üretilen özetler veritabanına kalıcı olarak yazılır.
     """
-    tasks = []
-    articles_to_process = []
-    
-    for article in articles:
-        if not article.summary or len(article.summary.strip()) < 20:
-            articles_to_process.append(article)
-            tasks.append(generate_summary_on_the_fly(article.content))
-
-    if tasks:
-        generated_summaries = await asyncio.gather(*tasks)
-        for i, article in enumerate(articles_to_process):
-            article.summary = generated_summaries[i]
+    articles_to_process = [article for article in articles if needs_summary(article)]
+
+    if articles_to_process:
+        generated_summaries = await asyncio.gather(
+            *(get_or_create_summary(article) for article in articles_to_process)
+        )
+        for article, summary in zip(articles_to_process, generated_summaries):
+            article.summary = summary
             
     return articles
 
+# Yakın kopyalar ayıklandıktan sonra yine 8 haber kalsın diye sorgulanan fazladan pay
+_DUPLICATE_OVERFETCH = 2
+
+async def collapse_duplicates(db, articles: List[Article], limit: int = 8) -> List[Article]:
+    """
+    Aynı haberin farklı kaynaklardaki kopyalarını tek bir sonuca indirger.
+    Her haber grubundan sıralamadaki ilk makale tutulur.
+    """
+    duplicate_map = await fingerprint_crud.aget_duplicate_map(db, [article.id for article in articles])
+    seen = set()
+    collapsed = []
+    for article in articles:
+        canonical_id = duplicate_map.get(article.id, article.id)
+        if canonical_id in seen:
+            continue
+        seen.add(canonical_id)
+        collapsed.append(article)
+        if len(collapsed) >= limit:
+            break
+    return collapsed
+
+async def _with_summary_inputs(db, articles: List[Article]) -> List[Article]:
+    """Liste sorguları `content` sütununu yüklemez; yalnızca özeti üretilecek makaleler için okur."""
+    await article_crud.aload_contents(db, [article for article in articles if needs_summary(article)])
+    return articles
+
+@metrics.traced("db_tools.fetch_recent_news", metrics.TOOL_QUERY_SECONDS, tool="get_recent_news")
+async def fetch_recent_news(days_ago: int) -> List[Article]:
+    """Son `days_ago` gündeki en güncel 8 haberi özetleri zenginleştirmeden döndürür."""
+    async with AsyncSessionLocal() as db:
+        articles = await article_crud.aget_recent_articles(db, days_ago=days_ago, limit=8 * _DUPLICATE_OVERFETCH)
+        return await _with_summary_inputs(db, await collapse_duplicates(db, articles, limit=8))
+
+@metrics.traced("db_tools.fetch_news_by_topic", metrics.TOOL_QUERY_SECONDS, tool="search_news_by_topic")
+async def fetch_news_by_topic(topic: str) -> List[Article]:
+    """Konuyla en ilgili 8 haberi özetleri zenginleştirmeden döndürür."""
+    async with AsyncSessionLocal() as db:
+        articles = await article_crud.asearch_articles_by_topic(db, topic=topic, limit=8 * _DUPLICATE_OVERFETCH)
+        return await _with_summary_inputs(db, await collapse_duplicates(db, articles, limit=8))
+
+@metrics.traced("db_tools.fetch_news_semantic", metrics.TOOL_QUERY_SECONDS, tool="search_news_semantic")
+async def fetch_news_semantic(query: str) -> List[Article]:
+    """Sorguya anlamca en yakın 8 haberi özetleri zenginleştirmeden döndürür."""
+    embedder = embedding_service.get_embedder()
+    index = get_vector_index(embedder.name)
+    query_vector = (await embedder.aembed([query]))[0]
+    async with AsyncSessionLocal() as db:
+        await index.refresh(db)
+        hits = index.search(query_vector, k=8)
+        articles = await article_crud.aget_articles_by_ids(db, [article_id for article_id, _ in hits])
+        return await _with_summary_inputs(db, articles)
+
 class GetRecentNewsInput(BaseModel):
     days_ago: int = Field(description="Number of days to look back for recent news. Should be an integer.")
 
 @tool("get_recent_news", args_schema=GetRecentNewsInput)
 async def get_recent_news(days_ago: int) -> List[Article]:
     """Fetches the top 8 recent news articles from the database based on the number of days ago."""
-    db: Session = next(get_db())
-    try:
-        articles = article_crud.get_recent_articles(db, days_ago=days_ago, limit=8)
-        if not articles:
-            return []
-        return await enrich_articles_with_summaries(articles)
-    finally:
-        db.close()
+    articles = await fetch_recent_news(days_ago)
+    if not articles:
+        return []
+    return await enrich_articles_with_summaries(articles)
 
 class SearchNewsInput(BaseModel):
     topic: str = Field(description="The topic to search for in news articles. e.g., 'GPT-5', 'NVIDIA'")
@@ -83,12 +195,19 @@ class SearchNewsInput(BaseModel):
 @tool("search_news_by_topic", args_schema=SearchNewsInput)
 async def search_news_by_topic(topic: str) -> List[Article]:
     """Searches for the top 8 relevant news articles by a specific topic."""
-    db: Session = next(get_db())
-    try:
-        articles = article_crud.search_articles_by_topic(db, topic=topic, limit=8)
-        if not articles:
-            return []
-        return await enrich_articles_with_summaries(articles)
-    finally:
-        db.close()
+    articles = await fetch_news_by_topic(topic)
+    if not articles:
+        return []
+    return await enrich_articles_with_summaries(articles)
+
+
+class SemanticSearchInput(BaseModel):
+    query: str = Field(description="A natural-language description of the news to find, in any language. e.g., 'büyük dil modelleri', 'AI chip export rules'")
 
+@tool("search_news_semantic", args_schema=SemanticSearchInput)
+async def search_news_semantic(query: str) -> List[Article]:
+    """Finds the top 8 news articles whose meaning is closest to the query, even when they share no exact words (synonyms, translations, paraphrases)."""
+    articles = await fetch_news_semantic(query)
+    if not articles:
+        return []
+    return await enrich_articles_with_summaries(articles)
@@ -0,0 +1,56 @@
+"""
+İki `suite.py` sonucunu karşılaştırır ve temel metriklerdeki değişimi yazdırır.
+
+Kullanım:
+    python benchmarks/compare.py onceki.json sonraki.json
+"""
+import argparse
+import json
+
+# (bölüm yolu, metrik, büyük olan daha mı iyi)
+METRICS = [
+    (("ingest",), "articles_per_second", True),
+    (("ingest",), "seconds", False),
+    (("ingest", "queries"), "total", False),
+    (("ingest",), "peak_rss_mb", False),
+    (("chat", "latency"), "p50_ms", False),
+    (("chat", "latency"), "p95_ms", False),
+    (("chat", "latency"), "p99_ms", False),
+    (("chat",), "requests_per_second", True),
+    (("chat",), "queries_per_request", False),
+    (("chat",), "peak_rss_mb", False),
+    (("fake_llm",), "llm_requests", False),
+    (("fake_llm",), "prompt_tokens", False),
+    (("fake_llm",), "completion_tokens", False),
+]
+
+def _lookup(results: dict, path: tuple, metric: str):
+    for key in path:
+        results = results.get(key) or {}
+    return results.get(metric)
+
+def compare(before: dict, after: dict) -> list:
+    rows = []
+    for path, metric, higher_is_better in METRICS:
+        old, new = _lookup(before, path, metric), _lookup(after, path, metric)
+        if old is None or new is None:
+            continue
+        change = (new - old) / old * 100 if old else 0.0
+        improved = (change > 0) == higher_is_better if change else None
+        rows.append((".".join(path + (metric,)), old, new, change, improved))
+    return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+
+    with open(args.before, encoding="utf-8") as f:
+        before = json.load(f)
+    with open(args.after, encoding="utf-8") as f:
+        after = json.load(f)
+    print(f"{before['meta']['revision']} -> {after['meta']['revision']}")
+    for name, old, new, change, improved in compare(before, after):
+        mark = "" if improved is None else ("  (iyileşme)" if improved else "  (kötüleşme)")
+        print(f"{name:32} {old:>12} {new:>12} {change:+8.1f}%{mark}")
@@ -0,0 +1,236 @@
+"""
+Çevrimdışı ölçümler için yerel fikstür sunucusu.
+
+Tek bir aiohttp uygulaması üç şey sunar:
+
+- `/feeds/{n}.xml`: sentetik RSS beslemeleri (besleme başına `items_per_feed` girdi),
+- `/articles/{n}/{i}.html`: `paragraphs` paragraflık sentetik makale HTML'i,
+- `/v1/chat/completions`: OpenAI uyumlu sahte bir LLM. Araç (tool) tanımı içeren
+  isteklere şemaya uygun argümanlarla araç çağrısı, diğerlerine düz metin döner;
+  gecikme `llm_latency + llm_seconds_per_token * çıktı token'ı` kadardır ve token
+  kullanımı `usage` alanında raporlanır.
+
+Sunucu, ölçülen süreçle CPU paylaşmasın diye ayrı bir süreçte çalışır
+(`FixtureServer`). Sayaçlar `/_stats` uç noktasından okunur.
+"""
+import asyncio
+import json
+import multiprocessing
+import random
+import re
+import socket
+import time
+import urllib.request
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from aiohttp import web
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken yoksa veya kodlama indirilemiyorsa kaba tahmine dön
+    _encoding = None
+
+_SYLLABLES = (
+    "ka ra de ne li mo ta si ve yo zu ba ge hi ko lu ma ni po ru sa te vi ya "
+    "al en is or um ar el in on ur tek bil veri çip ağ yol"
+).split()
+TOPICS = ["nvidia", "openai", "anthropic", "robot", "düzenleme", "çip", "gemini", "llama"]
+
+@dataclass
+class FixtureConfig:
+    feeds: int = 10
+    items_per_feed: int = 30
+    paragraphs: int = 8
+    # Bir makalenin önceki beslemedeki makalenin yakın kopyası olma olasılığı
+    duplicate_ratio: float = 0.1
+    feed_latency: float = 0.05
+    page_latency: float = 0.05
+    llm_latency: float = 0.3
+    llm_seconds_per_token: float = 0.0
+    # Araç seçimi zorunlu değilse (sohbet planlayıcısı) sahte LLM'in seçeceği araç
+    planner_tool: str = "search_news_semantic"
+    seed: int = 42
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(_word(rng) for _ in range(words)).capitalize() + "."
+
+def _article_rng(config: FixtureConfig, feed: int, item: int) -> random.Random:
+    # Yakın kopyalar, bir önceki beslemedeki aynı sıradaki makalenin metnini kullanır
+    duplicate = feed > 0 and random.Random(f"{config.seed}:dup:{feed}:{item}").random() < config.duplicate_ratio
+    return random.Random(f"{config.seed}:{feed - 1 if duplicate else feed}:{item}")
+
+def article_html(config: FixtureConfig, feed: int, item: int) -> str:
+    rng = _article_rng(config, feed, item)
+    topic = rng.choice(TOPICS)
+    title = f"{topic.capitalize()} {sentence(rng, 6)}"
+    paragraphs = "\n".join(f"<p>{sentence(rng, rng.randint(40, 80))}</p>" for _ in range(config.paragraphs))
+    return (
+        "<!DOCTYPE html><html><head>"
+        f"<title>{title}</title><meta name=\"description\" content=\"{topic}\"></head>"
+        "<body><header><nav><a href=\"/\">Ana sayfa</a></nav></header>"
+        f"<article><h1>{title}</h1>\n{paragraphs}\n</article>"
+        "<footer><p>Telif hakkı bench.example</p></footer></body></html>"
+    )
+
+def feed_xml(config: FixtureConfig, base_url: str, feed: int) -> str:
+    now = datetime.now(timezone.utc)
+    items = []
+    for item in range(config.items_per_feed):
+        rng = random.Random(f"{config.seed}:title:{feed}:{item}")
+        items.append(
+            "<item>"
+            f"<title>{rng.choice(TOPICS).capitalize()} {sentence(rng, 8)}</title>"
+            f"<link>{base_url}/articles/{feed}/{item}.html</link>"
+            f"<pubDate>{format_datetime(now - timedelta(minutes=feed * 7 + item * 13))}</pubDate>"
+            "</item>"
+        )
+    return (
+        "<?xml version=\"1.0\" encoding=\"UTF-8\"?><rss version=\"2.0\"><channel>"
+        f"<title>Bench Feed {feed}</title><link>{base_url}</link><description>Sentetik besleme</description>"
+        + "".join(items)
+        + "</channel></rss>"
+    )
+
+def _fake_value(name: str, schema: dict, prompt: str, rng: random.Random):
+    kind = schema.get("type")
+    if kind == "array":
+        return [_fake_value(name, schema.get("items", {}), prompt, rng) for _ in range(5)]
+    if kind == "integer":
+        return 7
+    if kind == "number":
+        return 7.0
+    if kind == "boolean":
+        return True
+    if name == "summary":
+        return sentence(rng, 60)
+    if name in ("keywords", "items"):
+        return rng.choice(TOPICS)
+    # Sorgu/konu gibi alanlar kullanıcının son mesajından türetilir
+    words = re.findall(r"\w+", prompt)
+    return " ".join(words[-6:]) if words else rng.choice(TOPICS)
+
+def _tool_call(body: dict, prompt: str, config: FixtureConfig, rng: random.Random) -> dict:
+    tools = {tool["function"]["name"]: tool["function"] for tool in body["tools"]}
+    choice = body.get("tool_choice")
+    if isinstance(choice, dict):
+        name = choice["function"]["name"]
+    elif config.planner_tool in tools:
+        name = config.planner_tool
+    else:
+        name = next(iter(tools))
+    properties = tools[name].get("parameters", {}).get("properties", {})
+    arguments = {key: _fake_value(key, schema, prompt, rng) for key, schema in properties.items()}
+    return {"id": f"call_{rng.randrange(10 ** 9)}", "type": "function", "function": {"name": name, "arguments": json.dumps(arguments, ensure_ascii=False)}}
+
+def create_app(config: FixtureConfig) -> web.Application:
+    stats = {"feed_requests": 0, "page_requests": 0, "llm_requests": 0, "llm_tool_calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+    rng = random.Random(config.seed)
+
+    async def feed(request: web.Request):
+        stats["feed_requests"] += 1
+        await asyncio.sleep(config.feed_latency)
+        number = int(request.match_info["feed"])
+        if number >= config.feeds:
+            raise web.HTTPNotFound()
+        base_url = f"{request.scheme}://{request.host}"
+        return web.Response(text=feed_xml(config, base_url, number), content_type="application/rss+xml")
+
+    async def article(request: web.Request):
+        stats["page_requests"] += 1
+        await asyncio.sleep(config.page_latency)
+        html = article_html(config, int(request.match_info["feed"]), int(request.match_info["item"]))
+        return web.Response(text=html, content_type="text/html")
+
+    async def chat_completions(request: web.Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        prompt_text = "\n".join(str(message.get("content") or "") for message in messages)
+        last_user = next((str(m.get("content") or "") for m in reversed(messages) if m.get("role") == "user"), "")
+        message = {"role": "assistant", "content": None}
+        if body.get("tools"):
+            message["tool_calls"] = [_tool_call(body, last_user, config, rng)]
+            output_text = message["tool_calls"][0]["function"]["arguments"]
+            finish_reason = "tool_calls"
+            stats["llm_tool_calls"] += 1
+        else:
+            output_text = message["content"] = sentence(rng, 60)
+            finish_reason = "stop"
+        prompt_tokens, completion_tokens = count_tokens(prompt_text), count_tokens(output_text)
+        stats["llm_requests"] += 1
+        stats["prompt_tokens"] += prompt_tokens
+        stats["completion_tokens"] += completion_tokens
+        await asyncio.sleep(config.llm_latency + config.llm_seconds_per_token * completion_tokens)
+        return web.json_response({
+            "id": f"chatcmpl-bench-{stats['llm_requests']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "bench"),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason, "logprobs": None}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+        })
+
+    async def get_stats(request: web.Request):
+        return web.json_response(stats)
+
+    app = web.Application(client_max_size=32 * 1024 * 1024)
+    app.router.add_get("/feeds/{feed}.xml", feed)
+    app.router.add_get("/articles/{feed}/{item}.html", article)
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    app.router.add_get("/_stats", get_stats)
+    return app
+
+def _serve(config: FixtureConfig, port: int):
+    web.run_app(create_app(config), host="127.0.0.1", port=port, print=None, access_log=None)
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+class FixtureServer:
+    """Fikstür sunucusunu ayrı bir süreçte başlatır; `with` bloğu bitince durdurur."""
+
+    def __init__(self, config: FixtureConfig, port: int = None):
+        self.config = config
+        self.port = port or free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self._process = None
+
+    def feed_urls(self) -> dict:
+        return {f"Bench Feed {n}": f"{self.base_url}/feeds/{n}.xml" for n in range(self.config.feeds)}
+
+    def stats(self) -> dict:
+        with urllib.request.urlopen(f"{self.base_url}/_stats") as response:
+            return json.loads(response.read())
+
+    def __enter__(self):
+        self._process = multiprocessing.get_context("spawn").Process(target=_serve, args=(self.config, self.port), daemon=True)
+        self._process.start()
+        deadline = time.monotonic() + 15
+        while True:
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=0.2):
+                    return self
+            except OSError:
+                if time.monotonic() > deadline or not self._process.is_alive():
+                    raise RuntimeError("Fikstür sunucusu başlatılamadı.")
+                time.sleep(0.05)
+
+    def __exit__(self, *exc):
+        self._process.terminate()
+        self._process.join(5)
+
+    def describe(self) -> dict:
+        return asdict(self.config)
@@ -0,0 +1,163 @@
+"""
+Haber kartı liste sorgularının ölçümü: tam satır + indekssiz (önce) ve kart
+sütunları + `publish_date` indeksi (sonra).
+
+Geçici bir SQLite veritabanına sentetik makaleler yazar, her iki durumda
+`son N gün` ve konu (LIKE) sorgularının süresini ve yüklenen ortalama satır
+boyutunu ölçer, sonucu JSON olarak yazdırır.
+
+Kullanım:
+    python benchmarks/list_queries.py --rows 100000 --content-chars 4000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Proje kök dizinini Python yoluna ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.orm import Session, undefer
+from app.crud import article_crud
+from app.database.database import Base
+from app.database.models import Article
+
+_WORDS = (
+    "yapay zeka model veri çip nvidia openai google anthropic meta dil görüntü robot "
+    "araştırma yatırım düzenleme güvenlik açık kaynak eğitim çıkarım bulut donanım"
+).split()
+_TOPICS = ["nvidia", "openai", "robot", "düzenleme", "çip"]
+
+def _sentence(rng: random.Random, chars: int) -> str:
+    words = []
+    length = 0
+    while length < chars:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:chars]
+
+def populate(engine, rows: int, content_chars: int, seed: int = 42):
+    rng = random.Random(seed)
+    now = datetime.now()
+    Base.metadata.create_all(bind=engine, tables=[Article.__table__])
+    batch = []
+    with engine.begin() as conn:
+        for i in range(rows):
+            batch.append({
+                "title": f"{rng.choice(_TOPICS).capitalize()} haberi {i}: {_sentence(rng, 60)}",
+                "url": f"https://bench.example/{i}",
+                "source": rng.choice(["TechCrunch", "The Verge", "VentureBeat", "Wired"]),
+                "publish_date": now - timedelta(minutes=rng.randrange(365 * 24 * 60)),
+                "content": _sentence(rng, content_chars),
+                "summary": _sentence(rng, 400),
+                "keywords": ", ".join(rng.sample(_TOPICS, 2)),
+            })
+            if len(batch) >= 5000:
+                conn.execute(insert(Article), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Article), batch)
+
+def _row_bytes(articles) -> float:
+    """Yüklenen sütun değerlerinin ortalama bayt boyutu."""
+    if not articles:
+        return 0.0
+    total = 0
+    for article in articles:
+        for column in Article.__table__.columns:
+            value = article.__dict__.get(column.key)
+            if isinstance(value, str):
+                total += len(value.encode("utf-8"))
+            elif value is not None:
+                total += 8
+    return total / len(articles)
+
+def _measure(engine, query, repeats: int) -> dict:
+    timings = []
+    articles = []
+    for _ in range(repeats):
+        with Session(engine) as db:
+            started = time.perf_counter()
+            articles = query(db)
+            timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "rows": len(articles),
+        "avg_row_bytes": round(_row_bytes(articles), 1),
+    }
+
+def _full_recent(days_ago: int, limit: int):
+    def query(db):
+        cutoff = datetime.now() - timedelta(days=days_ago)
+        return db.execute(
+            select(Article).options(undefer(Article.content)).where(Article.publish_date >= cutoff).order_by(Article.publish_date.desc()).limit(limit)
+        ).scalars().all()
+    return query
+
+def _full_topic(topic: str, limit: int):
+    def query(db):
+        search = f"%{topic}%"
+        return db.execute(
+            select(Article)
+            .options(undefer(Article.content))
+            .where(Article.title.like(search) | Article.keywords.like(search) | Article.summary.like(search))
+            .order_by(Article.publish_date.desc())
+            .limit(limit)
+        ).scalars().all()
+    return query
+
+def run(rows: int, content_chars: int, repeats: int, limit: int = 16) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        started = time.perf_counter()
+        populate(engine, rows, content_chars)
+        populate_seconds = time.perf_counter() - started
+
+        # "Önce": publish_date indeksi yok, tüm sütunlar yüklenir
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX IF EXISTS ix_articles_publish_date"))
+        before = {
+            "recent_7d": _measure(engine, _full_recent(7, limit), repeats),
+            "topic_like": _measure(engine, _full_topic("nvidia", limit), repeats),
+        }
+
+        # "Sonra": indeks + yalnızca kart sütunları (konu araması burada LIKE yoluna düşer)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_articles_publish_date ON articles (publish_date)"))
+            conn.execute(text("ANALYZE"))
+        after = {
+            "recent_7d": _measure(engine, lambda db: article_crud.get_recent_articles(db, days_ago=7, limit=limit), repeats),
+            "topic_like": _measure(engine, lambda db: article_crud.search_articles_by_topic(db, topic="nvidia", limit=limit), repeats),
+        }
+        engine.dispose()
+
+    return {
+        "rows": rows,
+        "content_chars": content_chars,
+        "repeats": repeats,
+        "populate_seconds": round(populate_seconds, 2),
+        "before": before,
+        "after": after,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--content-chars", type=int, default=4000)
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.content_chars, args.repeats)
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
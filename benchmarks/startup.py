@@ -0,0 +1,103 @@
+"""
+Soğuk başlangıç ölçümü: `app.main` içe aktarım süresinin paket bazında dökümü ve
+lifespan başlangıç aşamalarının süreleri.
+
+İçe aktarım `python -X importtime` ile temiz bir alt süreçte ölçülür; her modülün
+kendi süresi üst düzey paketine (ör. `langchain_core`, `sqlalchemy`) eklenir.
+Ardından ayrı bir alt süreçte uygulamanın lifespan'i geçici bir SQLite
+veritabanıyla çalıştırılır ve `startup_seconds` (şema, sohbet ısınması) okunur.
+
+Kullanım:
+    python benchmarks/startup.py --top 15 --output startup.json
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+_LIFESPAN_SCRIPT = """
+import asyncio, json
+from app import main
+
+async def run():
+    async with main.app.router.lifespan_context(main.app):
+        pass
+
+asyncio.run(run())
+print(json.dumps(main.startup_seconds))
+"""
+
+def _environment(db_path: str) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    env["DATABASE_URL"] = f"sqlite:///{db_path}"
+    env.pop("ASYNC_DATABASE_URL", None)
+    # Isınma istemcileri oluşturur ama ağa çıkmaz; anahtar yalnızca doğrulama için gerekir
+    env.setdefault("OPENAI_API_KEY", "benchmark")
+    env.setdefault("LOG_LEVEL", "WARNING")
+    return env
+
+def import_breakdown(env: dict, module: str = "app.main") -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env, cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    by_package = Counter()
+    app_modules = {}
+    total_us = 0
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = int(match.group(1)), int(match.group(2)), match.group(3), match.group(4)
+        by_package[name.split(".")[0]] += self_us
+        total_us += self_us
+        if name.startswith("app."):
+            app_modules[name] = max(app_modules.get(name, 0), cumulative_us)
+        if name == module and not indent:
+            total_us = cumulative_us
+    return {
+        "total_ms": round(total_us / 1000, 1),
+        "by_package_ms": {name: round(us / 1000, 1) for name, us in by_package.most_common()},
+        "app_modules_cumulative_ms": {name: round(us / 1000, 1) for name, us in sorted(app_modules.items(), key=lambda item: -item[1])},
+    }
+
+def lifespan_timings(env: dict) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-c", _LIFESPAN_SCRIPT],
+        env=env, cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    timings = json.loads(completed.stdout.strip().splitlines()[-1])
+    return {name: round(seconds, 3) for name, seconds in timings.items()}
+
+def run(top: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = _environment(os.path.join(tmp, "startup.db"))
+        imports = import_breakdown(env)
+        imports["by_package_ms"] = dict(list(imports["by_package_ms"].items())[:top])
+        imports["app_modules_cumulative_ms"] = dict(list(imports["app_modules_cumulative_ms"].items())[:top])
+        # İlk çalıştırma şemayı oluşturur; ikincisi mevcut bir veritabanıyla yeniden başlatmayı ölçer
+        first_start = lifespan_timings(env)
+        restart = lifespan_timings(env)
+    return {"imports": imports, "first_start_seconds": first_start, "restart_seconds": restart}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--top", type=int, default=15, help="Dökümde gösterilecek paket/modül sayısı")
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    results = run(args.top)
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
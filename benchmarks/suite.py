@@ -0,0 +1,337 @@
+"""
+Çevrimdışı uçtan uca ölçüm paketi: ingestion hızı ve sohbet gecikmesi.
+
+Canlı beslemeler ve OpenAI yerine yerel fikstür sunucusu kullanılır (bkz.
+`fixtures.py`): sentetik RSS/HTML ve OpenAI uyumlu sahte bir LLM. Uygulama kodu
+değiştirilmeden yalnızca ortam değişkenleriyle bu sunucuya yönlendirilir
+(`OPENAI_API_BASE`, geçici bir SQLite `DATABASE_URL`, `EMBEDDING_BACKEND=hashing`).
+
+Adımlar:
+1. `--corpus` kadar sentetik makale (ve rastgele embedding'ler) veritabanına yazılır.
+2. `ingest`: fikstür beslemelerinden `ingest_news` çalıştırılır; saniyede makale,
+   aşama süreleri, SQL sorgu sayısı ve bellek tepe değeri ölçülür.
+3. `chat`: yönlendirici, konu ve LLM planlı sorgulardan oluşan karışık bir yükle
+   `run_chat_logic` çağrılır; p50/p95/p99 gecikme ve istek başına sorgu sayısı ölçülür.
+
+Sonuçlar JSON olarak yazdırılır (`--output` ile dosyaya); iki çalıştırma
+`compare.py` ile karşılaştırılabilir.
+
+Kullanım:
+    python benchmarks/suite.py --corpus 100000 --output results.json
+    python benchmarks/suite.py --scenarios chat --corpus 1000000 --chat-requests 500
+    LLM_INGESTION_CONCURRENCY=8 python benchmarks/suite.py --llm-latency 1.0
+
+LLM hız sınırları ölçümü domine etmesin diye `LLM_REQUESTS_PER_MINUTE` ve
+`LLM_TOKENS_PER_MINUTE` aksi verilmedikçe çok yüksek tutulur.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+# Proje kök dizinini Python yoluna ekle
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from fixtures import TOPICS, FixtureConfig, FixtureServer, sentence
+
+def _percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+def _latency_summary(seconds: List[float]) -> dict:
+    return {
+        "count": len(seconds),
+        "p50_ms": round(_percentile(seconds, 50) * 1000, 2),
+        "p95_ms": round(_percentile(seconds, 95) * 1000, 2),
+        "p99_ms": round(_percentile(seconds, 99) * 1000, 2),
+        "max_ms": round(max(seconds, default=0) * 1000, 2),
+    }
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return "unknown"
+
+class RssSampler:
+    """Bir aşama boyunca sürecin yerleşik belleğini (RSS) örnekler ve tepe değeri tutar."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+    def _current(self) -> int:
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * self._page_size
+        except OSError:
+            # /proc yoksa (ör. macOS) süreç ömrü boyunca görülen tepe değere dön
+            import resource
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return peak if sys.platform == "darwin" else peak * 1024
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_bytes = max(self.peak_bytes, self._current())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak_bytes = self._current()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, self._current())
+
+    @property
+    def peak_mb(self) -> float:
+        return round(self.peak_bytes / (1024 * 1024), 1)
+
+class QueryCounter:
+    """Senkron ve asenkron motorlarda çalışan SQL ifadelerini türüne göre sayar."""
+
+    def __init__(self, *engines):
+        from sqlalchemy import event
+
+        self.counts = Counter()
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.counts[statement.lstrip().split(None, 1)[0].upper()] += 1
+
+    def snapshot(self) -> Counter:
+        return Counter(self.counts)
+
+    def since(self, snapshot: Counter) -> dict:
+        delta = self.counts - snapshot
+        return {"total": sum(delta.values()), **dict(sorted(delta.items()))}
+
+def _configure_environment(args, server: FixtureServer, db_path: str):
+    """Uygulama modülleri içe aktarılmadan önce çağrılmalıdır; ayarlar içe aktarımda okunur."""
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ["OPENAI_API_KEY"] = "benchmark"
+    os.environ["OPENAI_API_BASE"] = f"{server.base_url}/v1"
+    os.environ["EMBEDDING_BACKEND"] = "hashing"
+    os.environ["RESULT_CACHE_ENABLED"] = "false" if args.no_result_cache else "true"
+    os.environ["RESULT_CACHE_URL"] = ""
+    os.environ["INGESTION_USE_WORK_QUEUE"] = "false"
+    os.environ.setdefault("LLM_REQUESTS_PER_MINUTE", "1000000")
+    os.environ.setdefault("LLM_TOKENS_PER_MINUTE", "1000000000")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+def seed_corpus(engine, embedder_name: str, rows: int, missing_summary_ratio: float, seed: int = 42) -> dict:
+    """`rows` sentetik makale ve her biri için rastgele (normalize) bir embedding yazar."""
+    import numpy as np
+    from sqlalchemy import insert
+    from app.database.models import Article, ArticleEmbedding
+    from app.services.embedding_service import to_blob
+
+    rng = random.Random(seed)
+    vectors = np.random.default_rng(seed)
+    dim = 384
+    now = datetime.now()
+    started = time.perf_counter()
+    chunk = 5000
+    with engine.begin() as conn:
+        for offset in range(0, rows, chunk):
+            size = min(chunk, rows - offset)
+            articles = []
+            for i in range(offset, offset + size):
+                topic = rng.choice(TOPICS)
+                articles.append({
+                    "id": i + 1,
+                    "title": f"{topic.capitalize()} {sentence(rng, 8)}",
+                    "url": f"https://corpus.bench.example/{i}",
+                    "source": f"Bench Corpus {i % 10}",
+                    "publish_date": now - timedelta(minutes=rng.randrange(365 * 24 * 60)),
+                    "content": " ".join(sentence(rng, 50) for _ in range(6)),
+                    "summary": None if rng.random() < missing_summary_ratio else sentence(rng, 60),
+                    "keywords": ", ".join(rng.sample(TOPICS, 3)),
+                })
+            conn.execute(insert(Article), articles)
+            matrix = vectors.standard_normal((size, dim), dtype=np.float32)
+            matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+            conn.execute(insert(ArticleEmbedding), [
+                {"article_id": offset + j + 1, "model": embedder_name, "dim": dim, "vector": to_blob(matrix[j])}
+                for j in range(size)
+            ])
+    return {"rows": rows, "missing_summary_ratio": missing_summary_ratio, "seconds": round(time.perf_counter() - started, 2)}
+
+async def run_ingest(server: FixtureServer, queries: QueryCounter) -> dict:
+    from app.services import ingestion_service
+    from app.services.ingestion_progress import IngestionProgress
+
+    ingestion_service.NEWS_SOURCES.clear()
+    ingestion_service.NEWS_SOURCES.update(server.feed_urls())
+    progress = IngestionProgress()
+    before = queries.snapshot()
+    with RssSampler() as rss:
+        started = time.perf_counter()
+        await ingestion_service.ingest_news(progress)
+        elapsed = time.perf_counter() - started
+    counters = progress.to_dict()["counters"]
+    return {
+        "seconds": round(elapsed, 3),
+        "articles_per_second": round(counters["saved"] / elapsed, 2) if elapsed else 0.0,
+        "progress": progress.to_dict(),
+        "queries": queries.since(before),
+        "peak_rss_mb": rss.peak_mb,
+    }
+
+def chat_workload(requests: int, seed: int = 7) -> List[tuple]:
+    """(tür, sorgu) listesi: yönlendiricinin tanıdığı tarih ve konu sorguları ile LLM planlı serbest sorgular."""
+    rng = random.Random(seed)
+    workload = []
+    for i in range(requests):
+        kind = rng.choices(["recent", "topic", "llm"], weights=[4, 4, 2])[0]
+        if kind == "recent":
+            query = f"son {rng.randint(1, 14)} günün haberleri"
+        elif kind == "topic":
+            query = f"{rng.choice(TOPICS)} haberleri"
+        else:
+            # Plan önbelleğine düşmesin diye her sorgu farklı
+            query = f"{rng.choice(TOPICS)} tarafında {i}. sırada konuşulan yenilikleri anlatır mısın"
+        workload.append((kind, query))
+    return workload
+
+async def run_chat(requests: int, concurrency: int, queries: QueryCounter) -> dict:
+    from app.services import chat_service
+
+    workload = chat_workload(requests)
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    semaphore = asyncio.Semaphore(concurrency)
+    errors = 0
+
+    async def one(index: int, kind: str, query: str):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            response = await chat_service.run_chat_logic(query, user_id=f"bench-{index % 50}")
+            latencies[kind].append(time.perf_counter() - started)
+            if response == chat_service.ERROR_RESPONSE:
+                errors += 1
+
+    before = queries.snapshot()
+    with RssSampler() as rss:
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i, kind, query) for i, (kind, query) in enumerate(workload)))
+        elapsed = time.perf_counter() - started
+    query_counts = queries.since(before)
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(requests / elapsed, 2) if elapsed else 0.0,
+        "latency": _latency_summary(all_latencies),
+        "latency_by_kind": {kind: _latency_summary(values) for kind, values in sorted(latencies.items())},
+        "queries": query_counts,
+        "queries_per_request": round(query_counts["total"] / requests, 2) if requests else 0.0,
+        "peak_rss_mb": rss.peak_mb,
+    }
+
+def run(args) -> dict:
+    config = FixtureConfig(
+        feeds=args.feeds,
+        items_per_feed=args.items_per_feed,
+        paragraphs=args.paragraphs,
+        duplicate_ratio=args.duplicate_ratio,
+        feed_latency=args.feed_latency,
+        page_latency=args.page_latency,
+        llm_latency=args.llm_latency,
+        llm_seconds_per_token=args.llm_seconds_per_token,
+    )
+    scenarios = set(args.scenarios.split(","))
+    with FixtureServer(config) as server, tempfile.TemporaryDirectory() as tmp:
+        _configure_environment(args, server, os.path.join(tmp, "bench.db"))
+
+        from app.database import database
+        from app.database.database import Base
+        from app.database.migrations import upgrade_schema
+        from app.database.search_index import setup_search_index
+        from app.services import embedding_service, extraction
+
+        Base.metadata.create_all(bind=database.engine)
+        upgrade_schema(database.engine)
+        setup_search_index(database.engine)
+        queries = QueryCounter(database.engine, database.async_engine.sync_engine)
+
+        results = {
+            "meta": {
+                "revision": _git_revision(),
+                "started_at": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "args": vars(args),
+                "fixtures": server.describe(),
+            },
+            "corpus": seed_corpus(database.engine, embedding_service.get_embedder().name, args.corpus, args.missing_summary_ratio),
+        }
+
+        async def main():
+            try:
+                if "ingest" in scenarios:
+                    results["ingest"] = await run_ingest(server, queries)
+                if "chat" in scenarios:
+                    results["chat"] = await run_chat(args.chat_requests, args.chat_concurrency, queries)
+            finally:
+                await database.async_engine.dispose()
+
+        try:
+            asyncio.run(main())
+        finally:
+            extraction.shutdown_extraction_pool()
+            database.engine.dispose()
+        results["fake_llm"] = server.stats()
+    return results
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="NovaAI çevrimdışı ingestion ve sohbet ölçümü")
+    parser.add_argument("--scenarios", default="ingest,chat", help="Virgülle ayrılmış: ingest, chat")
+    parser.add_argument("--corpus", type=int, default=1000, help="Önceden yazılacak sentetik makale sayısı (1k-1M)")
+    parser.add_argument("--missing-summary-ratio", type=float, default=0.05, help="Özeti sohbet sırasında üretilecek makale oranı")
+    parser.add_argument("--feeds", type=int, default=10)
+    parser.add_argument("--items-per-feed", type=int, default=30)
+    parser.add_argument("--paragraphs", type=int, default=8, help="Makale HTML'i başına paragraf sayısı")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.1)
+    parser.add_argument("--feed-latency", type=float, default=0.05, help="Besleme yanıt gecikmesi (s)")
+    parser.add_argument("--page-latency", type=float, default=0.05, help="Makale sayfası yanıt gecikmesi (s)")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="Sahte LLM sabit gecikmesi (s)")
+    parser.add_argument("--llm-seconds-per-token", type=float, default=0.0, help="Çıktı token'ı başına ek gecikme (s)")
+    parser.add_argument("--chat-requests", type=int, default=200)
+    parser.add_argument("--chat-concurrency", type=int, default=8)
+    parser.add_argument("--no-result-cache", action="store_true", help="Araç sonuç önbelleğini kapat")
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    return parser
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    results = run(args)
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
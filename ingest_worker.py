@@ -0,0 +1,197 @@
+"""
+Web sürecinden bağımsız çalışan ingestion işçisi.
+
+İşçi, `ingestion_work_items` tablosundan makale başına işleri kiralar (lease),
+`process_and_save_article` ile işler ve sonucu kuyruğa yazar. Farklı makinelerde
+birden fazla işçi aynı kuyruğu paylaşabilir: PostgreSQL'de satırlar
+`FOR UPDATE SKIP LOCKED` ile, SQLite'ta tek ifadelik atomik bir güncellemeyle
+alınır. Çöken bir işçinin işleri kira süresi dolunca başka bir işçiye geçer;
+`WORK_QUEUE_MAX_ATTEMPTS` denemeden sonra başarısız işler (LLM'in boş özet döndürdüğü
+işler dahil) ölü kuyruğa (dead) taşınır. Tamamlanan işler `WORK_QUEUE_DONE_RETENTION_HOURS`
+sonra kuyruktan silinir.
+
+Kullanım:
+    python ingest_worker.py                # kuyruğu sürekli işle
+    python ingest_worker.py --once         # kuyrukta iş kalmayınca çık
+    python ingest_worker.py --enqueue      # beslemeleri çek ve yeni makaleleri kuyruğa ekle
+    python ingest_worker.py --requeue-dead # ölü kuyruktaki işleri yeniden dene
+    python ingest_worker.py --stats        # kuyruk durumlarını yazdır
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import sys
+import time
+from datetime import timedelta
+
+# Proje kök dizinini Python yoluna ekle
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import (
+    WORK_QUEUE_BATCH_SIZE,
+    WORK_QUEUE_DONE_RETENTION_HOURS,
+    WORK_QUEUE_LEASE_SECONDS,
+    WORK_QUEUE_MAX_ATTEMPTS,
+    WORK_QUEUE_POLL_SECONDS,
+    WORK_QUEUE_RETRY_SECONDS,
+)
+from app.crud import work_queue_crud
+from app.database import database
+from app.database.database import engine
+from app.database.migrations import migrate
+from app.services import dedup_service, extraction, ingestion_service, result_cache
+from app.services.article_writer import ArticleWriter
+from app.services.http_fetcher import CircuitOpenError, HttpFetcher
+from app.services.ingestion_progress import IngestionProgress
+
+# Temel log yapılandırması
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', force=True)
+logger = logging.getLogger("ingest_worker")
+
+# Tamamlanan işlerin silinme sıklığı (saniye)
+_PURGE_INTERVAL_SECONDS = 3600
+
+def _run_db(function, *args):
+    """Senkron kuyruk CRUD çağrısını kendi oturumuyla bir iş parçacığında çalıştırır."""
+    def call():
+        with next(database.get_db()) as db:
+            return function(db, *args)
+    return asyncio.to_thread(call)
+
+def _refresh_dedup_state():
+    with next(database.get_db()) as db:
+        dedup_service.refresh_url_filter(db)
+        dedup_service.refresh_fingerprint_index(db)
+
+class IngestionWorker:
+    def __init__(self, worker_id: str, batch_size: int = WORK_QUEUE_BATCH_SIZE, lease_seconds: float = WORK_QUEUE_LEASE_SECONDS):
+        self.worker_id = worker_id
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.progress = IngestionProgress()
+        self._in_flight = set()
+        self._next_purge = 0.0
+
+    async def renew_leases(self):
+        item_ids = list(self._in_flight)
+        renewed = await _run_db(work_queue_crud.renew_leases, self.worker_id, item_ids, self.lease_seconds)
+        if renewed < len(item_ids):
+            logger.warning(f"{len(item_ids) - renewed} işin kirası yenilenemedi; başka bir işçiye geçmiş olabilir.")
+
+    async def _heartbeat(self):
+        # Uzun süren işlerin kirası dolup başka bir işçiye geçmesin. Tek bir yenileme hatası
+        # (ör. veritabanı kesintisi) döngüyü sonlandırmaz; kira dolmadan bir sonraki turda yeniden denenir.
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self.renew_leases()
+            except Exception as e:
+                logger.error(f"Kira yenilenemedi, yeniden denenecek: {e}", exc_info=True)
+
+    async def _purge_done(self):
+        if time.monotonic() < self._next_purge:
+            return
+        self._next_purge = time.monotonic() + _PURGE_INTERVAL_SECONDS
+        purged = await _run_db(work_queue_crud.purge_done_items, timedelta(hours=WORK_QUEUE_DONE_RETENTION_HOURS))
+        if purged:
+            logger.info(f"{purged} tamamlanmış iş kuyruktan silindi.")
+
+    async def _process_item(self, item, writer: ArticleWriter, fetcher: HttpFetcher):
+        item_id, url, payload, attempts = item
+        self._in_flight.add(item_id)
+        try:
+            article_data = work_queue_crud.work_item_article_data(url, payload)
+            article_id = await ingestion_service.process_and_save_article(
+                article_data, writer=writer, fetcher=fetcher, progress=self.progress, raise_errors=True
+            )
+        except CircuitOpenError as e:
+            # Yayıncı geçici olarak engelli; deneme hakkı harcanmadan devre yeniden denenene kadar ertele
+            await _run_db(work_queue_crud.defer_work_item, item_id, self.worker_id, max(e.retry_in_seconds, 1.0))
+            logger.info(f"İş ertelendi ({url}): {e}")
+            return None
+        except Exception as e:
+            status = await _run_db(
+                work_queue_crud.fail_work_item, item_id, self.worker_id, attempts,
+                f"{type(e).__name__}: {e}", WORK_QUEUE_MAX_ATTEMPTS, WORK_QUEUE_RETRY_SECONDS,
+            )
+            logger.warning(f"İş başarısız ({url}, deneme {attempts}): {e} -> {status}")
+            return None
+        finally:
+            self._in_flight.discard(item_id)
+        if not await _run_db(work_queue_crud.complete_work_item, item_id, self.worker_id):
+            logger.warning(f"İşin kirası başka bir işçiye geçmiş, sonuç yine de kaydedildi: {url}")
+        return article_id
+
+    async def run_batch(self, writer: ArticleWriter, fetcher: HttpFetcher) -> int:
+        """Bir parti iş kiralar ve işler; kiralanan iş sayısını döndürür."""
+        dead = await _run_db(work_queue_crud.dead_letter_expired, WORK_QUEUE_MAX_ATTEMPTS)
+        if dead:
+            logger.warning(f"{dead} iş deneme hakkı bittiği için ölü kuyruğa taşındı.")
+        await self._purge_done()
+        items = await _run_db(work_queue_crud.claim_work_items, self.worker_id, self.batch_size, self.lease_seconds)
+        if not items:
+            return 0
+        logger.info(f"{len(items)} iş kiralandı.")
+        # Başka işçilerin kaydettiği makaleler de yakın kopya indeksine girsin
+        await asyncio.to_thread(_refresh_dedup_state)
+        results = await asyncio.gather(*(self._process_item(item, writer, fetcher) for item in items))
+        if any(article_id is not None for article_id in results):
+            await result_cache.bump_generation()
+        return len(items)
+
+    async def run(self, once: bool = False):
+        logger.info(f"İşçi başladı: {self.worker_id}")
+        heartbeat = asyncio.create_task(self._heartbeat())
+        try:
+            async with ArticleWriter() as writer, HttpFetcher() as fetcher:
+                while True:
+                    claimed = await self.run_batch(writer, fetcher)
+                    if claimed:
+                        continue
+                    if once:
+                        break
+                    await asyncio.sleep(WORK_QUEUE_POLL_SECONDS)
+        finally:
+            heartbeat.cancel()
+            logger.info(f"İşçi durdu: {self.worker_id} {self.progress.counters}")
+
+async def enqueue():
+    progress = IngestionProgress()
+    articles = await ingestion_service.collect_new_articles(progress)
+    queued = await _run_db(work_queue_crud.enqueue_work_items, articles)
+    logger.info(f"{queued} yeni makale kuyruğa eklendi.")
+
+def main():
+    parser = argparse.ArgumentParser(description="NovaAI ingestion işçisi")
+    parser.add_argument("--once", action="store_true", help="Kuyrukta alınabilir iş kalmayınca çık")
+    parser.add_argument("--enqueue", action="store_true", help="Beslemeleri çek ve yeni makaleleri kuyruğa ekle")
+    parser.add_argument("--requeue-dead", action="store_true", help="Ölü kuyruktaki işleri yeniden beklemeye al")
+    parser.add_argument("--stats", action="store_true", help="Kuyruktaki işlerin durum dağılımını yazdır")
+    parser.add_argument("--worker-id", default=f"{socket.gethostname()}:{os.getpid()}")
+    args = parser.parse_args()
+
+    migrate(engine)
+
+    if args.stats:
+        with next(database.get_db()) as db:
+            print(work_queue_crud.count_by_status(db))
+        return
+    if args.requeue_dead:
+        with next(database.get_db()) as db:
+            logger.info(f"{work_queue_crud.requeue_dead_items(db)} iş yeniden kuyruğa alındı.")
+        return
+
+    try:
+        if args.enqueue:
+            asyncio.run(enqueue())
+        else:
+            asyncio.run(IngestionWorker(args.worker_id).run(once=args.once))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        extraction.shutdown_extraction_pool()
+
+if __name__ == "__main__":
+    main()
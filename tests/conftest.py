@@ -0,0 +1,36 @@
+"""
+Testler geçici bir SQLite veritabanı ve çevrimdışı ayarlarla çalışır. Uygulama
+modülleri ayarları içe aktarılırken okuduğu için ortam değişkenleri burada,
+herhangi bir `app` içe aktarımından önce ayarlanır.
+"""
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="novaai-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'test.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["OPENAI_API_KEY"] = "test"
+os.environ["EMBEDDING_BACKEND"] = "hashing"
+os.environ["EXTRACTION_WORKERS"] = "0"
+os.environ["ARTICLE_WRITER_FLUSH_SECONDS"] = "0.05"
+os.environ["RESULT_CACHE_URL"] = ""
+os.environ["LLM_PREWARM"] = "false"
+
+import pytest
+from sqlalchemy import text
+from app.database import database
+from app.database.database import Base
+from app.database.migrations import migrate
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    migrate(database.engine)
+    yield
+    database.engine.dispose()
+
+@pytest.fixture(autouse=True)
+def clean_tables(schema):
+    yield
+    with database.engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(text(f"DELETE FROM {table.name}"))
@@ -0,0 +1,58 @@
+import asyncio
+from sqlalchemy import func, select
+from app.crud import article_crud
+from app.database import database, models, schemas
+from app.services import article_writer
+from app.services.article_writer import ArticleWriter
+
+def _article(i):
+    return schemas.ArticleCreate(title=f"Başlık {i}", url=f"https://example.com/{i}", source="Test", content="metin")
+
+def _article_count():
+    with database.SessionLocal() as db:
+        return db.execute(select(func.count()).select_from(models.Article)).scalar()
+
+async def _submit_all(writer, articles):
+    async with writer:
+        return await asyncio.gather(*(writer.submit(article) for article in articles), return_exceptions=True)
+
+def test_batch_write_returns_ids_and_none_for_existing_urls():
+    asyncio.run(_submit_all(ArticleWriter(flush_seconds=0.05), [_article(1)]))
+    results = asyncio.run(_submit_all(ArticleWriter(flush_seconds=0.05), [_article(1), _article(2), _article(3)]))
+
+    assert results[0] is None
+    assert all(isinstance(article_id, int) for article_id in results[1:])
+    assert _article_count() == 3
+
+def test_failed_batch_falls_back_to_single_writes(monkeypatch):
+    write_batch = article_writer._write_batch
+    batch_sizes = []
+
+    def flaky_write_batch(items):
+        batch_sizes.append(len(items))
+        # Toplu yazma başarısız olur; tek tek yazmada yalnızca "2" numaralı makale hatalıdır
+        if len(items) > 1 or items[0][0].url.endswith("/2"):
+            raise RuntimeError("yazma hatası")
+        return write_batch(items)
+
+    monkeypatch.setattr(article_writer, "_write_batch", flaky_write_batch)
+    results = asyncio.run(_submit_all(ArticleWriter(flush_seconds=0.2), [_article(i) for i in range(1, 4)]))
+
+    assert batch_sizes[0] == 3 and batch_sizes[1:] == [1, 1, 1]
+    assert isinstance(results[0], int) and isinstance(results[2], int)
+    assert isinstance(results[1], RuntimeError)
+    assert _article_count() == 2
+
+def test_portable_insert_skips_existing_urls(monkeypatch):
+    asyncio.run(_submit_all(ArticleWriter(flush_seconds=0.05), [_article(1)]))
+    # ON CONFLICT desteklemeyen bir veritabanı gibi davran
+    monkeypatch.setattr(article_crud, "_conflict_ignoring_insert", lambda db: None)
+
+    with database.SessionLocal() as db:
+        inserted = article_crud.insert_articles_ignore_conflicts(db, [_article(1), _article(2), _article(3)])
+        db.commit()
+
+    assert sorted(inserted) == ["https://example.com/2", "https://example.com/3"]
+    assert _article_count() == 3
+    with database.SessionLocal() as db:
+        assert article_crud.get_article(db, inserted["https://example.com/2"]).content == "metin"
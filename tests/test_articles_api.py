@@ -0,0 +1,72 @@
+import asyncio
+from datetime import datetime
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.endpoints import articles
+from app.database import database, models
+from app.services import result_cache
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(articles.router, prefix="/api/v1")
+    with TestClient(app) as test_client:
+        yield test_client
+
+def _add_articles(*rows):
+    with database.SessionLocal() as db:
+        for article_id, publish_date in rows:
+            db.add(models.Article(
+                id=article_id, title=f"Başlık {article_id}", url=f"https://example.com/{article_id}",
+                source="Test", publish_date=publish_date,
+            ))
+        db.commit()
+
+def test_cursor_pages_cover_all_articles_once(client):
+    same_day = datetime(2024, 5, 2, 9, 0)
+    _add_articles((1, datetime(2024, 5, 1)), (2, same_day), (3, same_day), (4, same_day), (5, datetime(2024, 5, 3)))
+
+    ids, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/v1/articles", params=params).json()
+        ids.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    # Aynı yayın tarihli makaleler ID'ye göre sıralanır; sayfa sınırında tekrar veya atlama olmaz
+    assert ids == [5, 4, 3, 2, 1]
+    assert client.get("/api/v1/articles", params={"cursor": "bozuk"}).status_code == 400
+
+def test_aware_date_filters_are_compared_in_utc(client):
+    _add_articles((1, datetime(2024, 5, 1, 10, 0)), (2, datetime(2024, 5, 1, 12, 0)))
+
+    def ids(**params):
+        return [item["id"] for item in client.get("/api/v1/articles", params=params).json()["items"]]
+
+    # 12:00+02:00 = 10:00 UTC
+    assert ids(since="2024-05-01T12:00:00+02:00") == [2, 1]
+    assert ids(since="2024-05-01T12:00:00+01:00") == [2]
+    assert ids(until="2024-05-01T13:00:00+01:00") == [1]
+    assert ids(since="2024-05-01T11:00:00") == [2]
+
+def test_etag_answers_304_until_content_changes(client):
+    _add_articles((1, datetime(2024, 5, 1)))
+
+    first = client.get("/api/v1/articles")
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+
+    repeated = client.get("/api/v1/articles", headers={"If-None-Match": etag})
+    assert repeated.status_code == 304
+    assert repeated.headers["etag"] == etag
+
+    # Farklı sorgu parametreleri farklı etiket alır
+    assert client.get("/api/v1/articles", params={"limit": 5}).headers["etag"] != etag
+
+    asyncio.run(result_cache.bump_generation())
+    changed = client.get("/api/v1/articles", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
@@ -0,0 +1,49 @@
+import asyncio
+from datetime import datetime
+from app.database.models import Article
+from app.services import chat_service
+from app.tools import db_tools
+
+def _article(i, summary=None):
+    return Article(id=i, title=f"Başlık {i}", url=f"https://example.com/{i}", source="Test", publish_date=datetime(2024, 1, 1), summary=summary)
+
+def test_closing_stream_cancels_pending_summaries(monkeypatch):
+    started, cancelled = [], []
+
+    async def plan_query(query, user_id):
+        return "get_recent_news", {"days_ago": 1}
+
+    async def get_result(tool_name, tool_args):
+        return None, None
+
+    async def fetch_plan_articles(tool_name, tool_args):
+        ready = _article(1, summary="Bu makalenin özeti zaten hazır durumda.")
+        return "Son haberler:", [ready, _article(2), _article(3)]
+
+    async def slow_summary(article):
+        started.append(article.id)
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(article.id)
+            raise
+
+    monkeypatch.setattr(chat_service, "plan_query", plan_query)
+    monkeypatch.setattr(chat_service.result_cache, "get_result", get_result)
+    monkeypatch.setattr(chat_service, "fetch_plan_articles", fetch_plan_articles)
+    monkeypatch.setattr(db_tools, "get_or_create_summary", slow_summary)
+
+    async def consume_until_first_card():
+        stream = chat_service.stream_chat_logic("son haberler", "kullanıcı")
+        events = [await stream.__anext__(), await stream.__anext__()]
+        # Özet görevleri hazır kartlar gönderilirken başlamış olmalı
+        await asyncio.sleep(0)
+        # İstemci bağlantıyı kapatır
+        await stream.aclose()
+        return events
+
+    events = asyncio.run(consume_until_first_card())
+
+    assert [event for event, _ in events] == ["intro", "article"]
+    assert sorted(started) == [2, 3]
+    assert sorted(cancelled) == [2, 3]
@@ -0,0 +1,67 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from app.database import compression, database, models
+from app.database.migrations import compress_legacy_content, migrate
+
+TEXT = "Yapay zeka şirketi yeni dil modelini tanıttı; modelin kodlama başarısı arttı. " * 50
+
+@pytest.mark.parametrize("codec", [compression.ZLIB, compression.ZSTD])
+def test_round_trip(codec):
+    if codec == compression.ZSTD:
+        pytest.importorskip("zstandard")
+    blob = compression.compress(TEXT, codec)
+
+    assert blob[0] == codec
+    assert len(blob) < len(TEXT.encode("utf-8"))
+    assert compression.decompress(blob) == TEXT
+
+def test_short_and_incompressible_text_is_stored_raw():
+    short = "kısa metin"
+    assert compression.compress(short, compression.ZLIB) == bytes([compression.RAW]) + short.encode("utf-8")
+    assert compression.decompress(compression.compress(short, compression.ZLIB)) == short
+
+    noise = bytes(range(256)).hex()
+    assert compression.compress(noise, compression.RAW)[0] == compression.RAW
+    with pytest.raises(ValueError):
+        compression.decompress(b"\x7fveri")
+
+def test_article_content_column_round_trip():
+    with database.SessionLocal() as db:
+        db.add(models.Article(id=1, title="Başlık", url="https://example.com/1", source="Test", content=TEXT))
+        db.commit()
+
+    with database.engine.connect() as conn:
+        stored = conn.execute(text("SELECT content_compressed FROM articles WHERE id = 1")).scalar()
+    with database.SessionLocal() as db:
+        assert db.get(models.Article, 1).content == TEXT
+    assert stored[0] == compression.CODEC and len(stored) < len(TEXT.encode("utf-8"))
+
+def test_migration_compresses_legacy_plain_text_rows(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    # İçeriğin düz metin sütununda tutulduğu eski şema
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE articles (id INTEGER PRIMARY KEY, title VARCHAR, url VARCHAR UNIQUE, source VARCHAR, "
+            "publish_date DATETIME, content TEXT, summary TEXT, keywords VARCHAR)"
+        ))
+        conn.execute(
+            text("INSERT INTO articles (id, title, url, source, content) VALUES (:id, 'Başlık', :url, 'Test', :content)"),
+            [
+                {"id": 1, "url": "https://example.com/1", "content": TEXT},
+                {"id": 2, "url": "https://example.com/2", "content": "kısa içerik"},
+                {"id": 3, "url": "https://example.com/3", "content": None},
+            ],
+        )
+
+    try:
+        migrate(engine)
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM articles WHERE content IS NOT NULL")).scalar() == 0
+        with Session(engine) as db:
+            contents = {article.id: article.content for article in db.query(models.Article)}
+        assert contents == {1: TEXT, 2: "kısa içerik", 3: None}
+        # Taşınmış satırlar yeniden işlenmez
+        assert compress_legacy_content(engine)["rows"] == 0
+    finally:
+        engine.dispose()
@@ -0,0 +1,82 @@
+from app.crud import article_crud
+from app.database import database, models
+from app.services import dedup_service
+from app.services.dedup_service import UrlBloomFilter, normalize_url
+
+def test_normalize_url_strips_tracking_parameters():
+    assert normalize_url("https://example.com/haber?utm_source=x&id=5&fbclid=abc&UTM_Medium=y") == "https://example.com/haber?id=5"
+    assert normalize_url("https://example.com/haber?gclid=1&mkt_tok=2") == "https://example.com/haber"
+
+def test_normalize_url_drops_default_ports_and_fragments():
+    assert normalize_url("HTTPS://Example.com:443/Haber#yorumlar") == "https://example.com/Haber"
+    assert normalize_url("http://example.com:80/haber") == "http://example.com/haber"
+    # Varsayılan olmayan port korunur
+    assert normalize_url("https://example.com:8443/haber") == "https://example.com:8443/haber"
+    assert normalize_url("http://example.com:443/haber") == "http://example.com:443/haber"
+
+def test_normalize_url_trims_trailing_slashes_except_root():
+    assert normalize_url("https://example.com/haber/") == "https://example.com/haber"
+    assert normalize_url("https://example.com") == "https://example.com/"
+    assert normalize_url("https://example.com/") == "https://example.com/"
+
+def test_normalize_url_sorts_query_parameters():
+    assert normalize_url("https://example.com/ara?b=2&a=1&a=0") == normalize_url("https://example.com/ara?a=0&a=1&b=2")
+    assert normalize_url("https://example.com/ara?b=2&a=1") == "https://example.com/ara?a=1&b=2"
+    # Boş değerli parametreler kimliğin parçasıdır
+    assert normalize_url("https://example.com/ara?q=") == "https://example.com/ara?q="
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = UrlBloomFilter(expected_items=1000, false_positive_rate=0.01)
+    seen = [f"https://example.com/haber/{i}" for i in range(1000)]
+    for url in seen:
+        bloom.add(url)
+
+    assert all(url in bloom for url in seen)
+    false_positives = sum(f"https://example.com/diger/{i}" in bloom for i in range(10000))
+    # Hedef oran %1; küçük sapmalara pay bırak
+    assert false_positives < 300
+    assert bloom.count == 1000
+
+def _add_article(article_id, url):
+    with database.SessionLocal() as db:
+        db.add(models.Article(id=article_id, title=f"Başlık {article_id}", url=url, source="Test"))
+        db.commit()
+
+def test_filter_new_urls_confirms_only_possible_matches_in_db(monkeypatch):
+    monkeypatch.setattr(dedup_service, "_url_filter", UrlBloomFilter(1000, 0.001))
+    _add_article(1, "https://example.com/1")
+    # Normalizasyondan önce ham haliyle kaydedilmiş eski satır
+    _add_article(2, "https://example.com/2/?utm_source=rss")
+    with database.SessionLocal() as db:
+        dedup_service.refresh_url_filter(db)
+
+    queried = []
+    get_existing_urls = article_crud.get_existing_urls
+
+    def spy(db, urls):
+        queried.append(set(urls))
+        return get_existing_urls(db, urls)
+
+    monkeypatch.setattr(article_crud, "get_existing_urls", spy)
+    raw_urls = ["https://example.com/1", "https://example.com/2/?utm_source=rss", "https://example.com/3"]
+    urls = {normalize_url(url): url for url in raw_urls}
+
+    with database.SessionLocal() as db:
+        assert dedup_service.filter_new_urls(db, urls) == {"https://example.com/3"}
+        # Filtrenin kesin "yeni" dediği URL veritabanına sorulmaz
+        assert not any("https://example.com/3" in batch for batch in queried)
+
+        queried.clear()
+        dedup_service.remember_url("https://example.com/3")
+        assert dedup_service.filter_new_urls(db, {"https://example.com/3": "https://example.com/3"}) == {"https://example.com/3"}
+        # Filtrede olan ama veritabanında olmayan URL (ör. kaydı başarısız olan) DB'de doğrulanır
+        assert queried == [{"https://example.com/3"}]
+
+def test_filter_new_urls_without_bloom_filter_checks_everything(monkeypatch):
+    monkeypatch.setattr(dedup_service, "_url_filter", None)
+    _add_article(1, "https://example.com/1")
+
+    with database.SessionLocal() as db:
+        new = dedup_service.filter_new_urls(db, {normalize_url(url): url for url in ("https://example.com/1/", "https://example.com/4")})
+
+    assert new == {"https://example.com/4"}
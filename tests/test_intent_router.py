@@ -0,0 +1,22 @@
+from langchain_core.messages import AIMessage, HumanMessage
+from app.services import chat_service, intent_router
+
+def test_news_qualifiers_are_not_routed_as_topics():
+    for query in ("breaking news", "fake news", "world news", "dünya haberleri", "sahte haberleri"):
+        assert intent_router.route(query) is None, query
+
+    assert intent_router.route("NVIDIA news") == ("search_news_by_topic", {"topic": "NVIDIA"})
+    assert intent_router.route("world cup news") == ("search_news_by_topic", {"topic": "world cup"})
+
+def test_plan_cache_is_keyed_by_history():
+    query = "bununla ilgili daha fazlası"
+    history = [HumanMessage(content="NVIDIA haberleri"), AIMessage(content="NVIDIA ile ilgili haberler:")]
+    context = chat_service.history_digest(history)
+    plan = ("search_news_by_topic", {"topic": "NVIDIA"})
+
+    intent_router.cache_plan(query, plan, context)
+
+    assert chat_service.history_digest([]) == ""
+    assert intent_router.get_cached_plan(query, context) == plan
+    assert intent_router.get_cached_plan(query) is None
+    assert intent_router.get_cached_plan(query, chat_service.history_digest(history[:1])) is None
@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from sqlalchemy import select
+from app.database import database, models
+from app.services import dedup_service, extraction, ingestion_service
+from app.services.article_writer import ArticleWriter
+
+BASE_TEXT = " ".join(
+    f"Yapay zeka şirketi yeni dil modelini {i}. kez tanıttı ve modelin kodlama başarısı ölçümlerde belirgin biçimde arttı."
+    for i in range(40)
+)
+TEXTS = {
+    "https://a.example/haber": BASE_TEXT,
+    "https://b.example/haber": BASE_TEXT + " Kaynak: B ajansı.",
+    "https://c.example/haber": BASE_TEXT + " Kaynak: C ajansı.",
+}
+
+class FakeFetcher:
+    async def fetch(self, url):
+        return url.encode(), "utf-8"
+
+class FailingWriter(ArticleWriter):
+    """Belirli bir URL'nin kaydını başarısız kılar."""
+
+    def __init__(self, failing_url, **kwargs):
+        super().__init__(**kwargs)
+        self.failing_url = failing_url
+
+    async def submit(self, article, embedding=None, fingerprint=None):
+        if article.url == self.failing_url:
+            raise RuntimeError("yazma hatası")
+        return await super().submit(article, embedding, fingerprint)
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    calls = []
+
+    async def fake_extract(html):
+        return TEXTS[html.decode()]
+
+    async def fake_llm(content):
+        calls.append(content)
+        await asyncio.sleep(0.05)
+        return "Yapay zeka şirketi yeni dil modelini tanıttı ve kodlama başarısı arttı.", "yapay zeka, dil modeli"
+
+    monkeypatch.setattr(extraction, "extract_text", fake_extract)
+    monkeypatch.setattr(ingestion_service, "process_content_with_llm", fake_llm)
+    monkeypatch.setattr(dedup_service, "fingerprint_index", dedup_service.FingerprintIndex())
+    return calls
+
+def _article_data(url):
+    return {"url": url, "title": f"Başlık {url}", "source": url.split("/")[2], "publish_date": None}
+
+async def _ingest(writer):
+    fetcher = FakeFetcher()
+    async with writer:
+        return await asyncio.gather(*(
+            ingestion_service.process_and_save_article(_article_data(url), writer=writer, fetcher=fetcher)
+            for url in TEXTS
+        ))
+
+def _stored():
+    with database.SessionLocal() as db:
+        articles = {a.url: a.id for a in db.execute(select(models.Article)).scalars()}
+        fingerprints = {f.article_id: f.duplicate_of_id for f in db.execute(select(models.ArticleFingerprint)).scalars()}
+        embedded = set(db.execute(select(models.ArticleEmbedding.article_id)).scalars())
+    return articles, fingerprints, embedded
+
+def test_same_cycle_duplicates_are_linked_to_original(llm_calls):
+    asyncio.run(_ingest(ArticleWriter(flush_seconds=0.05)))
+
+    articles, fingerprints, embedded = _stored()
+    assert len(llm_calls) == 1
+    assert len(articles) == 3
+    originals = [article_id for article_id, duplicate_of_id in fingerprints.items() if duplicate_of_id is None]
+    assert len(originals) == 1
+    original_id = originals[0]
+    assert sorted(fingerprints.values(), key=str) == sorted([None, original_id, original_id], key=str)
+    # Kopyalar özgünle aynı içeriği taşır; yalnızca özgün makale gömülür
+    assert embedded == {original_id}
+
+def test_duplicates_become_originals_when_original_fails_to_save(llm_calls):
+    asyncio.run(_ingest(FailingWriter("https://a.example/haber", flush_seconds=0.05)))
+
+    articles, fingerprints, embedded = _stored()
+    assert "https://a.example/haber" not in articles
+    assert len(articles) == 2
+    assert all(duplicate_of_id is None for duplicate_of_id in fingerprints.values())
+    assert embedded == set(articles.values())
+
+def test_refresh_does_not_re_add_articles_indexed_in_process(llm_calls):
+    asyncio.run(_ingest(ArticleWriter(flush_seconds=0.05)))
+    size = len(dedup_service.fingerprint_index)
+
+    with database.SessionLocal() as db:
+        dedup_service.refresh_fingerprint_index(db)
+
+    assert len(dedup_service.fingerprint_index) == size == 1
@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import asyncpg
+from app.crud import article_crud
+from app.database import database, models, search_index
+
+def _add_article(article_id, title, keywords=""):
+    with database.SessionLocal() as db:
+        db.add(models.Article(id=article_id, title=title, keywords=keywords, url=f"https://example.com/{article_id}", source="Test"))
+        db.commit()
+
+def _postgres_sql(sql):
+    # asyncpg lehçesi bağlama parametrelerini PostgreSQL'in kendi sözdizimine ($1) derler
+    return str(text(sql).compile(dialect=asyncpg.dialect()))
+
+def test_postgres_search_sql_parses():
+    pglast = pytest.importorskip("pglast")
+    columns = [column.key for column in article_crud.CARD_COLUMNS]
+
+    pglast.parse_sql(_postgres_sql(search_index.fts_search_sql("postgresql", columns)))
+    pglast.parse_sql(_postgres_sql(f"SELECT id FROM articles WHERE {search_index.fts_filter_sql('postgresql')}"))
+
+def test_all_topic_terms_must_match():
+    _add_article(1, "NVIDIA yeni çiplerini tanıttı", "nvidia, çip")
+    _add_article(2, "NVIDIA hisseleri yükseldi", "nvidia, borsa")
+    _add_article(3, "Intel yeni çip fabrikası açıyor", "intel, çip")
+
+    with database.SessionLocal() as db:
+        found = article_crud.search_articles_by_topic(db, "NVIDIA çipleri")
+
+    assert search_index.is_available("sqlite")
+    assert search_index.build_fts5_query("NVIDIA çipleri").count(" AND ") == 1
+    assert [article.id for article in found] == [1]
@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta
+import pytest
+from app.core.config import FEED_BACKOFF_MAX_MINUTES, FEED_FAILURE_THRESHOLD, FEED_POLL_MAX_MINUTES, FEED_POLL_MIN_MINUTES
+from app.database import models
+from app.services import source_health
+from app.services.source_health import CircuitBreaker
+
+NOW = datetime(2024, 5, 1, 12, 0)
+RSS_URL = "https://example.com/rss"
+
+def _state(**fields):
+    return models.FeedState(url=RSS_URL, **fields)
+
+def _minutes_until_next_poll(fields):
+    return (fields["next_poll_at"] - NOW).total_seconds() / 60
+
+def test_feed_without_items_is_polled_at_the_slowest_rate():
+    fields = source_health.next_feed_state(None, 200, None, [], NOW)
+
+    assert fields["items_per_hour"] == 0
+    assert _minutes_until_next_poll(fields) == FEED_POLL_MAX_MINUTES
+
+def test_busy_feed_is_polled_at_the_fastest_rate():
+    published = [NOW - timedelta(minutes=i) for i in range(60)]
+    fields = source_health.next_feed_state(None, 200, None, published, NOW)
+
+    assert fields["last_new_item_at"] == NOW
+    assert _minutes_until_next_poll(fields) == FEED_POLL_MIN_MINUTES
+
+def test_rate_estimate_decays_and_counts_only_new_items():
+    state = _state(items_per_hour=2.0, last_success_at=NOW, last_new_item_at=NOW - timedelta(hours=1))
+    fields = source_health.next_feed_state(state, 200, None, [NOW - timedelta(hours=2)], NOW)
+    # Daha önce görülmüş girdi sayılmaz: hız değişmez, hedef 1 girdi için 30 dakika
+    assert fields["items_per_hour"] == pytest.approx(2.0)
+    assert _minutes_until_next_poll(fields) == pytest.approx(30)
+    assert "last_new_item_at" not in fields
+
+    quiet = _state(items_per_hour=2.0, last_success_at=NOW - timedelta(hours=24))
+    assert source_health.next_feed_state(quiet, 200, None, [], NOW)["items_per_hour"] < 1.0
+
+def test_failures_back_off_exponentially_after_threshold():
+    state = _state(consecutive_failures=0)
+    backoffs = []
+    for _ in range(FEED_FAILURE_THRESHOLD + 2):
+        fields = source_health.next_feed_state(state, 503, "HTTP 503", [], NOW)
+        state.consecutive_failures = fields["consecutive_failures"]
+        backoffs.append(_minutes_until_next_poll(fields) if fields["next_poll_at"] else None)
+
+    # Eşiğe kadar her turda yeniden denenir, sonra bekleme ikiye katlanır
+    assert backoffs == [None] * (FEED_FAILURE_THRESHOLD - 1) + [FEED_POLL_MIN_MINUTES * 2 ** i for i in range(3)]
+    assert source_health.circuit_open(state)
+
+    state.consecutive_failures = 100
+    assert _minutes_until_next_poll(source_health.next_feed_state(state, None, "zaman aşımı", [], NOW)) == FEED_BACKOFF_MAX_MINUTES
+
+def test_success_resets_failures():
+    state = _state(consecutive_failures=FEED_FAILURE_THRESHOLD + 1, last_error="HTTP 503")
+    fields = source_health.next_feed_state(state, 200, None, [], NOW)
+
+    assert fields["consecutive_failures"] == 0
+    assert fields["last_error"] is None
+    assert fields["last_success_at"] == NOW
+
+def test_is_due():
+    assert source_health.is_due(None, RSS_URL, NOW)
+    assert source_health.is_due(_state(next_poll_at=NOW + timedelta(hours=1)), "https://example.com/yeni-rss", NOW)
+    assert not source_health.is_due(_state(next_poll_at=NOW + timedelta(minutes=5)), RSS_URL, NOW)
+    # Zamanlayıcının biraz erken tetiklemesi beslemeyi atlatmaz
+    assert source_health.is_due(_state(next_poll_at=NOW + timedelta(seconds=30)), RSS_URL, NOW)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(source_health, "time", clock)
+    return clock
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker(failure_threshold=2, backoff_seconds=10, max_backoff_seconds=25, probe_timeout_seconds=5)
+
+def _state_of(breaker, key="example.com"):
+    return breaker.snapshot().get(key, {}).get("state", "closed")
+
+def test_circuit_opens_after_threshold_and_rejects(clock, breaker):
+    breaker.record_failure("example.com", "HTTP 503")
+    assert breaker.allow("example.com")
+    assert _state_of(breaker) == "degraded"
+
+    breaker.record_failure("example.com", "HTTP 503")
+    assert _state_of(breaker) == "open"
+    assert not breaker.allow("example.com")
+    assert breaker.retry_in("example.com") == 10
+    # Diğer alan adları etkilenmez
+    assert breaker.allow("other.example")
+
+def test_failures_while_open_do_not_extend_backoff(clock, breaker):
+    breaker.record_failure("example.com")
+    breaker.record_failure("example.com")
+    clock.now += 4
+    # Devre açılmadan önce gönderilmiş isteklerin geç gelen hataları
+    breaker.record_failure("example.com")
+    breaker.record_failure("example.com")
+
+    assert breaker.retry_in("example.com") == 6
+    assert breaker.snapshot()["example.com"]["consecutive_failures"] == 4
+
+def test_half_open_allows_a_single_probe_and_success_closes(clock, breaker):
+    breaker.record_failure("example.com")
+    breaker.record_failure("example.com")
+    clock.now += 10
+
+    assert _state_of(breaker) == "half_open"
+    assert breaker.allow("example.com")
+    assert not breaker.allow("example.com")
+
+    breaker.record_success("example.com")
+    assert _state_of(breaker) == "closed"
+    assert breaker.allow("example.com") and breaker.allow("example.com")
+
+def test_failed_probe_reopens_with_doubled_backoff(clock, breaker):
+    breaker.record_failure("example.com")
+    breaker.record_failure("example.com")
+    clock.now += 10
+    assert breaker.allow("example.com")
+
+    breaker.record_failure("example.com", "HTTP 503")
+    assert _state_of(breaker) == "open"
+    assert breaker.retry_in("example.com") == 20
+
+    clock.now += 20
+    assert breaker.allow("example.com")
+    breaker.record_failure("example.com")
+    # Bekleme süresi üst sınırda kalır
+    assert breaker.retry_in("example.com") == 25
+
+def test_probe_timeout_allows_a_new_probe(clock, breaker):
+    breaker.record_failure("example.com")
+    breaker.record_failure("example.com")
+    clock.now += 10
+    assert breaker.allow("example.com")
+
+    # Deneme isteği sonuçlanmadı (ör. iptal edildi); zaman aşımından önce başka deneme yapılmaz
+    clock.now += 4
+    assert not breaker.allow("example.com")
+    clock.now += 1
+    assert breaker.allow("example.com")
+    assert breaker.snapshot()["example.com"]["rejected_requests"] == 1
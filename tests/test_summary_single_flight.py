@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+from app.crud import article_crud
+from app.database import database, schemas
+from app.services import result_cache
+from app.tools import db_tools
+
+SUMMARY = "Şirket yeni modelini tanıttı; model kodlama testlerinde önceki sürümü geride bıraktı."
+
+@pytest.fixture
+def summarize_calls(monkeypatch):
+    calls = []
+
+    async def fake_summarize(content):
+        calls.append(content)
+        await asyncio.sleep(0.05)
+        return SUMMARY
+
+    monkeypatch.setattr(db_tools, "_summarize", fake_summarize)
+    db_tools._summary_cache.clear()
+    return calls
+
+def _create_article(content="Makale metni. " * 50):
+    with database.SessionLocal() as db:
+        article_id = article_crud.create_article(
+            db, schemas.ArticleCreate(title="Başlık", url="https://example.com/a", source="Test", content=content)
+        ).id
+
+    # Sohbet yolundaki gibi: kart sütunları, ardından ertelenen içerik tek sorguda
+    async def load():
+        async with database.AsyncSessionLocal() as db:
+            articles = await article_crud.aget_articles_by_ids(db, [article_id])
+            await article_crud.aload_contents(db, articles)
+        return articles[0]
+
+    return asyncio.run(load())
+
+def test_concurrent_requests_share_one_llm_call_and_persist(summarize_calls):
+    article = _create_article()
+
+    async def run():
+        return await asyncio.gather(*(db_tools.get_or_create_summary(article) for _ in range(5)))
+
+    summaries = asyncio.run(run())
+
+    assert summaries == [SUMMARY] * 5
+    assert len(summarize_calls) == 1
+    assert not db_tools._inflight_summaries
+    with database.SessionLocal() as db:
+        assert article_crud.get_article(db, article.id).summary == SUMMARY
+
+def test_cached_summary_skips_llm(summarize_calls):
+    article = _create_article()
+    asyncio.run(db_tools.get_or_create_summary(article))
+    asyncio.run(db_tools.get_or_create_summary(article))
+
+    assert len(summarize_calls) == 1
+
+def test_failed_summary_is_not_cached(monkeypatch, summarize_calls):
+    article = _create_article()
+
+    async def failing_summarize(content):
+        raise RuntimeError("LLM hatası")
+
+    monkeypatch.setattr(db_tools, "_summarize", failing_summarize)
+    assert asyncio.run(db_tools.get_or_create_summary(article)) == db_tools.SUMMARY_ERROR
+    assert article.id not in db_tools._summary_cache
+
+def test_persisted_summary_changes_etag_but_keeps_cached_results(summarize_calls):
+    article = _create_article()
+    plan = ("get_recent_news", {"days_ago": 1})
+
+    async def run():
+        generation, _ = await result_cache.get_result(*plan)
+        await result_cache.store_result(generation, *plan, "Son haberler:", [article.id], ["kart"])
+        version = await result_cache.content_version()
+        await db_tools.get_or_create_summary(article)
+        return version, await result_cache.content_version(), await result_cache.get_result(*plan)
+
+    version_before, version_after, (_, cached) = asyncio.run(run())
+
+    assert version_after != version_before
+    assert cached is not None and cached["cards"] == ["kart"]
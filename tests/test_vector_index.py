@@ -0,0 +1,79 @@
+import asyncio
+from datetime import timedelta
+import numpy as np
+from app.crud import embedding_crud, fingerprint_crud
+from app.database import database, models
+from app.services import embedding_service, ingestion_service
+from app.services.vector_index import VectorIndex
+
+MODEL = "test-model"
+
+def _add_articles(*article_ids):
+    with database.SessionLocal() as db:
+        for article_id in article_ids:
+            db.add(models.Article(id=article_id, title=f"Başlık {article_id}", url=f"https://example.com/{article_id}", source="Test"))
+        db.commit()
+
+def _save_vector(article_id, model=MODEL, updated_at=None):
+    vector = np.zeros(4, dtype=np.float32)
+    vector[article_id % 4] = 1.0
+    with database.SessionLocal() as db:
+        embedding = embedding_crud.save_article_embedding(
+            db, article_id, model=model, dim=4, vector=embedding_service.to_blob(vector), commit=False
+        )
+        if updated_at is not None:
+            embedding.updated_at = updated_at
+        db.commit()
+
+async def _refresh(index):
+    async with database.AsyncSessionLocal() as db:
+        await index.refresh(db)
+
+def test_refresh_picks_up_vectors_committed_out_of_order():
+    _add_articles(1, 2, 3)
+    index = VectorIndex(MODEL)
+    _save_vector(3)
+    asyncio.run(_refresh(index))
+    # Daha küçük ID'li makalenin vektörü sonradan commit edilir (ör. backfill veya yavaş bir yazıcı)
+    _save_vector(1)
+    asyncio.run(_refresh(index))
+    asyncio.run(_refresh(index))
+
+    assert sorted(index._ids.tolist()) == [1, 3]
+    assert index.search(np.array([0, 1, 0, 0], dtype=np.float32), k=1)[0][0] == 1
+
+def test_refresh_reads_only_recent_rows_with_overlap(monkeypatch):
+    _add_articles(1, 2, 3)
+    index = VectorIndex(MODEL)
+    _save_vector(1)
+    asyncio.run(_refresh(index))
+
+    calls = []
+    get_stamps = embedding_crud.aget_embedding_stamps
+
+    async def spy(db, model, since=None):
+        calls.append(since)
+        return await get_stamps(db, model=model, since=since)
+
+    monkeypatch.setattr(embedding_crud, "aget_embedding_stamps", spy)
+    # Damgası işaretten önce alınmış ama sonra commit edilmiş satır (pay içinde)
+    _save_vector(2, updated_at=index._synced_until - timedelta(minutes=1))
+    asyncio.run(_refresh(index))
+
+    assert calls[0] is not None and calls[0] < index._synced_until
+    assert sorted(index._ids.tolist()) == [1, 2]
+
+def test_backfill_embeds_originals_without_vectors():
+    _add_articles(1, 2, 3)
+    embedder = embedding_service.get_embedder()
+    _save_vector(1, model=embedder.name)
+    with database.SessionLocal() as db:
+        fingerprint_crud.save_article_fingerprint(db, article_id=3, simhash=0, duplicate_of_id=2)
+
+    assert asyncio.run(ingestion_service.backfill_embeddings(batch_size=1)) == 1
+    assert asyncio.run(ingestion_service.backfill_embeddings()) == 0
+
+    with database.SessionLocal() as db:
+        stored = {row.article_id: row.model for row in db.query(models.ArticleEmbedding)}
+    # Kopya (3) gömülmez; zaten vektörü olan (1) yeniden üretilmez
+    assert stored == {1: embedder.name, 2: embedder.name}
@@ -0,0 +1,153 @@
+import asyncio
+from datetime import timedelta
+import ingest_worker
+from app.core.clock import utcnow
+from app.crud import work_queue_crud
+from app.database import database, models
+from app.services import dedup_service, extraction, ingestion_service
+from app.services.article_writer import ArticleWriter
+
+def _articles(*numbers):
+    return [{"url": f"https://example.com/{i}", "title": f"Başlık {i}", "source": "Test", "publish_date": None} for i in numbers]
+
+def _enqueue(articles):
+    with database.SessionLocal() as db:
+        return work_queue_crud.enqueue_work_items(db, articles)
+
+def test_enqueue_skips_urls_already_queued():
+    assert _enqueue(_articles(1, 2)) == 2
+    assert _enqueue(_articles(2, 3)) == 1
+
+def test_portable_enqueue_skips_urls_already_queued(monkeypatch):
+    _enqueue(_articles(1))
+    # ON CONFLICT desteklemeyen bir veritabanı gibi davran
+    monkeypatch.setattr(work_queue_crud, "_conflict_ignoring_insert", lambda db: None)
+
+    assert _enqueue(_articles(1, 2, 3)) == 2
+    with database.SessionLocal() as db:
+        assert work_queue_crud.count_by_status(db) == {work_queue_crud.PENDING: 3}
+
+def _claim(worker_id, limit=10, lease_seconds=60):
+    with database.SessionLocal() as db:
+        return work_queue_crud.claim_work_items(db, worker_id, limit, lease_seconds)
+
+def _statuses():
+    with database.SessionLocal() as db:
+        return {item.url: (item.status, item.attempts) for item in db.query(models.IngestionWorkItem)}
+
+def test_claim_leases_each_item_to_one_worker():
+    _enqueue(_articles(1, 2, 3))
+
+    first = _claim("a", limit=2)
+    second = _claim("b")
+
+    assert [item.url for item in first] == ["https://example.com/1", "https://example.com/2"]
+    assert [item.url for item in second] == ["https://example.com/3"]
+    assert _claim("c") == []
+    assert all(item.attempts == 1 for item in first + second)
+
+def test_expired_lease_is_reclaimed_by_another_worker():
+    _enqueue(_articles(1, 2))
+    # Birinci işçi çöktü: kirası yenilenmeden doldu
+    (live,) = _claim("a", limit=1)
+    (expired,) = _claim("a", limit=1, lease_seconds=-1)
+
+    assert [item.id for item in _claim("b")] == [expired.id]
+    with database.SessionLocal() as db:
+        # Kirası başka işçiye geçen iş artık eski işçi tarafından yenilenemez veya tamamlanamaz
+        assert work_queue_crud.renew_leases(db, "a", [expired.id, live.id], 60) == 1
+        assert not work_queue_crud.complete_work_item(db, expired.id, "a")
+        assert work_queue_crud.complete_work_item(db, expired.id, "b")
+    assert _statuses()["https://example.com/2"] == (work_queue_crud.DONE, 2)
+
+def test_failed_item_is_retried_with_backoff_then_dead_lettered():
+    _enqueue(_articles(1))
+
+    (item,) = _claim("a")
+    with database.SessionLocal() as db:
+        status = work_queue_crud.fail_work_item(db, item.id, "a", item.attempts, "hata", max_attempts=2, retry_seconds=60)
+    assert status == work_queue_crud.PENDING
+    # Bekleme süresi dolmadan yeniden alınmaz
+    assert _claim("a") == []
+
+    with database.SessionLocal() as db:
+        db.query(models.IngestionWorkItem).update({"available_at": utcnow()})
+        db.commit()
+    (item,) = _claim("a")
+    with database.SessionLocal() as db:
+        status = work_queue_crud.fail_work_item(db, item.id, "a", item.attempts, "hata", max_attempts=2, retry_seconds=60)
+    assert status == work_queue_crud.DEAD
+    assert _claim("a") == []
+
+    with database.SessionLocal() as db:
+        assert work_queue_crud.requeue_dead_items(db) == 1
+    assert _statuses()["https://example.com/1"] == (work_queue_crud.PENDING, 0)
+
+def test_expired_lease_without_attempts_left_is_dead_lettered():
+    _enqueue(_articles(1, 2))
+    _claim("a", lease_seconds=-1)
+
+    with database.SessionLocal() as db:
+        assert work_queue_crud.dead_letter_expired(db, max_attempts=2) == 0
+    _claim("b", lease_seconds=-1)
+    with database.SessionLocal() as db:
+        assert work_queue_crud.dead_letter_expired(db, max_attempts=2) == 2
+        assert work_queue_crud.count_by_status(db) == {work_queue_crud.DEAD: 2}
+
+def test_purge_removes_only_old_done_items():
+    _enqueue(_articles(1, 2, 3))
+    done = _claim("a", limit=2)
+    with database.SessionLocal() as db:
+        for item in done:
+            work_queue_crud.complete_work_item(db, item.id, "a")
+        db.query(models.IngestionWorkItem).filter_by(id=done[0].id).update({"updated_at": utcnow() - timedelta(days=8)})
+        db.commit()
+
+        assert work_queue_crud.purge_done_items(db, timedelta(days=7)) == 1
+        assert work_queue_crud.count_by_status(db) == {work_queue_crud.DONE: 1, work_queue_crud.PENDING: 1}
+
+class FakeFetcher:
+    async def fetch(self, url):
+        return url.encode(), "utf-8"
+
+def test_empty_analysis_is_retried_instead_of_completed(monkeypatch):
+    async def fake_extract(html):
+        return "Yapay zeka şirketi yeni dil modelini tanıttı. " * 40
+
+    async def empty_llm(content):
+        return "", ""
+
+    monkeypatch.setattr(extraction, "extract_text", fake_extract)
+    monkeypatch.setattr(ingestion_service, "process_content_with_llm", empty_llm)
+    monkeypatch.setattr(dedup_service, "fingerprint_index", dedup_service.FingerprintIndex())
+    _enqueue(_articles(1))
+
+    async def run():
+        async with ArticleWriter() as writer:
+            return await ingest_worker.IngestionWorker("a").run_batch(writer, FakeFetcher())
+
+    assert asyncio.run(run()) == 1
+    with database.SessionLocal() as db:
+        item = db.query(models.IngestionWorkItem).one()
+        assert (item.status, item.lease_owner) == (work_queue_crud.PENDING, None)
+        assert item.last_error.startswith("EmptyAnalysisError")
+        assert db.query(models.Article).count() == 0
+
+def test_heartbeat_survives_renewal_errors(monkeypatch):
+    calls = []
+
+    async def flaky_renew():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            raise RuntimeError("veritabanı kesintisi")
+
+    async def run():
+        worker = ingest_worker.IngestionWorker("a", lease_seconds=0.03)
+        monkeypatch.setattr(worker, "renew_leases", flaky_renew)
+        heartbeat = asyncio.create_task(worker._heartbeat())
+        await asyncio.sleep(0.1)
+        assert not heartbeat.done()
+        heartbeat.cancel()
+
+    asyncio.run(run())
+    assert len(calls) >= 2